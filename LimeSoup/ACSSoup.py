@@ -5,7 +5,10 @@ from __future__ import division
 from __future__ import absolute_import
 
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser.encoding import to_bytes
+from LimeSoup.parser.metadata import jats_metadata
 from LimeSoup.parser.parser_paper_acs import ParserPaper
+from LimeSoup.parser.prechecks import Precheck
 
 
 __author__ = ''
@@ -52,7 +55,10 @@ class ACSReformat(RuleIngredient):
 
     @staticmethod
     def _parse(xml_str):
-        new_xml = xml_str.replace('>/','>')
+        if isinstance(xml_str, str):
+            new_xml = xml_str.replace('>/', '>')
+        else:
+            new_xml = to_bytes(xml_str).replace(b'>/', b'>')
         parser = ParserPaper(new_xml, parser_type='lxml',debugging=False)
         return parser.raw_xml
 
@@ -89,9 +95,24 @@ class ACSCollect(RuleIngredient):
         return obj
 
 
-ACSSoup = Soup(parser_version=__version__)
+class ACSReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from <front>, without parsing the body.
+    The DOI is a list, as in ACSCollect.
+    """
+
+    @staticmethod
+    def _parse(xml_str):
+        obj = jats_metadata(xml_str)
+        obj['DOI'] = [obj['DOI']] if obj['DOI'] is not None else []
+        return obj
+
+
+ACSSoup = Soup(parser_version=__version__, accepts_bytes=True,
+               precheck=Precheck(body=['<body'], abstract=['<abstract']))
 ACSSoup.add_ingredient(ACSReformat())
 ACSSoup.add_ingredient(ACSRemoveTrash())
 ACSSoup.add_ingredient(ACSCreateTags())
 ACSSoup.add_ingredient(ACSReplaceSectionTag())
 ACSSoup.add_ingredient(ACSCollect())
+ACSSoup.set_metadata_ingredient(ACSReadMetadata())
@@ -1,9 +1,13 @@
 import re
 import regex
 
+from LimeSoup.errors import BodyNotFound, MetadataNotFound
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser.locator import ElementLocator
+from LimeSoup.parser.metadata import jats_metadata
 from LimeSoup.parser.paragraphs import extract_paragraphs_recursive
 from LimeSoup.parser.parser_paper import ParserPaper
+from LimeSoup.parser.prechecks import Precheck
 
 from pprint import pprint
 
@@ -12,6 +16,18 @@ __maintainer__ = 'Kevin Cruse'
 __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.2.0'
 
+# Only <fulltext> is used by AIPCleanArticleBody, other parts are never parsed.
+FULLTEXT_LOCATOR = ElementLocator('fulltext')
+
+EDGE_WHITESPACES = re.compile(r'(^[\s\n]+)|([\s\n]+$)')
+DOI_URL = re.compile(r'(?<=https://doi.org/).+')
+# MathML tags but the ones the equations are read from
+MATH_MARKUP = regex.compile("mml:.*(?<!mstyle|mo|mi|msub|mrow|math)$")
+SECONDARY_SECTION_ID = re.compile(r's\d[A-Z]$')
+TERTIARY_SECTION_ID = re.compile(r's\d[A-Z]\d$')
+# Numbers, greek numbers and capital letters of the section headers
+SECTION_INDEX = re.compile(r'^([A-z0-9]+)(\.|\s)(\s)+')
+
 
 class AIPRemoveTrash(RuleIngredient):
     """
@@ -21,6 +37,9 @@ class AIPRemoveTrash(RuleIngredient):
 
     @staticmethod
     def _parse(html_str):
+        fulltext = FULLTEXT_LOCATOR.extract(html_str)
+        if fulltext is not None:
+            html_str = fulltext
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         # Tags to be removed from the HTML paper
         list_remove = [
@@ -61,7 +80,7 @@ class AIPCollectMetadata(RuleIngredient):
     @staticmethod
     def _parse(parser):
 
-        trim = lambda tag: re.sub(r'(^[\s\n]+)|([\s\n]+$)', '', tag)
+        trim = lambda tag: EDGE_WHITESPACES.sub('', tag)
         
         # This dictionary structure should match other parsers,
         # "Valid Article" and "Content Type" are specific to AIP Parser
@@ -77,14 +96,14 @@ class AIPCollectMetadata(RuleIngredient):
         
         # search for DOI
         for each in meta_info:
-            doi_ = re.search(r'(?<=https://doi.org/).+', each)
+            doi_ = DOI_URL.search(each)
             if doi_ is not None:
                 doi = doi_.group()
                 doi = trim(doi)
                 break
 
         if doi is None:
-            raise ValueError("Cannot find doi.")
+            raise MetadataNotFound("Cannot find doi.")
         
         # keywords
         keywords = parser.get_keywords([{'name': 'li', 'class': 'topicTags'}])
@@ -117,7 +136,7 @@ class AIPCleanArticleBody(RuleIngredient):
         # parser = ParserPaper(str(article_body), parser_type='html.parser')
         article_body = parser.soup.find(**{'name': 'fulltext'})
         if article_body is None:
-            raise ValueError('Cannot find article body')
+            raise BodyNotFound('Cannot find article body')
         parser = ParserPaper(str(article_body), parser_type='html.parser')
 
         # 2023-01-18 ===> list items are divided by <p></p> tags, so the following is a bit of a hacky
@@ -162,7 +181,7 @@ class AIPCleanArticleBody(RuleIngredient):
             {'name': 'inline-supplementary-material'}, # check 10.1063/1.4979560
             # added below 2023-12-15, test with 10.1063/1.3085997
             {'name': 'inline-formula'},
-            {'name': regex.compile("mml:.*(?<!mstyle|mo|mi|msub|mrow|math)$")},
+            {'name': MATH_MARKUP},
             {'name': 'inline-graphic'},
             {'name': 'monospace'},
             {'name': 'publisher-name'},
@@ -224,7 +243,7 @@ class AIPCleanArticleBody(RuleIngredient):
         rules = {'name': 'title'}
         parser.rename_tag(rules, 'h1')
 
-        secondary_heading_parent_rule = {'name': "sec", 'id': re.compile('s\d[A-Z]$')}
+        secondary_heading_parent_rule = {'name': "sec", 'id': SECONDARY_SECTION_ID}
         secondary_heading_child_rule = {'name': 'h1'}
         parser.rename_child_based_on_parent(
             secondary_heading_parent_rule,
@@ -232,7 +251,7 @@ class AIPCleanArticleBody(RuleIngredient):
             'h2'
         )
 
-        tertiary_heading_parent_rule = {'name': "sec", 'id': re.compile('s\d[A-Z]\d$')}
+        tertiary_heading_parent_rule = {'name': "sec", 'id': TERTIARY_SECTION_ID}
         tertiary_heading_child_rule= {'name': 'h2'}
         parser.rename_child_based_on_parent(
             tertiary_heading_parent_rule,
@@ -292,11 +311,9 @@ class AIPCollect(RuleIngredient):
             """
             remove indexes in section header
             """
-            # include number, greek number and capital char
-            indexes_pattern = re.compile(r'^([A-z0-9]+)(\.|\s)(\s)+')
             for sec in sections:
                 if isinstance(sec, dict):
-                    sec['name'] = re.sub(indexes_pattern, '', sec['name'])
+                    sec['name'] = SECTION_INDEX.sub('', sec['name'])
                     remove_indexes(sec['content'])
 
         remove_indexes(data)
@@ -306,8 +323,20 @@ class AIPCollect(RuleIngredient):
         return obj
 
 
-AIPSoup = Soup(parser_version=__version__)
+class AIPReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from <front>, without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(xml_str):
+        return jats_metadata(xml_str)
+
+
+AIPSoup = Soup(parser_version=__version__, accepts_bytes=True,
+               precheck=Precheck(body=['<fulltext'], abstract=['<abstract']))
 AIPSoup.add_ingredient(AIPRemoveTrash())
 # AIPSoup.add_ingredient(AIPCollectMetadata())
 AIPSoup.add_ingredient(AIPCleanArticleBody())
 AIPSoup.add_ingredient(AIPCollect())
+AIPSoup.set_metadata_ingredient(AIPReadMetadata())
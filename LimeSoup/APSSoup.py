@@ -5,8 +5,11 @@ from __future__ import division
 from __future__ import absolute_import
 
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.encoding import to_bytes
+from LimeSoup.parser.metadata import jats_metadata
 from LimeSoup.parser.parser_paper_aps import ParserPaper
-import re
+from LimeSoup.parser.prechecks import Precheck
 
 
 __author__ = ''
@@ -53,7 +56,10 @@ class APSReformat(RuleIngredient):
 
     @staticmethod
     def _parse(xml_str):
-        new_xml = xml_str.replace('>/','>')
+        if isinstance(xml_str, str):
+            new_xml = xml_str.replace('>/', '>')
+        else:
+            new_xml = to_bytes(xml_str).replace(b'>/', b'>')
         parser = ParserPaper(new_xml, parser_type='lxml',debugging=False)
         return parser.raw_xml
 
@@ -81,9 +87,9 @@ class APSCollect(RuleIngredient):
             parser.soup.back.decompose()
             body = parser.soup.find_all('p')
             for paras in body:
-                p = re.sub('\n*\s+\n*',' ',paras.text.strip())
-                p = re.sub('\s,\s',', ',p)
-                p = re.sub('\s.\s','. ',p)
+                p = patterns.SPACES.sub(' ',paras.text.strip())
+                p = patterns.SPACED_COMMA.sub(', ',p)
+                p = patterns.SPACED_PERIOD.sub('. ',p)
                 if p[-1] == '.' and p[-2] == ' ':
                     p = p[:-2] + '.'
                 data.append(parser.create_section(name='', type_section='section_h2', content=[p]))
@@ -99,9 +105,21 @@ class APSCollect(RuleIngredient):
         return obj
 
 
-APSSoup = Soup(parser_version=__version__)
+class APSReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from <front>, without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(xml_str):
+        return jats_metadata(xml_str)
+
+
+APSSoup = Soup(parser_version=__version__, accepts_bytes=True,
+               precheck=Precheck(body=['<body'], abstract=['<abstract']))
 APSSoup.add_ingredient(APSReformat())
 APSSoup.add_ingredient(APSRemoveTrash())
 # APSSoup.add_ingredient(APSCreateTags())
 APSSoup.add_ingredient(APSReplaceSectionTag())
 APSSoup.add_ingredient(APSCollect())
+APSSoup.set_metadata_ingredient(APSReadMetadata())
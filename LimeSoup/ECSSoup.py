@@ -1,18 +1,32 @@
 import re
 
+from LimeSoup.errors import BodyNotFound, UnsupportedTemplate
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.locator import ElementLocator
+from LimeSoup.parser.metadata import citation_metadata
 from LimeSoup.parser.paragraphs import extract_paragraphs_recursive
 from LimeSoup.parser.parser_paper import ParserPaper
+from LimeSoup.parser.prechecks import Precheck
 
 __author__ = 'Tiago Botari, Haoyan Huo'
 __maintainer__ = 'Kevin Cruse'
 __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.3.0'
 
+# Only the full text is kept, other parts of the page are never parsed.
+FULLTEXT_LOCATOR = ElementLocator('div', {'class': 'fulltext-view'})
+
+REFERENCE_LINK = re.compile(r'#ref.*?')
+EXCLUDE_SECTIONS = (patterns.ACKNOWLEDGEMENT, patterns.REFERENCE)
+
 
 class ECSRemoveTrash(RuleIngredient):
     @staticmethod
     def _parse(html_str):
+        fulltext = FULLTEXT_LOCATOR.extract(html_str)
+        if fulltext is not None:
+            html_str = fulltext
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
 
         # Tags to be removed from the HTML paper ECS
@@ -31,7 +45,7 @@ class ECSRemoveTrash(RuleIngredient):
             {'name': 'div', 'id': 'license-1'},  # License
             {'name': 'ul', 'class': 'history-list'},  # some historical information of the paper
             {'name': 'ul', 'class': 'copyright-statement'},
-            {'name': 'a', 'href': re.compile(r'#ref.*?')},
+            {'name': 'a', 'href': REFERENCE_LINK},
         ]
         parser.remove_tags(rules=list_remove)
         rules = [
@@ -40,8 +54,10 @@ class ECSRemoveTrash(RuleIngredient):
         ]
 
         parser.strip_tags(rules)
-        main_body = str(next(x for x in parser.soup.find_all('div', attrs={'class': 'fulltext-view'})))
-        return main_body
+        main_body = parser.soup.find('div', attrs={'class': 'fulltext-view'})
+        if main_body is None:
+            raise BodyNotFound('Cannot find the fulltext-view')
+        return str(main_body)
 
 
 class ECSCollectTitleKeywords(RuleIngredient):
@@ -70,9 +86,9 @@ class ECSCollectAbstract(RuleIngredient):
     def _parse(parser_obj):
         obj, parser = parser_obj
 
-        abstract_section = next(
-            x for x in parser.soup.find_all('div', attrs={'class': 'section abstract'})
-        )
+        abstract_section = parser.soup.find('div', attrs={'class': 'section abstract'})
+        if abstract_section is None:
+            raise UnsupportedTemplate('Cannot find the abstract section')
         obj['Sections'] = extract_paragraphs_recursive(abstract_section)
         abstract_section.extract()
 
@@ -84,18 +100,27 @@ class ECSCollect(RuleIngredient):
     def _parse(parser_obj):
         obj, parser = parser_obj
 
-        exclude_sections = [
-            re.compile(r'.*?acknowledge?ment.*?', re.IGNORECASE),
-            re.compile(r'.*?reference.*?', re.IGNORECASE),
-        ]
         obj['Sections'].extend(
-            extract_paragraphs_recursive(parser.soup, exclude_section_rules=exclude_sections)
+            extract_paragraphs_recursive(parser.soup, exclude_section_rules=EXCLUDE_SECTIONS)
         )
         return obj
 
 
-ECSSoup = Soup(parser_version=__version__)
+class ECSReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from the <meta> tags in <head>,
+    without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(html_str):
+        return citation_metadata(html_str)
+
+
+ECSSoup = Soup(parser_version=__version__, accepts_bytes=True,
+               precheck=Precheck(body=['fulltext-view'], abstract=['section abstract']))
 ECSSoup.add_ingredient(ECSRemoveTrash())
 ECSSoup.add_ingredient(ECSCollectTitleKeywords())
 ECSSoup.add_ingredient(ECSCollectAbstract())
 ECSSoup.add_ingredient(ECSCollect())
+ECSSoup.set_metadata_ingredient(ECSReadMetadata())
@@ -1,6 +1,10 @@
+import re
+
 from LimeSoup.ElsevierSoup_HTML import ElsevierHTMLSoup
-from LimeSoup.ElsevierSoup_XML import ElsevierXMLSoup
-from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.ElsevierSoup_XML import ELSEVIER_XML_PRECHECK, ElsevierXMLSoup
+from LimeSoup.lime_soup import Soup, RuleIngredient, fingerprint_of
+from LimeSoup.parser.elsevier_xml import read_elsevier_metadata
+from LimeSoup.parser.metadata import citation_metadata
 
 __author__ = 'Haoyan Huo'
 __maintainer__ = 'Kevin Cruse'
@@ -10,22 +14,37 @@ __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.3.2'
 __all__ = ['ElsevierSoup']
 
+# classify_code_type for bytes, re can search any buffer without copying it
+HTML_TAGS = [re.compile(b'</div>'), re.compile(b'</p>')]
+
 
 def classify_code_type(raw_string):
     """
     A very simple function to detect HTML/XML.
+
+    :param raw_string: str or bytes-like (bytes, mmap, memoryview)
     """
-    search_for_words = [
-        '</div>',
-        '</p>',
-    ]
-    for word in search_for_words:
-        if word not in raw_string:
+    if isinstance(raw_string, str):
+        search_for_words = [
+            '</div>',
+            '</p>',
+        ]
+        for word in search_for_words:
+            if word not in raw_string:
+                return 'XML'
+        return 'HTML'
+
+    for pattern in HTML_TAGS:
+        if pattern.search(raw_string) is None:
             return 'XML'
     return 'HTML'
 
 
 class ElsevierChooseParser(RuleIngredient):
+    def fingerprint(self):
+        return fingerprint_of(super(ElsevierChooseParser, self).fingerprint(),
+                              ElsevierXMLSoup.fingerprint, ElsevierHTMLSoup.fingerprint)
+
     @staticmethod
     def _parse(raw_string):
         code_type = classify_code_type(raw_string)
@@ -36,5 +55,17 @@ class ElsevierChooseParser(RuleIngredient):
             return ElsevierHTMLSoup.parse(raw_string)
 
 
-ElsevierSoup = Soup(parser_version=__version__)
+class ElsevierReadMetadata(RuleIngredient):
+    @staticmethod
+    def _parse(raw_string):
+        code_type = classify_code_type(raw_string)
+
+        if code_type == 'XML':
+            return read_elsevier_metadata(raw_string)
+        elif code_type == 'HTML':
+            return citation_metadata(raw_string)
+
+
+ElsevierSoup = Soup(parser_version=__version__, accepts_bytes=True, precheck=ELSEVIER_XML_PRECHECK)
 ElsevierSoup.add_ingredient(ElsevierChooseParser())
+ElsevierSoup.set_metadata_ingredient(ElsevierReadMetadata())
@@ -1,9 +1,9 @@
 import re
 
-import bs4
-
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser.encoding import beautiful_soup
 from LimeSoup.parser.paragraphs import extract_paragraphs_recursive, get_tag_text
+from LimeSoup.parser.rule_stats import iter_matches
 
 __author__ = 'Haoyan Huo'
 __maintainer__ = 'Kevin Cruse'
@@ -11,25 +11,32 @@ __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.3.2'
 __all__ = ['ElsevierHTMLSoup']
 
+RULES_FOR_REMOVE = [
+    {'class_': re.compile('.*?fig(?:ure)?.*?', re.IGNORECASE)},
+    {'class_': re.compile('.*?table.*?', re.IGNORECASE)},
+    {'name': 'a', 'href': re.compile(r'#(?:ref|bib).*?', re.IGNORECASE)},
+]
+
+MATH_NEWLINE = re.compile(r'\s\n')
+SECTION_NUMBER = re.compile(r'^[0-9.\s]+')
+KEYWORDS = re.compile(r'keywords?', re.IGNORECASE)
+ABSTRACT = re.compile(r'.*?abstract.*?', re.IGNORECASE)
+# Sections after the content
+BACK_MATTER = re.compile(r'.*?(?:acknowledge?ment|reference).*?', re.IGNORECASE)
+
 
 class ElsevierRemoveTrash(RuleIngredient):
     @staticmethod
     def _parse(html_str):
-        soup = bs4.BeautifulSoup(html_str, 'html.parser')
-
-        rules_for_remove = [
-            {'class_': re.compile('.*?fig(?:ure)?.*?', re.IGNORECASE)},
-            {'class_': re.compile('.*?table.*?', re.IGNORECASE)},
-            {'name': 'a', 'href': re.compile(r'#(?:ref|bib).*?', re.IGNORECASE)},
-        ]
+        soup = beautiful_soup(html_str, 'html.parser')
 
-        for rule in rules_for_remove:
-            for s in soup.find_all(**rule):
+        for _, tags in iter_matches(soup, RULES_FOR_REMOVE, reorder=True):
+            for s in tags:
                 s.extract()
 
         for math in soup.find_all('math'):
             text = get_tag_text(math)
-            text = re.sub(r'\s\n', '', text)
+            text = MATH_NEWLINE.sub('', text)
             math.replace_with(text)
         return soup
 
@@ -65,24 +72,22 @@ class ElsevierCollect(RuleIngredient):
             :return:
             """
             if isinstance(sec, dict):
-                sec_name = re.sub(r'^[0-9.\s]+', '', sec['name'])
+                sec_name = SECTION_NUMBER.sub('', sec['name'])
 
-                if re.match(r'keywords?', sec_name, re.IGNORECASE) and \
+                if KEYWORDS.match(sec_name) and \
                         all(isinstance(x, str) for x in sec['content']):
                     obj['Keywords'] = [x.strip(';') for x in sec['content']]
                     return False, sec
 
                 if not iterate_status['content_begins']:
-                    if re.match(r'.*?abstract.*?', sec_name, re.IGNORECASE) or \
+                    if ABSTRACT.match(sec_name) or \
                             (len(sec['content']) > 0 and
                              isinstance(sec['content'][0], str) and  # Typical abstract has more than 100 words
                              sec['content'][0].count(' ') > 100):
                         iterate_status['content_begins'] = True
 
                 if not iterate_status['content_ends']:
-                    if re.match(
-                            r'.*?(?:acknowledge?ment|reference).*?',
-                            sec_name, re.IGNORECASE):
+                    if BACK_MATTER.match(sec_name):
                         iterate_status['content_ends'] = True
 
                 should_include, sub_sections = iterate_sections(sec['content'])
@@ -1,11 +1,13 @@
 import re
-import bs4
 
+from LimeSoup.errors import UnsupportedTemplate
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser.encoding import beautiful_soup
 from LimeSoup.parser.elsevier_xml import (
     resolve_elsevier_entities, extract_ce_text, find_non_empty_children,
     node_named, extract_ce_para, extract_ce_section, extract_ce_abstract,
     extract_ce_title, remove_consecutive_whitespaces)
+from LimeSoup.parser.prechecks import Precheck
 
 __author__ = 'Haoyan Huo, Nicolas Mingione'
 __maintainer__ = 'Kevin Cruse'
@@ -18,7 +20,7 @@ class ElsevierParseXML(RuleIngredient):
     @staticmethod
     def _parse(xml_str):
         xml_str = resolve_elsevier_entities(xml_str)
-        return bs4.BeautifulSoup(xml_str, 'lxml-xml')
+        return beautiful_soup(xml_str, 'lxml-xml')
 
 class ElsevierReadMetaData(RuleIngredient):
     @staticmethod
@@ -72,6 +74,10 @@ class ElsevierReadMetaData(RuleIngredient):
         }
 
 
+NON_WORD = re.compile(r'[^\w]')
+ABSTRACT_NAME = re.compile(r'abstracts?', re.IGNORECASE)
+
+
 class ElsevierCollect(RuleIngredient):
 
     @staticmethod
@@ -83,23 +89,31 @@ class ElsevierCollect(RuleIngredient):
         # find all sections
         for node in soup.find_all('ce:abstract'):
             abstract_paragraph = extract_ce_abstract(node)
-            normalized_name = re.sub(r'[^\w]', '', abstract_paragraph['name'])
-            if re.match(r'abstracts?', normalized_name, re.IGNORECASE):
+            normalized_name = NON_WORD.sub('', abstract_paragraph['name'])
+            if ABSTRACT_NAME.match(normalized_name):
                 paragraphs.append(abstract_paragraph)
 
         sections = soup.find('ce:sections')
         if sections is not None:
-            for node in find_non_empty_children(sections):
-                if node_named(node, 'ce:para'):
-                    paragraphs.extend(extract_ce_para(node).split('\n'))
-                elif node_named(node, 'ce:section'):
-                    paragraphs.append(extract_ce_section(node))
+            try:
+                for node in find_non_empty_children(sections):
+                    if node_named(node, 'ce:para'):
+                        paragraphs.extend(extract_ce_para(node).split('\n'))
+                    elif node_named(node, 'ce:section'):
+                        paragraphs.append(extract_ce_section(node))
+            except NameError as e:
+                # elsevier_xml raises NameError for the elements its rules do not know
+                raise UnsupportedTemplate(str(e)) from e
 
         obj['Sections'] = paragraphs
         return obj
 
 
-ElsevierXMLSoup = Soup(parser_version=__version__)
+# Also the precheck of ElsevierSoup, for the XML pages only (HTML ones declare no ce namespace)
+ELSEVIER_XML_PRECHECK = Precheck(body=['<ce:sections'], abstract=['<ce:abstract', '<dc:description'],
+                                 only_if=['xmlns:ce='])
+
+ElsevierXMLSoup = Soup(parser_version=__version__, accepts_bytes=True, precheck=ELSEVIER_XML_PRECHECK)
 ElsevierXMLSoup.add_ingredient(ElsevierParseXML())
 ElsevierXMLSoup.add_ingredient(ElsevierReadMetaData())
 ElsevierXMLSoup.add_ingredient(ElsevierCollect())
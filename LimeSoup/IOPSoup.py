@@ -1,5 +1,9 @@
+from LimeSoup.errors import UnsupportedTemplate
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser.encoding import to_bytes
+from LimeSoup.parser.metadata import jats_metadata
 from LimeSoup.parser.parser_paper_IOP import ParserPaper
+from LimeSoup.parser.prechecks import Precheck
 
 from pprint import pprint
 
@@ -11,6 +15,9 @@ __maintainer__ = 'Kevin Cruse'
 __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.1.2'
 
+# In-line citations, in brackets or not
+CITATION = re.compile(r'(?:(\[)?<xref ref-type="bibr".*?(\]|\)))')
+
 
 class IOPRemoveTrash(RuleIngredient):
     @staticmethod
@@ -22,7 +29,7 @@ class IOPRemoveTrash(RuleIngredient):
         # if there is a space before, that will be retained (need this in case enclosing is surrounded by () + other
         # discussion... somewhat hacky workaround but seems better than leaving in the "[, ]", "[-]", etc. substrings.
         # If there are any remaining, then just remove using parser.remove_tags() method
-        xml_str = re.sub(r'(?:(\[)?<xref ref-type="bibr".*?(\]|\)))', '', xml_str)
+        xml_str = CITATION.sub('', xml_str)
 
         parser = ParserPaper(xml_str, parser_type='lxml', debugging=False)
 
@@ -38,10 +45,9 @@ class IOPRemoveTrash(RuleIngredient):
 
         parser.remove_tags(rules=list_remove)
 
-        if parser.soup.find(**{'name': 'xref', 'ref-type': 'bibr'}):
-            print(parser.soup.find(**{'name': 'xref', 'ref-type': "bibr"}))
-            print('Did not remove xref bibr correctly')
-            stop
+        xref = parser.soup.find(**{'name': 'xref', 'ref-type': 'bibr'})
+        if xref is not None:
+            raise UnsupportedTemplate('Did not remove xref bibr correctly: %s' % str(xref)[:100])
         return parser.raw_xml
 
 class IOPCreateTags(RuleIngredient):
@@ -68,7 +74,10 @@ class IOPReformat(RuleIngredient):
 
     @staticmethod
     def _parse(xml_str):
-        new_xml = xml_str.replace('>/','>')
+        if isinstance(xml_str, str):
+            new_xml = xml_str.replace('>/', '>')
+        else:
+            new_xml = to_bytes(xml_str).replace(b'>/', b'>')
         parser = ParserPaper(new_xml, parser_type='lxml',debugging=False)
         return parser.raw_xml
 
@@ -109,12 +118,24 @@ class IOPCollect(RuleIngredient):
         return obj
 
 
-IOPSoup = Soup(parser_version=__version__)
+class IOPReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from <front>, without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(xml_str):
+        return jats_metadata(xml_str)
+
+
+IOPSoup = Soup(parser_version=__version__, accepts_bytes=True,
+               precheck=Precheck(body=['<body'], abstract=['<abstract']))
 IOPSoup.add_ingredient(IOPReformat())
 IOPSoup.add_ingredient(IOPRemoveTrash())
 IOPSoup.add_ingredient(IOPCreateTags())
 IOPSoup.add_ingredient(IOPReplaceSectionTag())
 IOPSoup.add_ingredient(IOPCollect())
+IOPSoup.set_metadata_ingredient(IOPReadMetadata())
 
 
 # if __name__ == '__main__':
@@ -1,14 +1,43 @@
 import re
 
+from LimeSoup.errors import BodyNotFound
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.locator import ElementLocator
+from LimeSoup.parser.metadata import read_html_meta
 from LimeSoup.parser.paragraphs import extract_paragraphs_recursive
 from LimeSoup.parser.parser_paper import ParserPaper
+from LimeSoup.parser.prechecks import Precheck
+from LimeSoup.parser.rule_stats import iter_matches
 
 __author__ = 'Jason Madeano, Haoyan Huo'
 __maintainer__ = 'Haoyan Huo'
 __email__ = 'Jason.Madeano@shell.com,haoyan.huo@lbl.gov'
 __version__ = '0.3.0'
 
+# The metadata in <head> and the article body (style 1 or style 2, see
+# NatureExtractArticleBody) are the only parts of the page that are used.
+HEAD_LOCATOR = ElementLocator('head')
+BODY_LOCATORS = [
+    ElementLocator(attrs={'data-article-body': 'true'}),
+    ElementLocator('article'),
+]
+
+
+def select_head_and_body(html_str):
+    """
+    Cut <head> and the article body out of the page, so that navigation,
+    sidebars, etc. are never parsed. Returns html_str if either is missing.
+    """
+    head = HEAD_LOCATOR.extract(html_str)
+    if head is None:
+        return html_str
+    for locator in BODY_LOCATORS:
+        body = locator.extract(html_str)
+        if body is not None:
+            return head + body
+    return html_str
+
 
 class NatureRemoveTagsSmallSub(RuleIngredient):
 
@@ -17,6 +46,7 @@ class NatureRemoveTagsSmallSub(RuleIngredient):
         """
         Deal with spaces in the sub, small tag and then remove it.
         """
+        html_str = select_head_and_body(html_str)
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         rules = [{'name': 'small'},
                  {'name': 'sub'},
@@ -69,6 +99,24 @@ class NatureRemoveTrash(RuleIngredient):
         return parser
 
 
+DOI_METAS = ('citation_doi', 'prism.doi')
+TITLE_METAS = ('citation_title', 'twitter:title')
+DOI_PREFIX = re.compile(r'^doi:\s*')
+
+
+def clean_doi(doi):
+    if doi is not None:
+        doi = DOI_PREFIX.sub('', doi)
+        doi = patterns.WHITESPACES.sub('', doi)
+    return doi
+
+
+def clean_title(title):
+    if title is not None:
+        title = patterns.WHITESPACES.sub(' ', title)
+    return title
+
+
 class NatureCollectMetadata(RuleIngredient):
     """
     Collect metadata such as Title, Journal Name, DOI and Content Type.
@@ -78,20 +126,11 @@ class NatureCollectMetadata(RuleIngredient):
     def _parse(parser):
         # This dictionary structure should match other parsers,
         # "Valid Article" and "Content Type" are specific to Nature Parser
-        doi = parser.extract_first_meta('citation_doi')
-        if doi is None:
-            doi = parser.extract_first_meta('prism.doi')
-        if doi is not None:
-            doi = re.sub(r'^doi:\s*', '', doi)
-            doi = re.sub(r'\s+', '', doi)
+        doi = clean_doi(parser.extract_first_meta(*DOI_METAS))
 
         # TODO: We can actually use heuristics to get the title as <h1>.
         # this can be implemented later.
-        title = parser.extract_first_meta('citation_title')
-        if title is None:
-            title = parser.extract_first_meta('twitter:title')
-        if title is not None:
-            title = re.sub(r'\s+', ' ', title)
+        title = clean_title(parser.extract_first_meta(*TITLE_METAS))
 
         journal = parser.extract_first_meta('citation_journal_title')
 
@@ -109,6 +148,28 @@ class NatureCollectMetadata(RuleIngredient):
         return [obj, parser]
 
 
+class NatureReadMetadata(RuleIngredient):
+    """
+    Read the same metadata as NatureCollectMetadata, only from the <meta>
+    tags in <head>, without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(html_str):
+        metas = read_html_meta(html_str)
+
+        def first_meta(*names):
+            return next((metas[x][0] for x in names if metas.get(x)), None)
+
+        return {
+            'Content Type': first_meta('WT.cg_s'),
+            'DOI': clean_doi(first_meta(*DOI_METAS)),
+            'Title': clean_title(first_meta(*TITLE_METAS)),
+            'Keywords': metas.get('keywords', []),
+            'Journal': first_meta('citation_journal_title'),
+        }
+
+
 class NatureExtractArticleBody(RuleIngredient):
     """
     Take the body section out of the HTML DOM.
@@ -131,12 +192,12 @@ class NatureExtractArticleBody(RuleIngredient):
                 {'class': 'figures-at-a-glance'},
             ]
             if article_body:
-                for rule in rules_to_remove:
-                    for tag in article_body.find_all(**rule):
+                for _, tags in iter_matches(article_body, rules_to_remove, reorder=True):
+                    for tag in tags:
                         tag.extract()
 
         if article_body is None:
-            raise ValueError('Cannot find article body. You '
+            raise BodyNotFound('Cannot find article body. You '
                              'should inspect this HTML file carefully.')
 
         parser = ParserPaper(str(article_body), parser_type='html.parser')
@@ -144,29 +205,31 @@ class NatureExtractArticleBody(RuleIngredient):
         return [obj, parser]
 
 
+# Sections from which the rest of the article is trimmed
+ENDING_SECTIONS = [
+    patterns.ACKNOWLEDGEMENT,
+    #patterns.REFERENCE,#FixAPR24) do not remove references
+    re.compile(r'.*?author\s*information.*?', re.IGNORECASE),
+    re.compile(r'.*?related\s*links.*?', re.IGNORECASE),
+    re.compile(r'.*?about\s*this\s*article.*?', re.IGNORECASE),
+]
+
+
 class NatureCollect(RuleIngredient):
     @staticmethod
     def _parse(parser_obj):
         obj, parser = parser_obj
 
-        ending_sections = [
-            re.compile(r'.*?acknowledge?ment.*?', re.IGNORECASE),
-            #re.compile(r'.*?reference.*?', re.IGNORECASE),#FixAPR24) do not remove references
-            re.compile(r'.*?author\s*information.*?', re.IGNORECASE),
-            re.compile(r'.*?related\s*links.*?', re.IGNORECASE), 
-            re.compile(r'.*?about\s*this\s*article.*?', re.IGNORECASE),
-        ]
-
         section_status = {
             'should_trim': False
         }
 
         def trim_sections(sections):
             """
-            Remove anything after "ending_sections"
+            Remove anything after ENDING_SECTIONS
             """
             if isinstance(sections, dict):
-                for rule in ending_sections:
+                for rule in ENDING_SECTIONS:
                     if not section_status['should_trim']:
                         if rule.match(sections['name']):
                             section_status['should_trim'] = True
@@ -209,9 +272,11 @@ class NatureCollect(RuleIngredient):
         return obj
 
 
-NatureSoup = Soup(parser_version=__version__)
+NatureSoup = Soup(parser_version=__version__, accepts_bytes=True,
+                  precheck=Precheck(body=['data-article-body', '<article']))
 NatureSoup.add_ingredient(NatureRemoveTagsSmallSub())
 NatureSoup.add_ingredient(NatureRemoveTrash())
 NatureSoup.add_ingredient(NatureCollectMetadata())
 NatureSoup.add_ingredient(NatureExtractArticleBody())
 NatureSoup.add_ingredient(NatureCollect())
+NatureSoup.set_metadata_ingredient(NatureReadMetadata())
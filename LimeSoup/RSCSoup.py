@@ -1,7 +1,10 @@
 import re
 from pprint import pprint
 
+from LimeSoup.errors import UnsupportedTemplate
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.metadata import citation_metadata
 from LimeSoup.parser.paragraphs import extract_paragraphs_recursive, get_tag_text
 from LimeSoup.parser.parser_paper import ParserPaper
 
@@ -10,6 +13,14 @@ __maintainer__ = 'Kevin Cruse'
 __email__ = 'kevcruse96@gmail.com'
 __version__ = '0.3.1'
 
+CITATION_LINK = re.compile(r'#cit\d+')
+SECTION = re.compile('^section_h[1-6]')
+EXCLUDE_SECTIONS = (
+    patterns.ACKNOWLEDGEMENT,
+    patterns.REFERENCE,
+    re.compile(r'.*?footnote.*?', re.IGNORECASE),
+)
+
 
 class RSCParseHTML(RuleIngredient):
     @staticmethod
@@ -30,7 +41,7 @@ class RSCRemoveTrash(RuleIngredient):
             {'name': 'div', 'class': 'rtable__wrapper'},  # Remove table itself
             {'name': 'div', 'class': 'left_head'},  # Navigation links
             {'name': 'table'},  # Remove Footnote
-            {'name': 'a', 'href': re.compile(r'#cit\d+')},  # Remove citations
+            {'name': 'a', 'href': CITATION_LINK},  # Remove citations
             {'name': 'script'},
             {'name': 'figcaption'},
             {'name': 'figure'},
@@ -41,7 +52,7 @@ class RSCRemoveTrash(RuleIngredient):
             {'name': 'div', 'class': 'pnl pnl--border pnl--drop'}
         ])
         parser.remove_first_tag(rules=[
-            {'name': 'p', 'class': 'bold italic', 'string': re.compile('First published on')}
+            {'name': 'p', 'class': 'bold italic', 'string': patterns.FIRST_PUBLISHED}
         ])
 
         # Added 20231012
@@ -126,25 +137,20 @@ class RSCCollect(RuleIngredient):
         #     if len(journal_text) > 0:
         #         journal_name = journal_text
 
-        title_element = next(
-            x for x in parser.soup.find_all(attrs={'class': 'article__title'})
-        )
+        title_element = parser.soup.find(attrs={'class': 'article__title'})
+        if title_element is None:
+            raise UnsupportedTemplate('Cannot find the article__title')
         title = get_tag_text(title_element).strip('*†‡§‖¶')
         # title = parser.extract_first_meta('citation_title')
 
         # Create tag from selection function in ParserPaper
         data = list()
 
-        exclude_sections = [
-            re.compile(r'.*?acknowledge?ment.*?', re.IGNORECASE),
-            re.compile(r'.*?reference.*?', re.IGNORECASE),
-            re.compile(r'.*?footnote.*?', re.IGNORECASE)
-        ]
         for item in parser.soup.find_all('section_h1'):
-            for tag in item.find_all(**{'name': re.compile('^section_h[1-6]'), 'recursive': False}): # recursive: False seems wrong to include
+            for tag in item.find_all(**{'name': SECTION, 'recursive': False}): # recursive: False seems wrong to include
                 data.extend(extract_paragraphs_recursive(
                     tag,
-                    exclude_section_rules=exclude_sections
+                    exclude_section_rules=EXCLUDE_SECTIONS
                 ))
 
         obj = {
@@ -157,10 +163,26 @@ class RSCCollect(RuleIngredient):
         return obj
 
 
-RSCSoup = Soup(parser_version=__version__)
+class RSCReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from the <meta> tags in <head>,
+    without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(html_str):
+        return citation_metadata(
+            html_str,
+            doi=('citation_doi', 'DC.Identifier'),
+            title=('citation_title', 'DC.title'),
+        )
+
+
+RSCSoup = Soup(parser_version=__version__, accepts_bytes=True)
 RSCSoup.add_ingredient(RSCParseHTML())
 RSCSoup.add_ingredient(RSCRemoveTrash())
 RSCSoup.add_ingredient(RSCChangeAbstractTag())
 RSCSoup.add_ingredient(RSCCreateTags())
 RSCSoup.add_ingredient(RSCCreateTagAbstract())
 RSCSoup.add_ingredient(RSCCollect())
+RSCSoup.set_metadata_ingredient(RSCReadMetadata())
@@ -7,8 +7,13 @@ from __future__ import absolute_import
 import re
 
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.metadata import citation_metadata
 from LimeSoup.parser.parser_paper_springer import ParserPaper
 
+EMPHASIS_ITALIC = re.compile("EmphasisTypeItalic *")
+EMPHASIS_BOLD = re.compile("EmphasisTypeBold *")
+
 
 __author__ = 'Alex van Grootel'
 __maintainer__ = 'Alex van Grootel'
@@ -19,15 +24,22 @@ __version__ = '0.3.0'
 class SpringerFindJournalName(RuleIngredient):
     @staticmethod
     def _parse(html_str):
+        """
+        Find the journal name. It is carried to SpringerCollect together with
+        the HTML string, so that every parse keeps its own journal name.
+        """
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         rules = [
             {'name': 'span', 'class':'JournalTitle'}
         ]
         try:
-            ParserPaper.journal_name = next(x for x in parser.get(rules))
+            journal_name = next(x for x in parser.get(rules))
         except StopIteration:
-            ParserPaper.journal_name = None
-        return parser.raw_html
+            journal_name = None
+        obj = {
+            'Journal': journal_name
+        }
+        return obj, parser.raw_html
 
 
 class SpringerRemoveTagsSmallSub(RuleIngredient):
@@ -41,8 +53,8 @@ class SpringerRemoveTagsSmallSub(RuleIngredient):
         rules = [
                  {'name': 'sub'},
                  {'name': 'sup'},
-                 {'name': 'em', 'class': re.compile("EmphasisTypeItalic *")}, 
-                 {'name': 'strong', 'class': re.compile("EmphasisTypeBold *")},
+                 {'name': 'em', 'class': EMPHASIS_ITALIC}, 
+                 {'name': 'strong', 'class': EMPHASIS_BOLD},
                  {'name': 'div', 'class':'Equation EquationMathjax'},
                  {'name': 'span', 'class':'InlineEquation'},
                  {'name': 'span', 'class':'InternalRef'}
@@ -60,7 +72,8 @@ class SpringerRemoveTagsSmallSub(RuleIngredient):
 
 class SpringerRemoveTrash(RuleIngredient):
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         # Tags to be removed from the HTML paper 
         list_remove = [
             {'name': 'div', 'class': 'Table'},  # Table
@@ -88,57 +101,62 @@ class SpringerRemoveTrash(RuleIngredient):
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         parser.remove_tags(rules=list_remove)
         parser.remove_tag(
-            rules=[{'name': 'p', 'class': 'bold italic', 'string': parser.compile('First published on')}]
+            rules=[{'name': 'p', 'class': 'bold italic', 'string': patterns.FIRST_PUBLISHED}]
         )
-        return parser.raw_html
+        return obj, parser.raw_html
 
 class SpringerCreateTags(RuleIngredient):
 
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         # This create a standard of sections tag name
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         parser.create_tag_sections()
-        return parser.raw_html
+        return obj, parser.raw_html
 
 
 class SpringerCreateTagAbstract(RuleIngredient):
 
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         # Create tag from selection function in ParserPaper
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         parser.create_tag_from_selection(
             rule={'name': 'div', 'class': 'AbstractSection'},
             name_new_tag='h2'
         )
-        return parser.raw_html
+        return obj, parser.raw_html
 
 
 class SpringerReplaceDivTag(RuleIngredient):
 
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         rules = [{'name': 'div'}]
         parser.strip_tags(rules)
-        rules = [{'name': 'span', 'id': parser.compile('^sect[0-9]+$')}]  # some span are heading
+        rules = [{'name': 'span', 'id': patterns.SECTION_ID}]  # some span are heading
         _ = parser.strip_tags(rules)
-        return parser.raw_html
+        return obj, parser.raw_html
 
 class SpringerReplaceDivTagPara(RuleIngredient):
 
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         rules = {'name': 'div', 'class': 'Para'}
         parser.rename_tag(rules, 'p')
-        return parser.raw_html
+        return obj, parser.raw_html
 
 class SpringerCollect(RuleIngredient):
 
     @staticmethod
-    def _parse(html_str):
+    def _parse(parser_obj):
+        obj, html_str = parser_obj
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         # Collect information from the paper using ParserPaper
         parser.get_keywords(rules=[{'name': 'span', 'class': 'Keyword'}])
@@ -156,7 +174,7 @@ class SpringerCollect(RuleIngredient):
             'DOI': '',
             'Title': parser.title,
             'Keywords': parser.keywords,
-            'Journal': ParserPaper.journal_name,
+            'Journal': obj['Journal'],
             'Sections': data
         }
 
@@ -166,7 +184,18 @@ class SpringerCollect(RuleIngredient):
 Error where the paper has paragraphs (content) that is not inside of a tag,
 problem to recover these paragraphs. 
 """
-SpringerSoup = Soup(parser_version=__version__)
+class SpringerReadMetadata(RuleIngredient):
+    """
+    Read DOI, Title, Journal and Keywords from the <meta> tags in <head>,
+    without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(html_str):
+        return citation_metadata(html_str)
+
+
+SpringerSoup = Soup(parser_version=__version__, accepts_bytes=True)
 SpringerSoup.add_ingredient(SpringerRemoveTagsSmallSub())
 SpringerSoup.add_ingredient(SpringerFindJournalName())
 SpringerSoup.add_ingredient(SpringerCreateTagAbstract())
@@ -174,3 +203,4 @@ SpringerSoup.add_ingredient(SpringerRemoveTrash())
 SpringerSoup.add_ingredient(SpringerCreateTags())
 SpringerSoup.add_ingredient(SpringerReplaceDivTagPara())
 SpringerSoup.add_ingredient(SpringerCollect())
+SpringerSoup.set_metadata_ingredient(SpringerReadMetadata())
@@ -1,8 +1,7 @@
-import re
-
-from bs4 import BeautifulSoup
-
 from LimeSoup.lime_soup import Soup, RuleIngredient
+from LimeSoup.parser import patterns
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.metadata import read_html_meta
 from LimeSoup.parser.parser_paper_wiley import ParserPaper
 
 __author__ = 'Zach Jensen'
@@ -36,7 +35,7 @@ class WileyRemoveTagsSmallSub(RuleIngredient):
 
         # Remove some specific span that are inside of a span and p
         parser.strip_tags(rules)
-        tags = parser.soup.find_all(**{'name': re.compile('span|p')})
+        tags = parser.soup.find_all(**{'name': patterns.SPAN_OR_PARAGRAPH})
         for tag in tags:
             for rule in rules:
                 tags_inside_paragraph = tag.find_all(**rule)
@@ -102,7 +101,7 @@ class WileyRemoveTrash(RuleIngredient):
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         parser.remove_tags(rules=list_remove)
         parser.remove_tag(
-            rules=[{'name': 'p', 'class': 'bold italic', 'string': parser.compile('First published on')}]
+            rules=[{'name': 'p', 'class': 'bold italic', 'string': patterns.FIRST_PUBLISHED}]
         )
         return parser.raw_html
 
@@ -140,7 +139,7 @@ class WileyReplaceDivTag(RuleIngredient):
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         rules = [{'name': 'div'}]
         parser.strip_tags(rules)
-        rules = [{'name': 'span', 'id': parser.compile('^sect[0-9]+$')}]  # some span are heading
+        rules = [{'name': 'span', 'id': patterns.SECTION_ID}]  # some span are heading
         _ = parser.strip_tags(rules)
         return parser.raw_html
 
@@ -149,7 +148,7 @@ class WileyCollect(RuleIngredient):
 
     @staticmethod
     def _parse(html_str):
-        soup = BeautifulSoup(html_str, 'html.parser')
+        soup = beautiful_soup(html_str, 'html.parser')
         parser = ParserPaper(html_str, parser_type='html.parser', debugging=False)
         # Collect information from the paper using ParserPaper
         keywords = soup.find_all(attrs={'name':'citation_keywords'})
@@ -231,10 +230,31 @@ class WileyCollect(RuleIngredient):
         return obj
 
 
-WileySoup = Soup(parser_version=__version__)
+class WileyReadMetadata(RuleIngredient):
+    """
+    Read the same metadata as WileyCollect, only from the <meta> tags in
+    <head>, without parsing the body.
+    """
+
+    @staticmethod
+    def _parse(html_str):
+        metas = read_html_meta(html_str)
+        journal_name = metas.get('citation_journal_title', [None])[0]
+        doi = metas.get('citation_doi', [None])[0]
+        title = metas.get('citation_title', [None])[0]
+        return {
+            'DOI': doi,
+            'Title': ParserPaper.format_text(title) if title is not None else None,
+            'Keywords': [ParserPaper.format_text(x) for x in metas.get('citation_keywords', [])],
+            'Journal': ParserPaper.format_text(journal_name) if journal_name is not None else None,
+        }
+
+
+WileySoup = Soup(parser_version=__version__, accepts_bytes=True)
 WileySoup.add_ingredient(WileyRemoveTagsSmallSub())
 WileySoup.add_ingredient(WileyRemoveTrash())
 WileySoup.add_ingredient(WileyCreateTags())
 # WileySoup.add_ingredient(WileyCreateTagAbstract())
 WileySoup.add_ingredient(WileyReplaceDivTag())
-WileySoup.add_ingredient(WileyCollect())
\ No newline at end of file
+WileySoup.add_ingredient(WileyCollect())
+WileySoup.set_metadata_ingredient(WileyReadMetadata())
@@ -1,88 +1,96 @@
 from synthesis_api_hub import api_method
 from synthesis_api_hub.apiegg import APIEgg
 
-from LimeSoup.ACSSoup import ACSSoup
-from LimeSoup.AIPSoup import AIPSoup
-from LimeSoup.APSSoup import APSSoup
-from LimeSoup.ECSSoup import ECSSoup
-from LimeSoup.ElsevierSoup import ElsevierSoup
-from LimeSoup.NatureSoup import NatureSoup
-from LimeSoup.RSCSoup import RSCSoup
-from LimeSoup.SpringerSoup import SpringerSoup
-from LimeSoup.WileySoup import WileySoup
+from LimeSoup.batch import parse_documents, parse_records
+from LimeSoup.pool import LimitedProcessPool
+from LimeSoup.registry import SOUPS, get_soup
 
 
-class LimeSoupWorker(APIEgg):
-    namespace = 'html_parser'
+def _named(function, name):
+    function.__name__ = name
+    function.__qualname__ = 'LimeSoupWorker.' + name
+    return function
 
-    @api_method
-    def version_ecs(self):
-        return ECSSoup.version
 
-    @api_method
-    def parse_ecs(self, html_string):
-        return ECSSoup.parse(html_string)
+def _version_method(publisher, soup):
+    def version(self):
+        return soup.version
+    return _named(version, 'version_' + publisher)
 
-    @api_method
-    def version_rsc(self):
-        return RSCSoup.version
 
-    @api_method
-    def parse_rsc(self, html_string):
-        return RSCSoup.parse(html_string)
-
-    @api_method
-    def version_elsevier(self):
-        return ElsevierSoup.version
+def _parse_method(publisher, soup):
+    def parse(self, html_string):
+        return soup.parse(html_string)
+    return _named(parse, 'parse_' + publisher)
 
-    @api_method
-    def parse_elsevier(self, html_string):
-        return ElsevierSoup.parse(html_string)
-
-    @api_method
-    def version_springer(self):
-        return SpringerSoup.version
-
-    @api_method
-    def parse_springer(self, html_string):
-        return SpringerSoup.parse(html_string)
-
-    @api_method
-    def version_nature(self):
-        return NatureSoup.version
-
-    @api_method
-    def parse_nature(self, html_string):
-        return NatureSoup.parse(html_string)
 
-    @api_method
-    def version_wiley(self):
-        return WileySoup.version
-
-    @api_method
-    def parse_wiley(self, html_string):
-        return WileySoup.parse(html_string)
-
-    @api_method
-    def version_acs(self):
-        return ACSSoup.version
-
-    @api_method
-    def parse_acs(self, html_string):
-        return ACSSoup.parse(html_string)
-
-    @api_method
-    def version_aps(self):
-        return APSSoup.version
-
-    @api_method
-    def parse_aps(self, html_string):
-        return APSSoup.parse(html_string)
-
-    @api_method
-    def version_aip(self):
-        return AIPSoup.version
+class LimeSoupWorker(APIEgg):
+    """
+    parse_<publisher>(html_string) and version_<publisher>() for every soup
+    of LimeSoup.registry, plus batch methods, which parse many papers per
+    call in a pool of processes kept by the worker.
+    """
+    namespace = 'html_parser'
 
-    @api_method
-    def parse_aip(self, html_string):
-        return AIPSoup.parse(html_string)
+    # Size of the process pool of the batch methods, None for the CPU count
+    max_workers = None
+    # Seconds and bytes of memory a paper may take in the pool, None for no
+    # limit. Papers over a limit get a failed record, see LimeSoup.pool.
+    timeout = None
+    max_rss = None
+    # Papers parsed by a process of the pool before it is replaced, None to
+    # keep the processes for good.
+    max_docs_per_worker = None
+
+    for _publisher, _soup in SOUPS.items():
+        locals()['version_' + _publisher] = api_method(_version_method(_publisher, _soup))
+        locals()['parse_' + _publisher] = api_method(_parse_method(_publisher, _soup))
+    del _publisher, _soup
+
+    def _pool(self):
+        # Created on the first batch, so that workers only serving single
+        # papers do not fork.
+        if getattr(self, '_executor', None) is None:
+            self._executor = LimitedProcessPool(self.max_workers, timeout=self.timeout, max_rss=self.max_rss,
+                                                max_tasks_per_worker=self.max_docs_per_worker)
+        return self._executor
+
+    def _parse_batch(self, papers, precheck=False):
+        return list(parse_records(papers, executor=self._pool(), precheck=precheck))
+
+    @api_method
+    def parse_batch(self, publisher, html_strings, precheck=False):
+        """
+        :param publisher: key of LimeSoup.registry.SOUPS, e.g. 'rsc'.
+        :param html_strings: list of raw papers.
+        :param precheck: give the pages that are no full text (abstracts,
+            paywalls...) a failed record instead of parsing them, see
+            Soup.parse(). Off by default, like parse_<publisher>.
+        :return: list of records (see LimeSoup.batch.parse_record), one per
+            paper in order, with the result or the error.
+        """
+        publisher = publisher.lower()
+        get_soup(publisher)
+        return self._parse_batch([(publisher, x) for x in html_strings], precheck)
+
+    @api_method
+    def parse_auto_batch(self, docs, precheck=False):
+        """
+        Parse papers of any publishers, told from their DOI.
+
+        :param docs: list of raw papers, or dicts with html_string and
+            optionally publisher or doi.
+        :param precheck: see parse_batch.
+        :return: list of records, see parse_batch. Papers of an unknown
+            publisher, and documents without a raw paper, have a failed
+            record.
+        """
+        return list(parse_documents(docs, executor=self._pool(), precheck=precheck))
+
+    def close(self):
+        """
+        Shut down the process pool of the batch methods.
+        """
+        if getattr(self, '_executor', None) is not None:
+            self._executor.shutdown()
+            self._executor = None
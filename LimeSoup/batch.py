@@ -0,0 +1,691 @@
+"""
+Parse many papers with a soup, using a pool of threads or processes.
+
+Threads avoid pickling the (often large) HTML strings and the nested
+'Sections' results across process boundaries. They pay off on free-threaded
+CPython builds (3.13+), and for soups that spend most of their time in lxml,
+which releases the GIL while parsing. On regular builds, processes are used
+by default.
+
+As a script, parse files into a sink (see LimeSoup.sinks):
+
+    python -m LimeSoup.batch <files, archives or directories> --output papers.jsonl.gz [--publisher rsc]
+
+Without --publisher, the publisher of a file is the name of its directory,
+e.g. corpus/rsc/paper.html, or the publisher recorded in its archive.
+Papers are read as bytes (see LimeSoup.readers) and decoded by the soups.
+The largest papers are parsed first (--schedule size, see LimeSoup.schedule),
+so records are written in the order the papers are parsed. With --shard i/N,
+only the papers of shard i are parsed, and a manifest of the run is written
+next to the output, see LimeSoup.shard.
+
+Each record keeps the fingerprints of the parser that made it. With
+--incremental previous.jsonl.gz, the papers whose parser did not change
+since that run are copied from it instead of parsed, and with --stage-cache
+the others resume from the last parser stage that did not change, see
+LimeSoup.stage_cache. Papers that a quick scan tells are no full text
+(paywalls, abstracts, error pages...) are not parsed, see LimeSoup.validate
+and --no-validate.
+"""
+import argparse
+import collections
+import concurrent.futures
+import contextlib
+import functools
+import itertools
+import os
+import sys
+
+from LimeSoup.errors import count_errors, error_stage
+from LimeSoup.pool import DocumentLimitExceeded, LimitedProcessPool
+from LimeSoup.readers import is_archive, iter_inputs, open_paper
+from LimeSoup.registry import SOUPS, detect_publisher, get_soup, publisher_of_doi
+from LimeSoup.result import Document
+from LimeSoup.schedule import SCHEDULES, CostModel, iter_longest_first, paper_size
+from LimeSoup.shard import (Manifest, content_key, manifest_filename, paper_key, parse_shard, read_records,
+                            record_key, select_shard)
+from LimeSoup.sinks import open_sink
+from LimeSoup.stage_cache import StageCache
+from LimeSoup.validate import validate_paper
+
+__all__ = ['EXECUTORS', 'gil_disabled', 'resolve_executor', 'parse_many',
+           'parse_file', 'parse_record', 'failed_record', 'parse_records', 'parse_documents', 'document_paper',
+           'iter_papers', 'run_batch',
+           'format_errors', 'format_pool_stats']
+
+EXECUTORS = ('auto', 'thread', 'process', 'serial')
+
+# Keys of the raw paper in a document given as a dict, see document_paper
+DOCUMENT_KEYS = ('html_string', 'xml_string', 'html', 'xml')
+
+
+def gil_disabled():
+    """
+    :return: True if running on a free-threaded CPython with the GIL disabled.
+    """
+    is_gil_enabled = getattr(sys, '_is_gil_enabled', None)
+    return is_gil_enabled is not None and not is_gil_enabled()
+
+
+def resolve_executor(executor='auto'):
+    """
+    Translate the executor name 'auto' into 'thread' or 'process'.
+
+    :param executor: one of EXECUTORS
+    :return: one of 'thread', 'process', 'serial'
+    """
+    if executor not in EXECUTORS:
+        raise ValueError('Unknown executor %r, choose from %r' % (executor, EXECUTORS))
+    if executor == 'auto':
+        return 'thread' if gil_disabled() else 'process'
+    return executor
+
+
+def _parse_one(soup, html_str, return_exceptions=False):
+    try:
+        return soup.parse(html_str)
+    except Exception as e:
+        if return_exceptions:
+            return e
+        raise
+
+
+def parse_many(soup, html_strs, executor='auto', max_workers=None, chunksize=1,
+               return_exceptions=False, timeout=None, max_rss=None, max_docs_per_worker=None,
+               shard=None, shard_key=None):
+    """
+    Parse papers concurrently. Results are yielded in the order of html_strs.
+
+    :param soup: the LimeSoup.lime_soup.Soup to parse with.
+    :param html_strs: iterable of raw HTML/XML strings.
+    :param executor: 'auto', 'thread', 'process', 'serial', or an instance of
+        concurrent.futures.Executor (which is not shut down afterwards).
+    :param max_workers: number of threads/processes, see concurrent.futures.
+    :param chunksize: number of papers sent to a worker process at a time.
+    :param return_exceptions: yield the exception raised by a paper instead
+        of raising it.
+    :param timeout: seconds a paper may take, see LimeSoup.pool. A paper
+        over the limit raises (or yields) DocumentTimeout.
+    :param max_rss: bytes of memory a worker process may use for a paper,
+        or DocumentMemoryExceeded.
+    :param max_docs_per_worker: papers parsed by a worker process before it
+        is replaced by a new one, see LimeSoup.pool.
+    :param shard: 'i/N' or (i, N) to parse only the papers of shard i of N,
+        see LimeSoup.shard.
+    :param shard_key: function of a paper giving the key it is sharded by,
+        e.g. its DOI; by default a digest of its content.
+    :return: generator of parse results.
+    """
+    if not isinstance(executor, concurrent.futures.Executor):
+        executor = resolve_executor(executor)
+    if shard is not None:
+        html_strs = select_shard(html_strs, parse_shard(shard), shard_key or content_key)
+    parse = functools.partial(_parse_one, soup, return_exceptions=return_exceptions)
+    failed = (lambda html_str, error: error) if return_exceptions else None
+    return _iter_results(parse, html_strs, executor, max_workers, chunksize, timeout, max_rss, failed,
+                         max_docs_per_worker)
+
+
+@contextlib.contextmanager
+def _open_executor(executor, max_workers, timeout=None, max_rss=None, max_docs_per_worker=None):
+    """
+    :return: context of the executor to parse in, None for 'serial'. An
+        executor given as an instance is not shut down.
+    """
+    if timeout is not None or max_rss is not None or max_docs_per_worker is not None:
+        if executor != 'process':
+            raise ValueError('timeout, max_rss and max_docs_per_worker need the process executor')
+        with LimitedProcessPool(max_workers, timeout=timeout, max_rss=max_rss,
+                                max_tasks_per_worker=max_docs_per_worker) as pool:
+            yield pool
+    elif isinstance(executor, concurrent.futures.Executor):
+        yield executor
+    elif executor == 'serial':
+        yield None
+    elif executor == 'thread':
+        with concurrent.futures.ThreadPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
+    else:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=max_workers) as pool:
+            yield pool
+
+
+def _iter_results(parse, items, executor, max_workers, chunksize, timeout=None, max_rss=None,
+                  failed=None, max_docs_per_worker=None, metrics=None):
+    """
+    :param metrics: dict updated with LimitedProcessPool.stats() when the
+        papers are parsed in one.
+    """
+    with _open_executor(executor, max_workers, timeout, max_rss, max_docs_per_worker) as pool:
+        if pool is None:
+            for item in items:
+                yield parse(item)
+        elif isinstance(pool, LimitedProcessPool):
+            for result in _iter_limited(parse, items, pool, failed):
+                yield result
+            if metrics is not None:
+                metrics.update(pool.stats())
+        else:
+            for result in pool.map(parse, items, chunksize=chunksize):
+                yield result
+
+
+def _iter_scheduled(parse, items, executor, max_workers, timeout=None, max_rss=None, failed=None,
+                    max_docs_per_worker=None, metrics=None, schedule='size', window=1000, cost_model=None):
+    """
+    Parse the most costly items first, see LimeSoup.schedule. Results are
+    yielded as the items are parsed.
+    """
+    cost = cost_model.predict if schedule == 'cost' else paper_size
+    with _open_executor(executor, max_workers, timeout, max_rss, max_docs_per_worker) as pool:
+        for result in iter_longest_first(parse, items, pool, cost, window, failed, cost_model):
+            yield result
+        if metrics is not None and isinstance(pool, LimitedProcessPool):
+            metrics.update(pool.stats())
+
+
+def _iter_limited(parse, items, pool, failed=None):
+    """
+    Parse items in a LimitedProcessPool, a few ahead of the one yielded.
+
+    :param failed: function of (item, DocumentLimitExceeded) giving the
+        result of an item stopped by the pool, None to raise the error.
+    """
+    pending = collections.deque()
+    items = iter(items)
+    while True:
+        for item in itertools.islice(items, 2 * pool.max_workers - len(pending)):
+            pending.append((item, pool.submit(parse, item)))
+        if not pending:
+            return
+        item, future = pending.popleft()
+        try:
+            result = future.result()
+        except DocumentLimitExceeded as e:
+            if failed is None:
+                raise
+            result = failed(item, e)
+        yield result
+
+
+def parse_file(paper, compact=False, encoding=None, stage_cache=None, inputs=None, precheck=False):
+    """
+    :param paper: (publisher, path) of a paper file, memory-mapped unless it
+        is compressed, or (publisher, name, data) of a paper read out of an
+        archive (see LimeSoup.readers).
+    :param compact: make the result a LimeSoup.result.Document, which takes
+        less memory and is cheaper to pickle than the dict.
+    :param encoding: encoding of the papers, sniffed from the markup when None.
+    :param stage_cache: a LimeSoup.stage_cache.StageCache to resume the
+        parse from, None to parse from scratch.
+    :param inputs: the paths the paper was listed from, see
+        LimeSoup.shard.paper_key.
+    :param precheck: see parse_record.
+    :return: record with path, key, publisher, DOI, parser_version,
+        parser_fingerprints, parser_successful, parser_error, parser_failure
+        and result.
+    """
+    publisher, path = paper[:2]
+    record = {'path': path, 'key': paper_key(paper, inputs)}
+    if len(paper) > 2:
+        record.update(parse_record(publisher, paper[2], compact, encoding, stage_cache, precheck))
+    else:
+        with open_paper(path) as data:
+            record.update(parse_record(publisher, data, compact, encoding, stage_cache, precheck))
+    return record
+
+
+def _failed_file(paper, error, inputs=None):
+    record = {'path': paper[1], 'key': paper_key(paper, inputs)}
+    record.update(failed_record(paper[0], error))
+    return record
+
+
+def parse_record(publisher, data, compact=False, encoding=None, stage_cache=None, precheck=False):
+    """
+    Parse a paper, catching the errors.
+
+    :param publisher: key of LimeSoup.registry.SOUPS. None (the publisher
+        could not be told) makes a failed record.
+    :param data: raw paper, str or bytes-like.
+    :param compact: see parse_file.
+    :param encoding: see parse_file.
+    :param stage_cache: see parse_file.
+    :param precheck: run the precheck of the soup first, which rejects the
+        pages that are no full text, see Soup.parse(). Off by default, as in
+        Soup.parse().
+    :return: record with publisher, DOI, parser_version,
+        parser_fingerprints (see Soup.fingerprints), parser_successful,
+        parser_error, parser_failure ('error' if the parser raised),
+        parser_error_type (the class of the error, e.g. BodyNotFound, see
+        LimeSoup.errors), parser_error_stage (the ingredient that raised it,
+        or 'precheck') and result.
+    """
+    try:
+        if publisher is None:
+            raise ValueError('Cannot tell the publisher of the paper')
+        soup = get_soup(publisher)
+    except ValueError as e:
+        return failed_record(publisher, e)
+    try:
+        if stage_cache is None:
+            result = soup.parse(data, encoding=encoding, precheck=precheck)
+        else:
+            result = soup.parse_cached(data, stage_cache, encoding=encoding, precheck=precheck)
+    except Exception as e:
+        return failed_record(publisher, e)
+    record = _record(publisher, soup)
+    if isinstance(result, dict):
+        record['DOI'] = result.get('DOI')
+        if compact:
+            result = Document.from_dict(result)
+    record['parser_successful'] = True
+    record['result'] = result
+    return record
+
+
+def failed_record(publisher, error):
+    """
+    :param error: the exception raised by the parser, or a
+        LimeSoup.pool.DocumentLimitExceeded, whose kind ('timeout', 'oom',
+        'died') is the parser_failure of the record.
+    :return: the record of a paper that failed, see parse_record.
+    """
+    record = _record(publisher, SOUPS.get(publisher) if publisher else None)
+    record['parser_error'] = '%s: %s' % (type(error).__name__, error)
+    record['parser_failure'] = getattr(error, 'kind', None) or 'error'
+    record['parser_error_type'] = type(error).__name__
+    record['parser_error_stage'] = error_stage(error)
+    return record
+
+
+def _record(publisher, soup):
+    return {
+        'publisher': publisher,
+        'DOI': None,
+        'parser_version': soup.version if soup is not None else None,
+        'parser_fingerprints': soup.fingerprints if soup is not None else None,
+        'parser_successful': False,
+        'parser_error': None,
+        'parser_failure': None,
+        'parser_error_type': None,
+        'parser_error_stage': None,
+        'result': None,
+    }
+
+
+def _parse_record(paper, compact=False, encoding=None, precheck=False):
+    return parse_record(paper[0], paper[1], compact, encoding, precheck=precheck)
+
+
+def _failed_paper(paper, error):
+    return failed_record(paper[0], error)
+
+
+def parse_records(papers, executor='auto', max_workers=None, chunksize=1, compact=False,
+                  encoding=None, timeout=None, max_rss=None, max_docs_per_worker=None, precheck=False):
+    """
+    Parse papers held in memory, concurrently. Errors are recorded, not
+    raised, so that one bad paper does not fail the others.
+
+    :param papers: iterable of (publisher, data), see parse_record.
+    :param executor: see parse_many. A LimeSoup.pool.LimitedProcessPool
+        enforces its limits.
+    :param timeout: see parse_many. Papers over a limit get a failed record
+        (parser_failure 'timeout' or 'oom').
+    :param max_rss: see parse_many.
+    :param max_docs_per_worker: see parse_many.
+    :param precheck: reject the pages that are no full text with the
+        precheck of their soup, see parse_record.
+    :return: generator of records (see parse_record), in the order of papers.
+    """
+    if not isinstance(executor, concurrent.futures.Executor):
+        executor = resolve_executor(executor)
+    parse = functools.partial(_parse_record, compact=compact, encoding=encoding, precheck=precheck)
+    return _iter_results(parse, papers, executor, max_workers, chunksize, timeout, max_rss,
+                         _failed_paper, max_docs_per_worker)
+
+
+def parse_documents(docs, **kwargs):
+    """
+    Parse documents of any publishers, see document_paper.
+
+    :param docs: list of raw papers, or dicts with the raw paper and
+        optionally its publisher or doi.
+    :param kwargs: see parse_records.
+    :return: generator of records, one per document in order. A document
+        that document_paper cannot read (e.g. a dict without the raw paper)
+        has a failed record, like a paper of an unknown publisher.
+    """
+    papers = []
+    failed = {}
+    for i, doc in enumerate(docs):
+        try:
+            papers.append(document_paper(doc))
+        except Exception as e:
+            failed[i] = failed_record(None, e)
+    records = parse_records(papers, **kwargs)
+    for i in range(len(docs)):
+        yield failed[i] if i in failed else next(records)
+
+
+def document_paper(doc, publisher=None):
+    """
+    :param doc: raw paper, or dict with the raw paper (one of DOCUMENT_KEYS)
+        and optionally its publisher or doi.
+    :param publisher: publisher of the paper, if known.
+    :return: (publisher, raw paper), see parse_record. The publisher is told
+        from the DOI when not given, and is None if unknown.
+    """
+    if not isinstance(doc, dict):
+        return publisher or detect_publisher(doc), doc
+    raw = next((doc[x] for x in DOCUMENT_KEYS if doc.get(x) is not None), None)
+    if raw is None:
+        raise ValueError('Document has none of the keys %r' % (DOCUMENT_KEYS,))
+    publisher = publisher or doc.get('publisher')
+    if publisher is not None:
+        return publisher.lower(), raw
+    return publisher_of_doi(doc.get('doi') or doc.get('DOI')) or detect_publisher(raw), raw
+
+
+def _publisher(filename, publisher=None):
+    name = (publisher or os.path.basename(os.path.dirname(os.path.abspath(filename)))).lower()
+    if name not in SOUPS:
+        raise ValueError('Cannot tell the publisher of %s, use --publisher' % filename)
+    return name
+
+
+def iter_papers(paths, publisher=None, data_key=None):
+    """
+    :param paths: files, or directories searched recursively. JSON lines
+        and tar archives (.jsonl, .tar, compressed or not) are read paper by
+        paper, see LimeSoup.readers.
+    :param publisher: publisher of all the papers, by default the one
+        recorded in the archive, or the name of the directory of each file.
+    :param data_key: key of the raw paper in JSON lines.
+    :return: generator of (publisher, path), or (publisher, name, data) for
+        papers in archives.
+    """
+    for path in paths:
+        if os.path.isdir(path):
+            filenames = sorted(
+                os.path.join(root, name)
+                for root, _, names in os.walk(path) for name in names)
+        else:
+            filenames = [path]
+        for filename in filenames:
+            if not is_archive(filename):
+                yield _publisher(filename, publisher), filename
+                continue
+            for paper in iter_inputs(filename, data_key):
+                recorded = paper.publisher if paper.publisher and paper.publisher.lower() in SOUPS else None
+                yield _publisher(filename, publisher or recorded), paper.name, paper.data
+
+
+def run_batch(papers, sink, executor='auto', max_workers=None, chunksize=1, compact=False,
+              encoding=None, timeout=None, max_rss=None, max_docs_per_worker=None, schedule='input',
+              window=1000, cost_model=None, shard=None, manifest=None, previous=None, stage_cache=None,
+              validate=False, inputs=None):
+    """
+    Parse paper files and write their records (see parse_file) to a sink,
+    which batches the writes. The sink is not closed.
+
+    :param papers: iterable of (publisher, path) or (publisher, name, data),
+        see iter_papers.
+    :param sink: a LimeSoup.sinks.Sink.
+    :param compact: hold the results as LimeSoup.result.Document until the
+        sink writes them.
+    :param timeout: seconds a paper may take, see parse_records.
+    :param max_rss: bytes of memory a worker process may use for a paper.
+    :param max_docs_per_worker: papers parsed by a worker process before it
+        is replaced by a new one.
+    :param schedule: 'input' to parse the papers in their order, 'size' to
+        parse the largest first, 'cost' to parse first those that a
+        LimeSoup.schedule.CostModel expects to take longest. With 'size' and
+        'cost', papers are sorted by windows of `window` papers, and records
+        are written as the papers are parsed.
+    :param cost_model: CostModel used with 'cost' (a new one by default),
+        which learns from the parsing times with 'size' and 'cost'.
+    :param shard: 'i/N' or (i, N) to parse only the papers of shard i of N,
+        by their key, see LimeSoup.shard.
+    :param manifest: a LimeSoup.shard.Manifest to add the records to.
+    :param previous: JSON lines output of an earlier run over the same
+        papers. Papers whose record there was made by a pipeline with the
+        same fingerprint as now (see Soup.fingerprint) are not parsed again:
+        their records are copied, after the parsed ones.
+    :param stage_cache: a LimeSoup.stage_cache.StageCache, so that papers
+        parsed again resume from the last ingredient that did not change.
+    :param validate: check the papers before sending them to the parser
+        (see LimeSoup.validate), and skip those that are no full text: their
+        record has parser_failure 'rejected' and the error of the verdict.
+        Without it, all the papers are parsed.
+    :param inputs: the paths the papers were listed from, to key them by
+        their path relative to these (see LimeSoup.shard.paper_key) rather
+        than as listed.
+    :return: dict with the numbers of documents, successful and failed (and
+        unchanged, copied from previous, and rejected, with validate), the errors by type and stage when
+        papers failed (see LimeSoup.errors.count_errors), and the metrics of the worker processes (see
+        LimeSoup.pool.LimitedProcessPool.stats) when they were limited or
+        recycled.
+    """
+    if not isinstance(executor, concurrent.futures.Executor):
+        executor = resolve_executor(executor)
+    if schedule not in SCHEDULES:
+        raise ValueError('Unknown schedule %r, choose from %r' % (schedule, SCHEDULES))
+    key = functools.partial(paper_key, inputs=inputs)
+    failed = functools.partial(_failed_file, inputs=inputs)
+    if shard is not None:
+        papers = select_shard(papers, parse_shard(shard), key)
+    unchanged = set()
+    if previous is not None:
+        papers = _changed_papers(papers, _previous_fingerprints(previous), unchanged, key)
+    rejected = collections.deque()
+    if validate:
+        papers = _valid_papers(papers, rejected, failed, encoding)
+    # Validated papers were checked already, and the others are all parsed
+    parse = functools.partial(parse_file, compact=compact, encoding=encoding, stage_cache=stage_cache,
+                              inputs=inputs, precheck=False)
+    stats = {'documents': 0, 'successful': 0, 'failed': 0}
+    if schedule == 'input':
+        records = _iter_results(parse, papers, executor, max_workers, chunksize, timeout, max_rss,
+                                failed, max_docs_per_worker, stats)
+    else:
+        if schedule == 'cost' and cost_model is None:
+            cost_model = CostModel()
+        records = _iter_scheduled(parse, papers, executor, max_workers, timeout, max_rss, failed,
+                                  max_docs_per_worker, stats, schedule, window, cost_model)
+    if previous is not None:
+        # unchanged is filled as the papers are read, copied once they are parsed
+        stats['unchanged'] = 0
+        records = itertools.chain(records, _unchanged_records(previous, unchanged, stats))
+    if validate:
+        stats['rejected'] = 0
+        records = _interleave(records, rejected, stats)
+    errors = collections.Counter()
+    for record in records:
+        sink.write(record)
+        if manifest is not None:
+            manifest.add(record)
+        stats['documents'] += 1
+        stats['successful' if record['parser_successful'] else 'failed'] += 1
+        if not record['parser_successful']:
+            errors[record.get('parser_error_type'), record.get('parser_error_stage')] += 1
+    if errors:
+        stats['errors'] = count_errors(errors)
+    return stats
+
+
+def format_errors(errors):
+    """
+    :param errors: see LimeSoup.errors.count_errors.
+    :return: lines of the error counts by type and stage, for humans.
+    """
+    return ['%8d %s in %s' % (count, error_type, stage)
+            for error_type, stages in sorted(errors.items(), key=lambda x: -sum(x[1].values()))
+            for stage, count in sorted(stages.items(), key=lambda x: -x[1])]
+
+
+def _valid_papers(papers, rejected, failed=_failed_file, encoding=None):
+    """
+    :return: generator of the papers that pass validation, adding the
+        records of the others to rejected.
+    """
+    for paper in papers:
+        verdict = validate_paper(paper, encoding)
+        if verdict.ok:
+            yield paper
+            continue
+        record = failed(paper, verdict.error())
+        record['parser_failure'] = 'rejected'
+        rejected.append(record)
+
+
+def _interleave(records, rejected, stats):
+    """
+    :return: generator of the records, each followed by the records rejected
+        meanwhile, which are few in memory at a time.
+    """
+    for record in itertools.chain(records, [None]):
+        if record is not None:
+            yield record
+        while rejected:
+            stats['rejected'] += 1
+            yield rejected.popleft()
+
+
+def _previous_fingerprints(filename):
+    """
+    :return: dict of the keys of the records of an output to the
+        fingerprints of the pipelines that made them. Failures to the limits
+        of a run (timeout, oom) are left out, to be parsed again.
+    """
+    fingerprints = {}
+    for record in read_records(filename):
+        chain = record.get('parser_fingerprints')
+        if chain and record.get('parser_failure') not in ('timeout', 'oom'):
+            fingerprints[record_key(record)] = chain[-1]
+    return fingerprints
+
+
+def _changed_papers(papers, previous, unchanged, key=paper_key):
+    """
+    :return: generator of the papers whose pipeline changed since previous,
+        adding the keys of the others to unchanged.
+    """
+    current = {}
+    for paper in papers:
+        publisher = paper[0]
+        if publisher not in current:
+            current[publisher] = SOUPS[publisher].fingerprint
+        paper_id = key(paper)
+        if paper_id in previous and previous[paper_id] == current[publisher]:
+            unchanged.add(paper_id)
+        else:
+            yield paper
+
+
+def _unchanged_records(filename, keys, stats):
+    for record in read_records(filename):
+        if record_key(record) in keys:
+            keys.discard(record_key(record))
+            stats['unchanged'] += 1
+            yield record
+
+
+def format_pool_stats(stats):
+    """
+    :param stats: see LimeSoup.pool.LimitedProcessPool.stats.
+    :return: one line of the worker metrics, for humans.
+    """
+    return ('workers: %d started, %d recycled, max RSS %.0f MB; '
+            'GC: %d collections, %.1f ms in total, longest %.1f ms' % (
+                stats['workers_started'], stats['workers_recycled'], stats['max_rss'] / 2 ** 20,
+                stats['gc_collections'], stats['gc_pause'] * 1000, stats['gc_max_pause'] * 1000))
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Parse paper files into a JSONL or SQLite sink.')
+    arg_parser.add_argument('paths', nargs='+',
+                            help='paper files (.gz, .zst), archives (.jsonl, .tar, compressed or not), '
+                                 'or directories of them')
+    arg_parser.add_argument('--output', '-o', required=True,
+                            help='.jsonl, .jsonl.gz, .sqlite or .parquet (paragraphs) file')
+    arg_parser.add_argument('--publisher', choices=list(SOUPS),
+                            help='publisher of all the files, by default their directory name')
+    arg_parser.add_argument('--encoding', help='encoding of the papers, by default sniffed from the markup')
+    arg_parser.add_argument('--data-key', help='key of the raw paper in JSON lines, by default html, xml...')
+    arg_parser.add_argument('--executor', choices=EXECUTORS, default='auto')
+    arg_parser.add_argument('--max-workers', type=int)
+    arg_parser.add_argument('--chunksize', type=int, default=4)
+    arg_parser.add_argument('--batch-size', type=int, default=100, help='records per write')
+    arg_parser.add_argument('--flush-interval', type=float, default=5.0,
+                            help='seconds before buffered records are written')
+    arg_parser.add_argument('--append', action='store_true',
+                            help='append to a JSON lines output (SQLite outputs are always appended to)')
+    arg_parser.add_argument('--timeout', type=float,
+                            help='seconds a paper may take before its worker is killed (timeout failure)')
+    arg_parser.add_argument('--max-rss', type=float,
+                            help='MB of memory a worker may use for a paper before it is killed (oom failure)')
+    arg_parser.add_argument('--max-docs-per-worker', type=int,
+                            help='papers parsed by a worker process before it is replaced by a new one')
+    arg_parser.add_argument('--schedule', choices=SCHEDULES, default='size',
+                            help='order of parsing: input order, largest first (size), or longest first '
+                                 'according to a cost model learned per publisher (cost)')
+    arg_parser.add_argument('--schedule-window', type=int, default=1000,
+                            help='papers sorted at a time, and held in memory, by the size and cost schedules')
+    arg_parser.add_argument('--cost-model',
+                            help='JSON file of the cost model, read if it exists and updated after the run')
+    arg_parser.add_argument('--shard', type=parse_shard, metavar='i/N',
+                            help='parse only shard i (0-based) of N, see LimeSoup.shard')
+    arg_parser.add_argument('--manifest',
+                            help='manifest of the run, by default <output>.manifest.json with --shard')
+    arg_parser.add_argument('--incremental', metavar='PREVIOUS_OUTPUT',
+                            help='JSON lines output of an earlier run: papers whose parser did not change '
+                                 'since are copied from it instead of parsed')
+    arg_parser.add_argument('--stage-cache', metavar='FILE',
+                            help='SQLite cache of the outputs of the parser stages, to resume the papers '
+                                 'parsed again from the last stage that did not change')
+    arg_parser.add_argument('--no-validate', dest='validate', action='store_false',
+                            help='parse all the papers, also those that a quick scan tells are no full text '
+                                 '(paywalls, abstracts...), see LimeSoup.validate')
+    arg_parser.add_argument('--compact', action='store_true',
+                            help='keep results in the compact model (LimeSoup.result) until written')
+    args = arg_parser.parse_args(argv)
+    if args.incremental and os.path.abspath(args.incremental) == os.path.abspath(args.output):
+        arg_parser.error('--incremental must be another file than --output')
+    # SQLite outputs are always appended to, Parquet files cannot be
+    if args.append and not args.output.lower().endswith(('.jsonl', '.json', '.gz')):
+        arg_parser.error('--append only applies to JSON lines outputs (.jsonl, .jsonl.gz)')
+
+    kwargs = {'batch_size': args.batch_size, 'flush_interval': args.flush_interval}
+    if args.append:
+        kwargs['append'] = True
+    cost_model = CostModel.load(args.cost_model) if args.cost_model else None
+    manifest_file = args.manifest or (manifest_filename(args.output) if args.shard else None)
+    manifest = Manifest(args.shard, args.paths) if manifest_file else None
+    with open_sink(args.output, **kwargs) as sink:
+        stats = run_batch(iter_papers(args.paths, args.publisher, args.data_key), sink,
+                          executor=args.executor, max_workers=args.max_workers, chunksize=args.chunksize,
+                          compact=args.compact, encoding=args.encoding, timeout=args.timeout,
+                          max_rss=int(args.max_rss * 1024 * 1024) if args.max_rss else None,
+                          max_docs_per_worker=args.max_docs_per_worker, schedule=args.schedule,
+                          window=args.schedule_window, cost_model=cost_model, shard=args.shard,
+                          manifest=manifest, previous=args.incremental,
+                          stage_cache=StageCache(args.stage_cache) if args.stage_cache else None,
+                          validate=args.validate, inputs=args.paths)
+    if manifest is not None:
+        manifest.write(manifest_file)
+    if cost_model is not None:
+        cost_model.save(args.cost_model)
+    print('%(documents)d documents, %(successful)d parsed, %(failed)d failed' % stats
+          + (', %(rejected)d rejected by validation' % stats if 'rejected' in stats else '')
+          + (', %(unchanged)d unchanged' % stats if 'unchanged' in stats else ''))
+    if 'errors' in stats:
+        print('failures by error and stage:')
+        print('\n'.join(format_errors(stats['errors'])))
+    if 'workers_started' in stats:
+        print(format_pool_stats(stats))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+"""
+Why a paper could not be parsed.
+
+The soups raise subclasses of LimeSoupError, which tell a page that is not
+an article (a paywall, an abstract, a landing page) from an article whose
+body cannot be found, whose markup is broken, or whose template the parser
+does not know:
+
+    LimeSoupError (a ValueError)
+    +-- NotAnArticle
+    |   +-- Paywalled
+    |   +-- AbstractOnly
+    |   +-- LandingPage
+    +-- BodyNotFound
+    +-- MetadataNotFound
+    +-- MalformedMarkup
+    +-- UnsupportedTemplate
+
+Each error has the stage that raised it: the name of the rule ingredient, or
+'precheck' for the checks of the raw markup run before the ingredients (see
+LimeSoup.parser.prechecks). Ingredients raise UnsupportedTemplate where a tag
+they need is not found; other errors (an AttributeError of a bug...) are
+raised as they are, error_stage() tells the ingredient from the traceback.
+"""
+import collections
+
+__all__ = ['LimeSoupError', 'NotAnArticle', 'Paywalled', 'AbstractOnly', 'LandingPage', 'BodyNotFound',
+           'MetadataNotFound', 'MalformedMarkup', 'UnsupportedTemplate', 'error_stage', 'count_errors']
+
+
+class LimeSoupError(ValueError):
+    def __init__(self, message='', stage=None):
+        """
+        :param stage: name of the rule ingredient raising the error, set by
+            RuleIngredient.run when None.
+        """
+        super(LimeSoupError, self).__init__(message)
+        self.stage = stage
+
+    def __reduce__(self):
+        # Keeps the stage when sent from a worker process
+        return type(self), (str(self), self.stage)
+
+
+class NotAnArticle(LimeSoupError):
+    """
+    The page has no full text to parse.
+    """
+
+
+class Paywalled(NotAnArticle):
+    pass
+
+
+class AbstractOnly(NotAnArticle):
+    pass
+
+
+class LandingPage(NotAnArticle):
+    pass
+
+
+class BodyNotFound(LimeSoupError):
+    pass
+
+
+class MetadataNotFound(LimeSoupError):
+    pass
+
+
+class MalformedMarkup(LimeSoupError):
+    pass
+
+
+class UnsupportedTemplate(LimeSoupError):
+    pass
+
+
+def error_stage(error):
+    """
+    :param error: exception raised by a soup.
+    :return: name of the rule ingredient (or 'precheck') that raised it,
+        None if it was not raised by an ingredient.
+    """
+    stage = getattr(error, 'stage', None)
+    if stage is not None:
+        return stage
+    from LimeSoup.lime_soup import RuleIngredient
+
+    # The innermost ingredient run, soups may run other soups
+    traceback = error.__traceback__
+    while traceback is not None:
+        ingredient = traceback.tb_frame.f_locals.get('self')
+        if isinstance(ingredient, RuleIngredient) and traceback.tb_frame.f_code.co_name == 'run':
+            stage = type(ingredient).__name__
+        traceback = traceback.tb_next
+    return stage
+
+
+def count_errors(errors):
+    """
+    :param errors: Counter of (error type, stage).
+    :return: dict of error types to dicts of stages to counts, None stages
+        (errors not raised by an ingredient, e.g. timeouts) as 'unknown'.
+    """
+    counts = collections.defaultdict(dict)
+    for (error_type, stage), count in sorted(errors.items(), key=lambda x: (str(x[0][0]), str(x[0][1]))):
+        counts[error_type or 'unknown'][stage or 'unknown'] = count
+    return dict(counts)
@@ -0,0 +1,182 @@
+"""
+Export the paragraphs of parsed papers as Arrow tables or Parquet files,
+one row per paragraph:
+
+    doi              string
+    publisher        dictionary<string>
+    section          dictionary<string>, name of the innermost section
+    section_path     list<string>, names of the enclosing sections
+    depth            int16, len(section_path)
+    paragraph_index  int32, position of the paragraph in the paper
+    text             string
+
+ParquetSink is a LimeSoup.sinks.Sink of batch records (see
+LimeSoup.batch.parse_file), which writes a row group every row_group_size
+paragraphs, so that memory does not grow with the size of the corpus.
+Parquet also dictionary-encodes the strings of section_path in the file.
+From the command line:
+
+    python -m LimeSoup.batch corpus/rsc --output paragraphs.parquet
+
+Requires pyarrow, which is not a dependency of LimeSoup.
+"""
+from LimeSoup.parser.tools import iter_paragraphs
+from LimeSoup.sinks import Sink
+
+__all__ = ['COLUMNS', 'schema', 'iter_rows', 'paragraph_table', 'ParquetSink']
+
+COLUMNS = ('doi', 'publisher', 'section', 'section_path', 'depth', 'paragraph_index', 'text')
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+    except ImportError:
+        raise ImportError('Exporting paragraphs requires pyarrow, run: pip install pyarrow')
+    return pyarrow
+
+
+def schema():
+    pa = _pyarrow()
+    return pa.schema([
+        ('doi', pa.string()),
+        ('publisher', pa.dictionary(pa.int32(), pa.string())),
+        ('section', pa.dictionary(pa.int32(), pa.string())),
+        ('section_path', pa.list_(pa.string())),
+        ('depth', pa.int16()),
+        ('paragraph_index', pa.int32()),
+        ('text', pa.string()),
+    ])
+
+
+def _doi(value):
+    # ACS papers have a list of DOIs
+    if isinstance(value, (list, tuple)):
+        value = value[0] if value else None
+    return value or None
+
+
+def iter_rows(result, publisher=None, doi=None):
+    """
+    :param result: parse result of a paper, with 'Sections'.
+    :param doi: DOI of the paper, by default result['DOI'].
+    :return: generator of rows, tuples in the order of COLUMNS.
+    """
+    doi = _doi(doi or result.get('DOI'))
+    for i, (path, text) in enumerate(iter_paragraphs(result.get('Sections') or [])):
+        yield doi, publisher, path[-1] if path else None, path, len(path), i, text
+
+
+class _Columns(object):
+    """
+    Column buffers, turned into an Arrow table with dictionary-encoded
+    publishers and section names.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.doi = []
+        self.publisher = []
+        self.section = []
+        self.offsets = [0]
+        self.names = []
+        self.depth = []
+        self.paragraph_index = []
+        self.text = []
+
+    def __len__(self):
+        return len(self.text)
+
+    def append(self, row):
+        doi, publisher, section, path, depth, paragraph_index, text = row
+        self.doi.append(doi)
+        self.publisher.append(publisher)
+        self.section.append(section)
+        self.names.extend(path)
+        self.offsets.append(len(self.names))
+        self.depth.append(depth)
+        self.paragraph_index.append(paragraph_index)
+        self.text.append(text)
+
+    def table(self):
+        pa = _pyarrow()
+        arrays = [
+            pa.array(self.doi, type=pa.string()),
+            pa.array(self.publisher, type=pa.string()).dictionary_encode(),
+            pa.array(self.section, type=pa.string()).dictionary_encode(),
+            pa.ListArray.from_arrays(pa.array(self.offsets, type=pa.int32()),
+                                     pa.array(self.names, type=pa.string())),
+            pa.array(self.depth, type=pa.int16()),
+            pa.array(self.paragraph_index, type=pa.int32()),
+            pa.array(self.text, type=pa.string()),
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema())
+
+
+def paragraph_table(results, publisher=None):
+    """
+    :param results: iterable of parse results, or of batch records (dicts
+        with 'result', 'publisher' and 'DOI').
+    :param publisher: publisher of the parse results.
+    :return: pyarrow.Table of the paragraphs of all the papers.
+    """
+    columns = _Columns()
+    for result in results:
+        for row in _record_rows(result, publisher):
+            columns.append(row)
+    return columns.table()
+
+
+def _record_rows(record, publisher=None):
+    if 'result' in record and 'Sections' not in record:
+        if not record.get('result'):
+            return ()
+        return iter_rows(record['result'], record.get('publisher'), record.get('DOI'))
+    return iter_rows(record, publisher)
+
+
+class ParquetSink(Sink):
+    """
+    Paragraphs of batch records, written to a Parquet file one row group at
+    a time. Failed records (no result) have no paragraphs.
+    """
+
+    def __init__(self, filename, row_group_size=100000, compression='zstd', **kwargs):
+        """
+        :param row_group_size: paragraphs per row group, the most held in memory.
+        :param compression: Parquet compression codec.
+        """
+        pq = self._parquet()
+        super(ParquetSink, self).__init__(**kwargs)
+        self.filename = filename
+        self.row_group_size = row_group_size
+        self.rows = 0
+        self._columns = _Columns()
+        self._writer = pq.ParquetWriter(filename, schema(), compression=compression)
+
+    @staticmethod
+    def _parquet():
+        _pyarrow()
+        import pyarrow.parquet
+        return pyarrow.parquet
+
+    def _write_batch(self, records):
+        for record in records:
+            for row in _record_rows(record):
+                self._columns.append(row)
+                if len(self._columns) >= self.row_group_size:
+                    self._write_row_group()
+
+    def _write_row_group(self):
+        if len(self._columns):
+            self._writer.write_table(self._columns.table(), row_group_size=self.row_group_size)
+            self.rows += len(self._columns)
+            self._columns.clear()
+
+    def _close(self):
+        try:
+            self._write_row_group()
+        finally:
+            self._writer.close()
@@ -1,4 +1,12 @@
 import abc
+import functools
+import hashlib
+import inspect
+import sys
+
+from LimeSoup.errors import LimeSoupError
+from LimeSoup.parser import rule_stats, trees
+from LimeSoup.parser.encoding import same_encoding, sniff_encoding, to_text
 
 __author__ = 'Ziqin (Shaun) Rong'
 __maintainer__ = 'Ziqin (Shaun) Rong'
@@ -36,19 +44,237 @@ class SoupBase(object):
 
 
 class Soup(SoupBase):
+    """
+    A publisher parser, made of a chain of parsing rule ingredients.
 
-    def __init__(self, parser_version):
+    Thread safety: parse() keeps all the state of a document in the objects
+    passed from one ingredient to the next, ingredients must not store
+    anything on classes or modules. Hence the same soup can be used to parse
+    many documents concurrently from different threads.
+    """
+
+    def __init__(self, parser_version, accepts_bytes=False, precheck=None):
+        """
+        :param parser_version: version of the parser, stored with the results.
+        :param accepts_bytes: the ingredients take the raw paper as bytes (or
+            mmap, memoryview) as well as str, and sniff its encoding, e.g.
+            with LimeSoup.parser.encoding.beautiful_soup(). Otherwise, bytes
+            are decoded before parsing.
+        :param precheck: function of the raw paper raising a
+            LimeSoup.errors.LimeSoupError for pages the ingredients cannot
+            parse, e.g. a LimeSoup.parser.prechecks.Precheck, run before them
+            by parse(precheck=True) and by the batch runner.
+        """
         super(Soup, self).__init__()
         self._version = parser_version
+        self._metadata = None
+        self.accepts_bytes = accepts_bytes
+        self.precheck = precheck
 
     @property
     def version(self):
         return self._version
 
-    def parse(self, html_str):
+    @property
+    def ingredients(self):
+        """
+        :return: list of the rule ingredients, in processing order.
+        """
+        ingredients = []
+        ingredient = self._next
+        while ingredient is not None:
+            ingredients.append(ingredient)
+            ingredient = ingredient._next
+        return ingredients
+
+    @property
+    def fingerprints(self):
+        """
+        :return: list of the fingerprints of the pipeline up to each rule
+            ingredient: each changes when that ingredient or one before it
+            changes (see RuleIngredient.fingerprint), and with the version of
+            the parser.
+        """
+        chain = []
+        precheck = self.precheck.fingerprint() if hasattr(self.precheck, 'fingerprint') else ''
+        previous = fingerprint_of(str(self._version), precheck)
+        for ingredient in self.ingredients:
+            previous = fingerprint_of(previous, ingredient.fingerprint())
+            chain.append(previous)
+        return chain
+
+    @property
+    def fingerprint(self):
+        """
+        :return: fingerprint of the whole pipeline, None without ingredients.
+        """
+        chain = self.fingerprints
+        return chain[-1] if chain else None
+
+    def parse(self, html_str, encoding=None, precheck=False):
+        """
+        :param html_str: raw HTML/XML, str or bytes-like (bytes, mmap, memoryview).
+        :param encoding: encoding of bytes, sniffed from the markup when None.
+        :param precheck: run the precheck of the soup first, which rejects the
+            pages that are no full text (abstracts, paywalls...) with a
+            LimeSoup.errors.NotAnArticle. Otherwise they are parsed for
+            whatever they have.
+        :return: Parse JSON object
+        """
         if not self._next:
             raise ValueError("Please provide at least one parsing rule ingredient to the soup")
-        return self._next.parse(html_str)
+        raw = self._raw(html_str, encoding)
+        if precheck and self.precheck is not None:
+            self.precheck(raw)
+        # The bs4 trees of the paper are freed as soon as the result is ready.
+        with trees.decomposing():
+            return self._next.parse(raw)
+
+    def parse_cached(self, html_str, cache, key=None, encoding=None, precheck=False):
+        """
+        Parse a paper, resuming from the output of the last ingredient found
+        in a stage cache, and caching the outputs of the ingredients run.
+
+        :param cache: a LimeSoup.stage_cache.StageCache, or any object with
+            get(key, fingerprint) and put(key, fingerprint, value).
+        :param key: key of the paper in the cache, by default a digest of
+            html_str.
+        :param precheck: see parse().
+        :return: Parse JSON object, the same as parse().
+        """
+        ingredients = self.ingredients
+        if not ingredients:
+            raise ValueError("Please provide at least one parsing rule ingredient to the soup")
+        if key is None:
+            key = cache.key(html_str)
+        chain = self.fingerprints
+        start = 0
+        # The result of the last ingredient is the record, not cached here.
+        for i in reversed(range(len(ingredients) - 1)):
+            results = cache.get(key, chain[i])
+            if results is not None:
+                start = i + 1
+                break
+        else:
+            results = self._raw(html_str, encoding)
+            if precheck and self.precheck is not None:
+                self.precheck(results)
+        with trees.decomposing():
+            for i in range(start, len(ingredients)):
+                results = ingredients[i].run(results)
+                if i < len(ingredients) - 1:
+                    cache.put(key, chain[i], results)
+        return results
+
+    def _raw(self, html_str, encoding):
+        if isinstance(html_str, str):
+            return html_str
+        # The ingredients sniff the encoding of bytes: a declared encoding
+        # that differs from it can only be honored by decoding here.
+        if self.accepts_bytes and (encoding is None or same_encoding(encoding, sniff_encoding(html_str))):
+            return html_str
+        return to_text(html_str, encoding)
+
+    def parse_to_json(self, html_str):
+        """
+        Parse a paper and serialize the result, see LimeSoup.serialize.
+
+        :param html_str: raw HTML/XML strings
+        :return: canonical JSON (sorted keys), bytes
+        """
+        from LimeSoup.serialize import dumps
+        return dumps(self.parse(html_str))
+
+    def set_metadata_ingredient(self, ingredient):
+        """
+        :param ingredient: A rule ingredient reading only the metadata of a
+            paper (DOI, Title, Journal, Keywords), used by parse_metadata().
+        """
+        self._metadata = ingredient
+
+    def parse_metadata(self, html_str, encoding=None):
+        """
+        Read the metadata of a paper without parsing its full text. The raw
+        string is parsed incrementally, up to the end of the metadata block.
+
+        :param html_str: raw HTML/XML, str or bytes-like
+        :param encoding: encoding of bytes, sniffed from the markup when None.
+        :return: dict with DOI, Title, Journal and Keywords, of the types
+            parse() gives them. Fields that the full parser leaves empty
+            ('' or None, e.g. the DOI of most HTML soups) may be filled.
+        """
+        if self._metadata is None:
+            raise ValueError("This soup cannot parse metadata only")
+        with trees.decomposing():
+            return self._metadata.parse(self._raw(html_str, encoding))
+
+    def parse_many(self, html_strs, executor='auto', max_workers=None, chunksize=1,
+                   return_exceptions=False, timeout=None, max_rss=None, max_docs_per_worker=None,
+                   shard=None, shard_key=None):
+        """
+        Parse many papers concurrently, see LimeSoup.batch.parse_many.
+
+        :param html_strs: iterable of raw HTML/XML strings
+        :param executor: 'auto', 'thread', 'process', 'serial' or a
+            concurrent.futures.Executor. 'auto' uses threads on free-threaded
+            CPython builds and processes otherwise.
+        :param timeout: seconds a paper may take in a worker process.
+        :param max_rss: bytes of memory a worker process may use for a paper.
+        :param max_docs_per_worker: papers parsed by a worker process before
+            it is replaced by a new one.
+        :param shard: 'i/N' to parse only the papers of shard i of N.
+        :param shard_key: function of a paper giving its sharding key (e.g.
+            its DOI), by default a digest of its content.
+        :return: generator of parse results, in the order of html_strs
+        """
+        from LimeSoup.batch import parse_many
+        return parse_many(self, html_strs, executor=executor, max_workers=max_workers,
+                          chunksize=chunksize, return_exceptions=return_exceptions,
+                          timeout=timeout, max_rss=max_rss, max_docs_per_worker=max_docs_per_worker,
+                          shard=shard, shard_key=shard_key)
+
+
+def fingerprint_of(*parts):
+    """
+    :param parts: strings.
+    :return: short hex digest of the parts.
+    """
+    return hashlib.sha1('\0'.join(parts).encode('utf-8')).hexdigest()[:16]
+
+
+def _source(obj):
+    try:
+        return inspect.getsource(obj)
+    except (OSError, TypeError):
+        return ''
+
+
+def _helper_modules(module_name, found=None):
+    """
+    :return: set of the LimeSoup.parser modules used by a module, directly
+        or through other LimeSoup.parser modules.
+    """
+    found = set() if found is None else found
+    module = sys.modules.get(module_name)
+    for value in vars(module).values() if module is not None else ():
+        name = value.__name__ if inspect.ismodule(value) else getattr(value, '__module__', None)
+        if isinstance(name, str) and name.startswith('LimeSoup.parser.') and name not in found:
+            found.add(name)
+            _helper_modules(name, found)
+    return found
+
+
+@functools.lru_cache(maxsize=None)
+def _module_fingerprint(module_name):
+    return fingerprint_of(module_name, _source(sys.modules[module_name]))
+
+
+@functools.lru_cache(maxsize=None)
+def _class_fingerprint(cls):
+    helpers = sorted(_helper_modules(cls.__module__) - {cls.__module__})
+    # The whole module of the class, for the constants and functions it uses
+    return fingerprint_of(cls.__qualname__, _module_fingerprint(cls.__module__),
+                          *[_module_fingerprint(x) for x in helpers])
 
 
 class RuleIngredient(SoupBase):
@@ -57,8 +283,38 @@ class RuleIngredient(SoupBase):
     def __init__(self):
         super(RuleIngredient, self).__init__()
 
+    def fingerprint(self):
+        """
+        A digest of the code of the ingredient: the source of the module of
+        its class and of the LimeSoup.parser modules used by that module. It changes whenever
+        the ingredient may give different results, and then some.
+
+        Ingredients running other soups (or taking code from elsewhere)
+        include their fingerprints by overriding this method.
+        """
+        return _class_fingerprint(type(self))
+
+    def run(self, html_str):
+        """
+        Run this ingredient only. LimeSoup errors get this stage.
+        """
+        try:
+            if rule_stats.active() is None:
+                return self._parse(html_str)
+            with rule_stats.stage(type(self).__name__):
+                return self._parse(html_str)
+        except LimeSoupError as e:
+            if e.stage is None:
+                e.stage = type(self).__name__
+            raise
+
     def parse(self, html_str):
-        results = self._parse(html_str)
+        """
+        Run this ingredient and hand over the results to the next ingredient.
+        Anything that the later ingredients need (metadata found early, etc.)
+        must be part of the results, see Soup for the reason.
+        """
+        results = self.run(html_str)
         if self._next:
             results = self._next.parse(results)
         return results
@@ -2,9 +2,12 @@ import os
 import re
 import warnings
 
+import bs4
 from lxml import etree
 from lxml.etree import XMLSyntaxError
 
+from LimeSoup.parser.metadata import iter_chunks, iter_events
+
 __author__ = 'Haoyan Huo'
 __maintainer__ = 'Kevin Cruse'
 __email__ = 'kevcruse96@gmail.com'
@@ -69,6 +72,9 @@ def node_named(node, name):
         return node.name == name
 
 
+CONSECUTIVE_WHITESPACES = re.compile(r'[ \t\n]+')
+
+
 def remove_consecutive_whitespaces(string, keep_newline=False):
     def sub(m):
         if keep_newline and '\n' in m.group(0):
@@ -76,7 +82,7 @@ def remove_consecutive_whitespaces(string, keep_newline=False):
         else:
             return ' '
 
-    return re.sub(r'[ \t\n]+', sub, string)
+    return CONSECUTIVE_WHITESPACES.sub(sub, string)
 
 
 # Elsevier XML format is defined here:
@@ -90,18 +96,20 @@ class XMLSyntaxWarning(Warning):
     pass
 
 
-def resolve_elsevier_entities(xml_string):
-    """
-    Elsevier defined a set of entities that can be found in the corresponding
-    ent (entity) files. However, XML files do not contain definition of such
-    entities. Thus, we need to load the entities and patch the XML files, so
-    that these entities are converted into unicode chars.
-    See also "The Elsevier DTD 5 Family of XML DTDs" pp. 12
+XML_ENTITIES = {'amp', 'lt', 'gt', 'quot', 'apos'}
+ENTITY_REFERENCE = re.compile(r'&([A-Za-z_][A-Za-z0-9_.-]*);')
+ENTITY_REFERENCE_BYTES = re.compile(br'&([A-Za-z_][A-Za-z0-9_.-]*);')
+# Ids of the references to the bibliography
+BIB_REFERENCE_ID = re.compile(r'bib.*', re.IGNORECASE)
+WHITESPACE = re.compile(r'\s')
 
-    :param xml_string:
-    :return:
+
+def get_dtd_invocation():
+    """
+    The DOCTYPE declaration that loads the Elsevier entities, to be put
+    before the XML string.
     """
-    if not hasattr(resolve_elsevier_entities, 'dtd_strings'):
+    if not hasattr(resolve_elsevier_entities, 'dtd_invocation'):
         invocation = """<!DOCTYPE xml [
         <!ENTITY % common.ent
             PUBLIC "-//ES//ELEMENTS common element pool version 1.4.0//EN//XML"
@@ -114,26 +122,158 @@ def resolve_elsevier_entities(xml_string):
 
         setattr(resolve_elsevier_entities, 'dtd_invocation', invocation.format(file_dir=file_path))
 
+    return getattr(resolve_elsevier_entities, 'dtd_invocation')
+
+
+def resolve_elsevier_entities(xml_string):
+    """
+    Elsevier defined a set of entities that can be found in the corresponding
+    ent (entity) files. However, XML files do not contain definition of such
+    entities. Thus, we need to load the entities and patch the XML files, so
+    that these entities are converted into unicode chars.
+    See also "The Elsevier DTD 5 Family of XML DTDs" pp. 12
+
+    Loading the DTD takes ~10 ms per paper, so the entities used by the
+    paper are declared in an internal DTD instead, see
+    get_entity_declarations(). The declarations are fed to lxml before the
+    XML (after its XML declaration), chunk by chunk, so the XML is not copied
+    to prepend them. Bytes are decoded by lxml, with the encoding of the XML
+    declaration.
+
+    :param xml_string: XML, str or bytes-like (bytes, mmap, memoryview).
+    :return: XML bytes, with the entities resolved.
+    """
     try:
-        parser = etree.XMLParser(load_dtd=True)
-        xml_tree = etree.fromstring(
-            getattr(resolve_elsevier_entities, 'dtd_invocation') + xml_string,
-            parser=parser,
-        )
+        xml_tree = _parse_with_entities(xml_string, recover=False)
     except XMLSyntaxError:
         if not hasattr(resolve_elsevier_entities, 'recover'):
             warnings.warn('Enabling "recover" in XML parser. '
                           'There might be a problem with XML source.', XMLSyntaxWarning)
             setattr(resolve_elsevier_entities, 'recover', True)
-        parser = etree.XMLParser(load_dtd=True, recover=True)
-        xml_tree = etree.fromstring(
-            getattr(resolve_elsevier_entities, 'dtd_invocation') + xml_string,
-            parser=parser,
-        )
+        xml_tree = _parse_with_entities(xml_string, recover=True)
 
     return etree.tostring(xml_tree)
 
 
+def _parse_with_entities(xml_string, recover):
+    parser = etree.XMLParser(resolve_entities=True, recover=recover)
+    for chunk in iter_chunks(xml_string, prefix=get_entity_declarations(xml_string)):
+        parser.feed(chunk)
+    return parser.close()
+
+
+def elsevier_entities():
+    """
+    :return: dict of the name of the Elsevier (character) entities -> their
+        character reference, e.g. 'alpha' -> '&#x003B1;'. Read once from
+        the DTD.
+    """
+    if not hasattr(elsevier_entities, 'table'):
+        # lxml >= 5 needs resolve_entities=True to read the external subset
+        parser = etree.XMLParser(load_dtd=True, resolve_entities=True)
+        root = etree.fromstring(get_dtd_invocation() + '<root/>', parser=parser)
+        table = {}
+        for entity in root.getroottree().docinfo.internalDTD.iterentities():
+            if entity.name in XML_ENTITIES:
+                continue
+            # orig is the declared value, e.g. '&#x00458;', content the value
+            # with the parameter entities resolved ('%plane1D;4C7;').
+            for value in (entity.orig, entity.content):
+                if value and value.startswith('&#'):
+                    table[entity.name] = value
+                    break
+        setattr(elsevier_entities, 'table', table)
+
+    return getattr(elsevier_entities, 'table')
+
+
+def get_entity_declarations(xml_string):
+    """
+    The DOCTYPE declaration of the Elsevier entities used in an XML string,
+    to be put before it. Entities that are not Elsevier entities are left
+    undeclared, and make the XML invalid, as with the DTD.
+
+    :param xml_string: XML, str or bytes-like.
+    """
+    pattern = ENTITY_REFERENCE if isinstance(xml_string, str) else ENTITY_REFERENCE_BYTES
+    table = elsevier_entities()
+    declarations = []
+    for name in sorted(set(pattern.findall(xml_string))):
+        if not isinstance(name, str):
+            name = name.decode('ascii')
+        if name in table:
+            declarations.append('<!ENTITY %s "%s">' % (name, table[name]))
+    return '<!DOCTYPE xml [\n%s]>\n' % '\n'.join(declarations)
+
+
+def read_elsevier_metadata(xml_string):
+    """
+    Read journal, DOI, title and keywords of an Elsevier XML paper, the same
+    way as ElsevierReadMetaData does, without parsing the paper body.
+
+    The XML is parsed incrementally, and parsing stops at the end of the
+    article head (ja:head), which comes before the body.
+
+    :param xml_string: Elsevier XML string.
+    :return: dict with Journal, DOI, Title and Keywords.
+    """
+    found = {}
+    subjects = []
+    head_keywords = []
+    head_depth = 0
+
+    def qualified_name(element):
+        name = etree.QName(element).localname
+        return '%s:%s' % (element.prefix, name) if element.prefix else name
+
+    def as_bs4_node(element, name):
+        fragment = etree.tostring(element, with_tail=False)
+        return bs4.BeautifulSoup(fragment, 'lxml-xml').find(name)
+
+    def text_of(element):
+        return ''.join(element.itertext()).strip()
+
+    # Entities must be declared, like in resolve_elsevier_entities().
+    pull_parser = etree.XMLPullParser(events=('start', 'end'), resolve_entities=True, recover=True)
+    for event, element in iter_events(pull_parser, xml_string, prefix=get_entity_declarations(xml_string)):
+        if not isinstance(element.tag, str):
+            # Comments, processing instructions
+            continue
+        name = qualified_name(element)
+
+        if event == 'start':
+            if etree.QName(element).localname == 'head':
+                head_depth += 1
+            elif name in ('ce:sections', 'ja:body'):
+                break
+            continue
+
+        if etree.QName(element).localname == 'head':
+            head_depth -= 1
+            if head_depth == 0:
+                break
+        elif name in ('xocs:srctitle', 'prism:publicationName', 'xocs:doi', 'dc:title'):
+            found.setdefault(name, text_of(element))
+        elif name == 'dcterms:subject':
+            subjects.append(text_of(element))
+        elif head_depth > 0 and name == 'ce:title' and 'ce:title' not in found:
+            found['ce:title'] = extract_ce_title(as_bs4_node(element, 'ce:title'))
+        elif head_depth > 0 and name == 'ce:keyword':
+            text_node = as_bs4_node(element, 'ce:keyword').find('ce:text')
+            if text_node is not None:
+                head_keywords.append(remove_consecutive_whitespaces(
+                    extract_ce_text(text_node),
+                    keep_newline=False
+                ).strip())
+
+    return {
+        'Journal': found.get('xocs:srctitle') or found.get('prism:publicationName'),
+        'DOI': found.get('xocs:doi'),
+        'Title': found.get('ce:title') or found.get('dc:title'),
+        'Keywords': head_keywords or subjects,
+    }
+
+
 def process_richstring_data(_node):
     # <!ENTITY % richstring.data  "#PCDATA|ce:glyph|%text-effect;|ce:inline-figure
     #                              %local.richstring.data;" >
@@ -199,7 +339,7 @@ def process_cross_ref(_node):
     elif node_named(_node, 'ce:cross-ref'):
         # We take only cross-ref's that are not bib refs. This includes,
         # for example, "Fig. ?", "Table ?"...
-        if not re.match(r'bib.*', _node.attrs['refid'], re.IGNORECASE):
+        if not BIB_REFERENCE_ID.match(_node.attrs['refid']):
             return extract_text_any(_node, process_text_data)
         else:
             return ''
@@ -216,7 +356,7 @@ def process_cross_refs(_node):
     elif node_named(_node, 'ce:cross-refs'):
         # We take only cross-ref's that are not bib refs. This includes,
         # for example, "Fig. ?", "Table ?"...
-        if not re.match(r'bib.*', _node.attrs['refid'], re.IGNORECASE):
+        if not BIB_REFERENCE_ID.match(_node.attrs['refid']):
             return extract_text_any(_node, process_text_data)
         else:
             return ''
@@ -358,7 +498,7 @@ def extract_mml_math(node):
         assert_node_type(node, '*:math')
 
     # TODO: better rendering.
-    return re.sub(r'\s', '', ''.join(node.findAll(text=True)))
+    return WHITESPACE.sub('', ''.join(node.findAll(text=True)))
 
 
 def extract_ce_footnote(node):
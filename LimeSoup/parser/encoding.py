@@ -0,0 +1,123 @@
+"""
+Encoding detection for raw papers given as bytes (or mmap, memoryview).
+
+The encoding is read, in this order, from a byte order mark, the XML
+declaration (<?xml ... encoding="..."?>) or an HTML <meta charset>, in the
+first SNIFF_SIZE bytes, and defaults to UTF-8.
+
+beautiful_soup() hands bytes to BeautifulSoup as they are, with that
+encoding, so that the paper is decoded once, by the tree builder, instead of
+being decoded to str by us and encoded again by lxml.
+"""
+import codecs
+import re
+
+import bs4
+
+from LimeSoup.parser.trees import track
+
+__all__ = ['SNIFF_SIZE', 'sniff_encoding', 'same_encoding', 'to_text', 'to_bytes',
+           'beautiful_soup', 'xml_declaration_end']
+
+SNIFF_SIZE = 1024
+
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+XML_DECLARATION = re.compile(br'\s*<\?xml[^>]*?\?>')
+XML_DECLARATION_STR = re.compile(r'\s*<\?xml[^>]*?\?>')
+XML_ENCODING = re.compile(br'''^\s*<\?xml[^>]*?encoding\s*=\s*["']([A-Za-z0-9._:-]+)["']''')
+META_CHARSET = re.compile(br'''<meta[^>]+?charset\s*=\s*["']?([A-Za-z0-9._:-]+)''', re.IGNORECASE)
+
+
+def _head(data):
+    return bytes(data[:SNIFF_SIZE])
+
+
+def _known(encoding):
+    try:
+        return codecs.lookup(encoding.decode('ascii')).name
+    except (LookupError, UnicodeDecodeError):
+        return None
+
+
+def sniff_encoding(data, default='utf-8'):
+    """
+    :param data: raw paper, bytes-like.
+    :return: name of the encoding of data.
+    """
+    head = _head(data)
+    for bom, encoding in BOMS:
+        if head.startswith(bom):
+            return encoding
+    for pattern in (XML_ENCODING, META_CHARSET):
+        match = pattern.search(head)
+        if match:
+            encoding = _known(match.group(1))
+            if encoding is not None:
+                return encoding
+    return default
+
+
+def same_encoding(first, second):
+    """
+    :return: True if first and second are names of the same codec.
+    """
+    try:
+        return codecs.lookup(first).name == codecs.lookup(second).name
+    except LookupError:
+        return False
+
+
+def to_text(data, encoding=None, errors='replace'):
+    """
+    Decode a raw paper in one go, straight from its buffer.
+
+    :param data: str (returned as is), or bytes-like (bytes, mmap, memoryview).
+    :param encoding: declared encoding, sniffed when None.
+    """
+    if isinstance(data, str):
+        return data
+    return str(memoryview(data), encoding or sniff_encoding(data), errors)
+
+
+def to_bytes(data):
+    """
+    :param data: bytes-like. bytes are returned as is, other buffers (mmap,
+        memoryview) copied, for the APIs that only take bytes.
+    """
+    if isinstance(data, bytes):
+        return data
+    return bytes(data)
+
+
+def beautiful_soup(markup, features, encoding=None):
+    """
+    :param markup: str, or bytes-like given to the tree builder undecoded.
+    :param features: tree builder, e.g. 'html.parser', 'lxml' or 'lxml-xml'.
+    :param encoding: encoding of bytes, sniffed when None.
+    :return: bs4.BeautifulSoup, decomposed at the end of the parse (see
+        LimeSoup.parser.trees).
+    """
+    if isinstance(markup, str):
+        return track(bs4.BeautifulSoup(markup, features))
+    # bs4 would read() an mmap, moving its position, and rejects memoryview.
+    markup = to_bytes(markup)
+    return track(bs4.BeautifulSoup(markup, features, from_encoding=encoding or sniff_encoding(markup)))
+
+
+def xml_declaration_end(data):
+    """
+    :param data: XML, str or bytes-like.
+    :return: index just after the XML declaration, 0 if there is none.
+    """
+    if isinstance(data, str):
+        match = XML_DECLARATION_STR.match(data[:SNIFF_SIZE])
+    else:
+        match = XML_DECLARATION.match(_head(data))
+    return match.end() if match else 0
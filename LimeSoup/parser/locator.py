@@ -0,0 +1,124 @@
+"""
+Locate an element in raw HTML/XML markup without building a DOM.
+
+Publisher pages are mostly navigation, sidebars and scripts. Soups that only
+keep one subtree of the page (the article body) can use an ElementLocator to
+cut that subtree out of the raw string first, so that BeautifulSoup only
+builds the part of the DOM that is actually used.
+
+The locator scans the markup with regular expressions, skipping comments,
+scripts and styles, and balances start and end tags of the element. It
+returns None whenever it is not sure, callers must then fall back to parsing
+the whole document.
+"""
+import re
+
+from LimeSoup.parser.encoding import to_bytes
+
+__all__ = ['ElementLocator']
+
+_TAG_NAME = r'[A-Za-z][\w:.-]*'
+_ATTR_VALUE = r'''\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))'''
+
+# Markup in which tags should not be counted.
+_OPAQUE = r'<!--.*?-->|<script\b.*?</script\s*>|<style\b.*?</style\s*>'
+
+
+def _as(value, kind):
+    if isinstance(value, kind):
+        return value
+    return value.encode('utf-8') if kind is bytes else value.decode('utf-8')
+
+
+def _compile(pattern, kind):
+    return re.compile(_as(pattern, kind), re.DOTALL | re.IGNORECASE)
+
+
+class ElementLocator(object):
+    def __init__(self, name=None, attrs=None):
+        """
+        :param name: tag name of the element, None to match any tag.
+        :param attrs: dict of attribute -> value the start tag must have.
+            Like bs4, 'class' matches one of the class names of the element.
+        """
+        self.name = name
+        self.attrs = dict(attrs or {})
+        # Regexes for str markup, and for bytes-like markup (bytes, mmap,
+        # memoryview), compiled on first use.
+        self._regexes = {}
+        self._tag_res = {}
+
+    def _compiled(self, raw):
+        kind = str if isinstance(raw, str) else bytes
+        if kind not in self._regexes:
+            # Start tags without the wanted attributes are skipped by the regex
+            # engine, rather than one by one in Python.
+            has_attrs = ''.join(r'(?=[^>]*\s%s\s*=)' % re.escape(x) for x in self.attrs)
+            start_re = _compile(
+                r'%s|<(%s)(?=[\s/>])%s([^>]*)>' % (
+                    _OPAQUE, re.escape(self.name) if self.name else _TAG_NAME, has_attrs), kind)
+            attr_res = [
+                (attr, _as(value, kind), _compile(r'(?:^|\s)%s%s' % (re.escape(attr), _ATTR_VALUE), kind))
+                for attr, value in self.attrs.items()
+            ]
+            self._regexes[kind] = start_re, attr_res
+        return self._regexes[kind]
+
+    @staticmethod
+    def _match_attrs(attrs_string, attr_res):
+        for attr, value, attr_re in attr_res:
+            m = attr_re.search(attrs_string)
+            if m is None:
+                return False
+            found = next(x for x in m.groups() if x is not None)
+            if attr == 'class':
+                if value != found and value not in found.split():
+                    return False
+            elif found != value:
+                return False
+        return True
+
+    def _tag_re(self, name):
+        # One regex per tag name found, shared by all later calls.
+        if name not in self._tag_res:
+            kind = str if isinstance(name, str) else bytes
+            self._tag_res[name] = _compile(
+                r'%s|<(/?)%s(?=[\s/>])[^>]*?(/?)>' % (_OPAQUE, re.escape(_as(name, str))), kind)
+        return self._tag_res[name]
+
+    def locate(self, raw):
+        """
+        :param raw: HTML/XML, str or bytes-like (bytes, mmap, memoryview).
+        :return: (start, end) of the first matching element in raw, or None.
+        """
+        start_re, attr_res = self._compiled(raw)
+        for m in start_re.finditer(raw):
+            name = m.group(1)
+            if name is None or not self._match_attrs(m.group(2), attr_res):
+                continue
+            if m.group(2)[-1:] in ('/', b'/'):
+                return m.start(), m.end()
+
+            depth = 1
+            for tag in self._tag_re(name.lower()).finditer(raw, m.end()):
+                if tag.group(1) is None or tag.group(2):
+                    # Comments, scripts and self-closing tags
+                    continue
+                depth += -1 if tag.group(1) else 1
+                if depth == 0:
+                    return m.start(), tag.end()
+            return None
+        return None
+
+    def extract(self, raw):
+        """
+        :param raw: HTML/XML, str or bytes-like.
+        :return: the markup of the first matching element, str or bytes, or
+            None.
+        """
+        span = self.locate(raw)
+        if span is None:
+            return None
+        if isinstance(raw, str):
+            return raw[span[0]:span[1]]
+        return to_bytes(raw[span[0]:span[1]])
@@ -0,0 +1,149 @@
+"""
+Read the metadata (DOI, title, journal and keywords) of a paper without
+parsing the full text.
+
+The raw markup is fed chunk by chunk to an incremental lxml parser, which
+stops as soon as the metadata block is over (</head> in HTML pages, </front>
+in JATS XML, </ja:head> in Elsevier XML). Nothing after that point is parsed.
+"""
+from lxml import etree
+
+from LimeSoup.parser.encoding import xml_declaration_end
+
+__all__ = [
+    'CHUNK_SIZE', 'iter_events', 'iter_chunks',
+    'read_html_meta', 'citation_metadata', 'jats_metadata', 'normalize_whitespace',
+]
+
+CHUNK_SIZE = 64 * 1024
+
+
+def normalize_whitespace(text):
+    return ' '.join(text.split())
+
+
+def iter_events(pull_parser, raw, prefix=None, chunk_size=CHUNK_SIZE):
+    """
+    Feed raw to an lxml pull parser chunk by chunk and yield its events.
+    Stop iterating to stop parsing.
+
+    :param pull_parser: lxml.etree.HTMLPullParser or XMLPullParser
+    :param raw: markup, str or bytes-like (bytes, mmap, memoryview). lxml
+        detects the encoding of bytes.
+    :param prefix: markup to feed before raw (e.g. a DTD invocation), after
+        the XML declaration of raw if it has one.
+    """
+    for chunk in iter_chunks(raw, prefix, chunk_size):
+        pull_parser.feed(chunk)
+        for event in pull_parser.read_events():
+            yield event
+
+
+def iter_chunks(raw, prefix=None, chunk_size=CHUNK_SIZE):
+    """
+    Cut raw markup into chunks for an lxml feed parser, without copying it
+    as a whole.
+
+    :param raw: markup, str or bytes-like (bytes, mmap, memoryview).
+    :param prefix: markup to insert after the XML declaration of raw, or at
+        the start if there is none.
+    :return: generator of str or bytes chunks.
+    """
+    start = 0
+    if prefix is not None:
+        start = xml_declaration_end(raw)
+        if not isinstance(raw, str):
+            if start:
+                yield bytes(raw[:start])
+            if isinstance(prefix, str):
+                prefix = prefix.encode('utf-8')
+        # lxml refuses the declaration of a str, which has no encoding: skip it
+        yield prefix
+    if isinstance(raw, memoryview):
+        for i in range(start, len(raw), chunk_size):
+            yield raw[i:i + chunk_size].tobytes()
+    else:
+        for i in range(start, len(raw), chunk_size):
+            yield raw[i:i + chunk_size]
+
+
+def read_html_meta(raw):
+    """
+    Read the <meta name="..." content="..."> tags of an HTML page.
+
+    :param raw: HTML, str or bytes
+    :return: dict of meta name -> list of contents, in document order.
+    """
+    metas = {}
+    pull_parser = etree.HTMLPullParser(events=('start', 'end'))
+    for event, element in iter_events(pull_parser, raw):
+        if event == 'end' and element.tag == 'meta':
+            name = element.get('name')
+            content = element.get('content')
+            if name is not None and content is not None:
+                metas.setdefault(name, []).append(content.strip())
+        elif (event, element.tag) in {('end', 'head'), ('start', 'body')}:
+            break
+    return metas
+
+
+def _first(metas, names):
+    for name in names:
+        if metas.get(name):
+            return metas[name][0]
+    return None
+
+
+def citation_metadata(raw, doi=('citation_doi',), title=('citation_title',),
+                      journal=('citation_journal_title',), keywords=('citation_keywords',)):
+    """
+    Read the metadata of an HTML page from its <meta> tags.
+
+    :param raw: HTML, str or bytes
+    :param doi: meta names holding the DOI, by order of preference.
+    :param title: meta names holding the title.
+    :param journal: meta names holding the journal name.
+    :param keywords: meta names holding keywords, all of them are collected.
+    :return: dict with DOI, Title, Journal and Keywords.
+    """
+    metas = read_html_meta(raw)
+    return {
+        'DOI': _first(metas, doi),
+        'Title': _first(metas, title),
+        'Journal': _first(metas, journal),
+        'Keywords': [x for name in keywords for x in metas.get(name, [])],
+    }
+
+
+def jats_metadata(raw):
+    """
+    Read the metadata in <front> of a JATS XML paper (ACS, APS, IOP, AIP).
+    Like the full parsers, the document is read with the lxml HTML parser.
+
+    :param raw: XML, str or bytes
+    :return: dict with DOI, Title, Journal and Keywords.
+    """
+    obj = {
+        'DOI': None,
+        'Title': None,
+        'Journal': None,
+        'Keywords': [],
+    }
+    pull_parser = etree.HTMLPullParser(events=('start', 'end'))
+    for event, element in iter_events(pull_parser, raw):
+        if event == 'start':
+            if element.tag == 'sec':
+                break
+            continue
+        if element.tag == 'front':
+            break
+
+        if element.tag == 'journal-title' and obj['Journal'] is None:
+            obj['Journal'] = normalize_whitespace(''.join(element.itertext()))
+        elif element.tag == 'article-title' and obj['Title'] is None:
+            obj['Title'] = normalize_whitespace(''.join(element.itertext()))
+        elif element.tag == 'article-id' and element.get('pub-id-type') == 'doi' and obj['DOI'] is None:
+            obj['DOI'] = normalize_whitespace(''.join(element.itertext()))
+        elif element.tag == 'kwd':
+            obj['Keywords'].append(normalize_whitespace(''.join(element.itertext())))
+    return obj
@@ -2,6 +2,8 @@ import re
 
 from bs4 import Tag, Comment
 
+from LimeSoup.parser import patterns
+
 __author__ = "Haoyan Huo"
 __maintainer__ = "Haoyan Huo"
 __email__ = "haoyan.huo@lbl.gov"
@@ -30,9 +32,11 @@ NON_DISPLAY_TAGS = {
     'canvas', 'noscript', 'script'
 }
 
+HORIZONTAL_SPACES = re.compile(r'[ \t]+')
+
 
 def normalize_text(string):
-    return re.sub(r'[ \t]+', ' ', string.strip())
+    return HORIZONTAL_SPACES.sub(' ', string.strip())
 
 
 def get_tag_text(cur_tag):
@@ -46,7 +50,7 @@ def get_tag_text(cur_tag):
     for child in cur_tag.contents:
         if child.name is None:
             # this is a pure text
-            strings.append(re.sub(r'\n', ' ', child))
+            strings.append(patterns.NEWLINE.sub(' ', child))
         elif child.name in NON_DISPLAY_TAGS:
             pass
         elif child.name in LINEBREAK_ELEMENTS:
@@ -116,7 +120,7 @@ def extract_paragraphs_recursive(tag_or_soup, exclude_section_rules=None):
 
             if child.name is None:
                 # this is a pure text
-                child_text = re.sub(r'\n', ' ', child)
+                child_text = patterns.NEWLINE.sub(' ', child)
                 if i < len(cur_tag.contents) - 1 and cur_tag.contents[i + 1].name is None:
                     # !!! This is actually a hack. When we modify the HTML DOM, we might
                     # remove a node between text nodes, thus these two nodes are left disconnected
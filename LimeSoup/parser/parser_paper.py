@@ -3,13 +3,15 @@ __maintainer__ = "Haoyan Huo"
 __email__ = "haoyan.huo@lbl.gov"
 
 import itertools
-import re
 
 import bs4
 
 from pprint import pprint
 
 import LimeSoup.parser.tools as tl
+from LimeSoup.parser import patterns
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.rule_stats import iter_matches
 
 
 class ParserPaper(object):
@@ -20,7 +22,7 @@ class ParserPaper(object):
         :param debugging: True or False
         """
         self.debugging = debugging
-        self.soup = bs4.BeautifulSoup(raw_html, parser_type)
+        self.soup = beautiful_soup(raw_html, parser_type)
         self.parser_type = parser_type
         if debugging:
             self.soup_orig = self.soup
@@ -112,8 +114,8 @@ class ParserPaper(object):
         :param rules: list() of dict() of rules of bs4 find_all()
         :return: None
         """
-        for rule in rules:
-            for s in self.soup.find_all(**rule):
+        for _, tags in iter_matches(self.soup, rules, reorder=True):
+            for s in tags:
                 s.extract()
 
     def remove_first_tag(self, rules):
@@ -190,7 +192,7 @@ class ParserPaper(object):
             # self.save_soup_to_file('selction_found_nothing.html')
             # input('Section not created, selection found nothing')
             return 'Section not created, number of paragraphs equal zero.'
-        inside_tags = inside_tags_inter[0].find_all(re.compile('(p|ol)|span'), recursive=False)
+        inside_tags = inside_tags_inter[0].find_all(patterns.PARAGRAPH_OR_SPAN, recursive=False)
         # inside_tags = inside_tags_inter[0].find_all('p', recursive=False)
         # inside_tags_ol = inside_tags_inter[0].find_all('ol', recursive=False)
         # inside_tags = inside_tags_p + inside_tags_ol
@@ -263,8 +265,8 @@ class ParserPaper(object):
         :return: None
         """
         tags = list()
-        for rule in rules:
-            for tag in self.soup.find_all(**rule):
+        for _, found in iter_matches(self.soup, rules):
+            for tag in found:
                 tag.replace_with_children()
                 tags.append(tag.name)
         return tags
@@ -280,7 +282,7 @@ class ParserPaper(object):
                 tag.replace_with(' %s ' % tag.get_text())
 
     def change_name_tag_sections(self):
-        tags = self.soup.find_all(re.compile('^h[2-6]'))
+        tags = self.soup.find_all(patterns.SUBHEADING)
         for each_tag in tags:
             each_tag.parent.name = 'section_{}'.format(each_tag.name)
 
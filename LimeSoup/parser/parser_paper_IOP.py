@@ -3,7 +3,13 @@ import re
 
 import bs4
 
+from LimeSoup.parser import patterns
 from LimeSoup.parser import tools as tl
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.rule_stats import iter_matches
+
+SECTION = re.compile('sec')
+SECTION_LEVEL = re.compile('sec-level[1-6]')
 
 class ParserPaper:
 
@@ -15,7 +21,7 @@ class ParserPaper:
         """
         self.debugging = debugging
         # parsers 'xml.parser', 'lxml', 'xml5lib', 'lxml-xml'
-        self.soup = bs4.BeautifulSoup(raw_xml, parser_type)
+        self.soup = beautiful_soup(raw_xml, parser_type)
         self.parser_type = parser_type
         self.title = []
         self.keywords = []
@@ -41,7 +47,7 @@ class ParserPaper:
 
     @staticmethod
     def compile(pattern):
-        return re.compile(pattern)
+        return patterns.compiled(pattern)
 
     def create_section(self, name='no_name_section', type_section='no_type', content=[]):
        return {
@@ -52,8 +58,8 @@ class ParserPaper:
 
     def create_parser_sections(self, soup):
 
-        first_attempt_search_str = re.compile('sec')
-        second_attempt_search_str = re.compile('sec-level[1-6]')
+        first_attempt_search_str = SECTION
+        second_attempt_search_str = SECTION_LEVEL
 
         section_tags = soup.find_all(first_attempt_search_str)
 
@@ -163,8 +169,8 @@ class ParserPaper:
         :param rules: list() of dict() of rules of bs4 find_all()
         :return: None
         """
-        for rule in rules:
-            for s in self.soup.find_all(**rule):
+        for _, tags in iter_matches(self.soup, rules, reorder=True):
+            for s in tags:
                 s.extract()
 
     def remove_tag(self, rules):
@@ -217,7 +223,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_paragraphs_soup = self.soup_orig.find_all(name=re.compile('p'))
+        list_paragraphs_soup = self.soup_orig.find_all(name=patterns.PARAGRAPH)
         list_paragraphs = []
         for item in list_paragraphs_soup:
             list_paragraphs.append(item.get_text())
@@ -281,7 +287,7 @@ class ParserPaper:
         """
         abstract = self.soup.find(**rule)
         if abstract is not None:
-            abstract_text = re.sub('(?<!\.)\\n','',abstract.get_text())
+            abstract_text = patterns.UNWRAPPED_NEWLINE.sub('',abstract.get_text())
             abstract_text = abstract_text.replace('Abstract', '')
             abstract_text = abstract_text.replace('\n','')
             abstract_text = abstract_text.replace('  ', '')
@@ -311,7 +317,7 @@ class ParserPaper:
             # self.save_soup_to_file('selction_found_nothing.xml')
             # input('Section not created, selection found nothing')
             return 'Section not created, number of paragraphs equal zero.'
-        inside_tags = inside_tags_inter[0].find_all(re.compile('para'), recursive=False)
+        inside_tags = inside_tags_inter[0].find_all(patterns.PARA, recursive=False)
         #inside_tags = inside_tags_inter[0].find_all('p', recursive=False)
         #inside_tags_ol = inside_tags_inter[0].find_all('ol', recursive=False)
         #print(len(inside_tags_ol))
@@ -380,8 +386,8 @@ class ParserPaper:
         :return: None
         """
         tags = list()
-        for rule in rules:
-            for tag in self.soup.find_all(**rule):
+        for _, found in iter_matches(self.soup, rules):
+            for tag in found:
                 tag.replace_with_children()
                 tags.append(tag.name)
         return tags
@@ -407,7 +413,7 @@ class ParserPaper:
         text = text.replace(" [, , , ]", " ")
         text = text.replace(" [, , , ,]", " ")
         text = ' '.join(str(text).split())
-        text = re.sub(r"\&(\w+?)gr;", r"\1", text)
+        text = patterns.GREEK_ENTITY.sub(r"\1", text)
         return text
 
     @property
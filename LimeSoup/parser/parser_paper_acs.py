@@ -11,12 +11,14 @@ __email__ = "nicolasmingione@lbl.gov"
 __date__ = "Apr 11 2018"
 
 import warnings
-import re
 
 import bs4
 
 # from LimeSoup.parser.parser_section_acs import ParserSections
+from LimeSoup.parser import patterns
 from LimeSoup.parser import tools as tl
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.rule_stats import iter_matches
 
 
 class ParserPaper:
@@ -29,7 +31,7 @@ class ParserPaper:
         """
         self.debugging = debugging
         # parsers 'xml.parser', 'lxml', 'xml5lib', 'lxml-xml'
-        self.soup = bs4.BeautifulSoup(raw_xml, parser_type)
+        self.soup = beautiful_soup(raw_xml, parser_type)
         self.parser_type = parser_type
         self.title = []
         self.keywords = []
@@ -55,7 +57,7 @@ class ParserPaper:
 
     @staticmethod
     def compile(pattern):
-        return re.compile(pattern)
+        return patterns.compiled(pattern)
 
     def create_section(self, name='no_name_section', type_section='no_type', content=[]):
        return {
@@ -66,7 +68,7 @@ class ParserPaper:
 
 
     def create_parser_sections(self, soup):
-        search_str = re.compile('section_h[1-6]')
+        search_str = patterns.SECTION_HEADING
         section_tags = soup.find_all(search_str)
         
         # Get all sections
@@ -163,8 +165,8 @@ class ParserPaper:
         :param rules: list() of dict() of rules of bs4 find_all()
         :return: None
         """
-        for rule in rules:
-            [s.extract() for s in self.soup.find_all(**rule)]
+        for _, tags in iter_matches(self.soup, rules, reorder=True):
+            [s.extract() for s in tags]
 
     def remove_tag(self, rules):
         """
@@ -216,7 +218,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_paragraphs_soup = self.soup_orig.find_all(name=re.compile('p'))
+        list_paragraphs_soup = self.soup_orig.find_all(name=patterns.PARAGRAPH)
         list_paragraphs = []
         for item in list_paragraphs_soup:
             list_paragraphs.append(item.get_text())
@@ -280,7 +282,7 @@ class ParserPaper:
         """
         abstract = self.soup.find(**rule)
         if abstract is not None:
-            abstract_text = re.sub('(?<!\.)\\n','',abstract.get_text())
+            abstract_text = patterns.UNWRAPPED_NEWLINE.sub('',abstract.get_text())
             abstract_text = abstract_text.replace('Abstract', '')
             abstract_text = abstract_text.replace('\n','')
             abstract_text = abstract_text.replace('  ', '')
@@ -310,7 +312,7 @@ class ParserPaper:
             # self.save_soup_to_file('selction_found_nothing.xml')
             # input('Section not created, selection found nothing')
             return 'Section not created, number of paragraphs equal zero.'
-        inside_tags = inside_tags_inter[0].find_all(re.compile('para'), recursive=False)
+        inside_tags = inside_tags_inter[0].find_all(patterns.PARA, recursive=False)
         #inside_tags = inside_tags_inter[0].find_all('p', recursive=False)
         #inside_tags_ol = inside_tags_inter[0].find_all('ol', recursive=False)
         #print(len(inside_tags_ol))
@@ -379,8 +381,8 @@ class ParserPaper:
         :return: None
         """
         tags = list()
-        for rule in rules:
-            for tag in self.soup.find_all(**rule):
+        for _, found in iter_matches(self.soup, rules):
+            for tag in found:
                 tag.replace_with_children()
                 tags.append(tag.name)
         return tags
@@ -400,7 +402,7 @@ class ParserPaper:
     def convert_to_text(text):
         text = text.replace("\n", " ")
         text = ' '.join(str(text).split())
-        text = re.sub(r"\&(\w+?)gr;", r"\1", text)
+        text = patterns.GREEK_ENTITY.sub(r"\1", text)
         return text
 
     @property
@@ -21,10 +21,15 @@ import warnings
 import bs4
 
 import LimeSoup.parser.tools as tl
+from LimeSoup.parser import patterns
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.rule_stats import iter_matches
+
+# Brackets left empty by the citations taken out
+EMPTY_CITATIONS = re.compile(r'\s?\[(\s|-\s|–\s|,\s)*\]')
 
 
 class ParserPaper:
-    journal_name = None
 
     def __init__(self, raw_html, parser_type='lxml-xml', debugging=False):
         """
@@ -34,7 +39,7 @@ class ParserPaper:
         """
         self.debugging = debugging
         # parsers 'html.parser', 'lxml', 'html5lib', 'lxml-xml'
-        self.soup = bs4.BeautifulSoup('{:}'.format(raw_html), parser_type)
+        self.soup = beautiful_soup(raw_html, parser_type)
         self.parser_type = parser_type
         self.title = []
         self.keywords = []
@@ -55,11 +60,7 @@ class ParserPaper:
 
     @staticmethod
     def compile(pattern):
-        return re.compile(pattern)
-
-    @staticmethod
-    def compile(pattern):
-        return re.compile(pattern)
+        return patterns.compiled(pattern)
 
     def create_section(self, name='no_name_section', type_section='no_type', content=[]):
         return {
@@ -69,7 +70,7 @@ class ParserPaper:
         }
 
     def create_parser_sections(self, soup):
-        search_str = re.compile('section_h[1-6]')
+        search_str = patterns.SECTION_HEADING
         section_tags = soup.find_all(search_str)
 
         # Get all sections
@@ -84,8 +85,8 @@ class ParserPaper:
             content = []
             for p in tag.find_all('p'):
                 p = p.getText()
-                p = re.sub('\n*\s+\n*', ' ', p)
-                p = re.sub(r'\s?\[(\s|-\s|–\s|,\s)*\]', '', p)
+                p = patterns.SPACES.sub(' ', p)
+                p = EMPTY_CITATIONS.sub('', p)
 
                 content.append(p.strip())
             if len(content) > 0:
@@ -183,8 +184,8 @@ class ParserPaper:
         :param rules: list() of dict() of rules of bs4 find_all()
         :return: None
         """
-        for rule in rules:
-            [s.extract() for s in self.soup.find_all(**rule)]
+        for _, tags in iter_matches(self.soup, rules, reorder=True):
+            [s.extract() for s in tags]
 
     def remove_tag(self, rules):
         """
@@ -201,7 +202,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_heading_soup = self.soup_orig.find_all(name=re.compile('^h[1-6]$'))
+        list_heading_soup = self.soup_orig.find_all(name=patterns.HEADING)
         list_heading = []
         for item in list_heading_soup:
             list_heading.append(item.get_text())
@@ -212,7 +213,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_heading_soup = self.soup.find_all(name=re.compile('^h[1-6]$'))
+        list_heading_soup = self.soup.find_all(name=patterns.HEADING)
         list_heading = []
         for item in list_heading_soup:
             list_heading.append(tl.convert_to_text(item.get_text()))
@@ -238,17 +239,17 @@ class ParserPaper:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
         soup_one = copy.copy(self.soup)
-        find_one1 = soup_one.find_all(name=re.compile('^h[1-6]$'))
+        find_one1 = soup_one.find_all(name=patterns.HEADING)
         for e in find_one1:
             e.extract()
-        find_one = soup_one.find_all(name=re.compile('span|p'), limit=1)
+        find_one = soup_one.find_all(name=patterns.SPAN_OR_PARAGRAPH, limit=1)
         list_paragraphs = []
         while len(find_one) != 0:
             text = tl.convert_to_text(find_one[0].get_text())
             if (find_one[0].name is not None) and (len(text) != 0):
                 list_paragraphs.append(text)
             find_one[0].extract()
-            find_one = soup_one.find_all(name=re.compile('span|p'), limit=1)
+            find_one = soup_one.find_all(name=patterns.SPAN_OR_PARAGRAPH, limit=1)
         return list_paragraphs
 
     @property
@@ -256,7 +257,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_paragraphs_soup = self.soup_orig.find_all(name=re.compile('p'))
+        list_paragraphs_soup = self.soup_orig.find_all(name=patterns.PARAGRAPH)
         list_paragraphs = []
         for item in list_paragraphs_soup:
             list_paragraphs.append(item.get_text())
@@ -305,7 +306,7 @@ class ParserPaper:
             # self.save_soup_to_file('selction_found_nothing.html')
             # input('Section not created, selection found nothing')
             return 'Section not created, number of paragraphs equal zero.'
-        inside_tags = inside_tags_inter[0].find_all(re.compile('(p|ol)|span'), recursive=False)
+        inside_tags = inside_tags_inter[0].find_all(patterns.PARAGRAPH_OR_SPAN, recursive=False)
         # inside_tags = inside_tags_inter[0].find_all('p', recursive=False)
         # inside_tags_ol = inside_tags_inter[0].find_all('ol', recursive=False)
         # inside_tags = inside_tags_p + inside_tags_ol
@@ -371,14 +372,14 @@ class ParserPaper:
         :return: None
         """
         tags = list()
-        for rule in rules:
-            for tag in self.soup.find_all(**rule):
+        for _, found in iter_matches(self.soup, rules):
+            for tag in found:
                 tag.replace_with_children()
                 tags.append(tag.name)
         return tags
 
     def change_name_tag_sections(self):
-        tags = self.soup.find_all(re.compile('^h[2-6]'))
+        tags = self.soup.find_all(patterns.SUBHEADING)
         for each_tag in tags:
             each_tag.parent.name = 'section_{}'.format(each_tag.name)
 
@@ -20,6 +20,12 @@ import warnings
 import bs4
 
 import LimeSoup.parser.tools as tl
+from LimeSoup.parser import patterns
+from LimeSoup.parser.encoding import beautiful_soup
+from LimeSoup.parser.rule_stats import iter_matches
+
+SUBSECTION_HEADING = re.compile('section_h[2-6]')
+ANY_SUBHEADING = re.compile('h[2-6]')
 
 
 class ParserPaper:
@@ -32,7 +38,7 @@ class ParserPaper:
         """
         self.debugging = debugging
         # parsers 'html.parser', 'lxml', 'html5lib', 'lxml-xml'
-        self.soup = bs4.BeautifulSoup('{:}'.format(raw_html), parser_type)
+        self.soup = beautiful_soup(raw_html, parser_type)
         self.parser_type = parser_type
         self.title = []
         self.keywords = []
@@ -58,7 +64,7 @@ class ParserPaper:
 
     @staticmethod
     def compile(pattern):
-        return re.compile(pattern)
+        return patterns.compiled(pattern)
 
     def create_section(self, name='no_name_section', type_section='no_type', content=[]):
        return {
@@ -69,7 +75,7 @@ class ParserPaper:
 
 
     def create_parser_sections(self, soup):
-        search_str = re.compile('section_h[2-6]')
+        search_str = SUBSECTION_HEADING
         section_tags = soup.find_all(search_str)
         for tag in section_tags:
             try:
@@ -121,8 +127,9 @@ class ParserPaper:
             if did_nest:
                 self.data_sections = [s for s in self.data_sections if s['type'] != 'section_h{}'.format(i)]
 
-    def format_text(self, text):
-        text = re.sub('\n*\s+\n*',' ',text.strip()).strip()
+    @staticmethod
+    def format_text(text):
+        text = patterns.SPACES.sub(' ',text.strip()).strip()
         text = text.replace(' , , , , ', '').replace(' , , , ', '').replace(' , , ', '')
         text = text.replace('\\n', '').replace(', \'', '')
         text = text.replace('.\'', '.').replace(' , ', '')
@@ -193,8 +200,8 @@ class ParserPaper:
         :param rules: list() of dict() of rules of bs4 find_all()
         :return: None
         """
-        for rule in rules:
-            [s.extract() for s in self.soup.find_all(**rule)]
+        for _, tags in iter_matches(self.soup, rules, reorder=True):
+            [s.extract() for s in tags]
 
     def remove_tag(self, rules):
         """
@@ -211,7 +218,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_heading_soup = self.soup_orig.find_all(name=re.compile('^h[1-6]$'))
+        list_heading_soup = self.soup_orig.find_all(name=patterns.HEADING)
         list_heading = []
         for item in list_heading_soup:
             list_heading.append(item.get_text())
@@ -222,7 +229,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_heading_soup = self.soup.find_all(name=re.compile('^h[1-6]$'))
+        list_heading_soup = self.soup.find_all(name=patterns.HEADING)
         list_heading = []
         for item in list_heading_soup:
             list_heading.append(tl.convert_to_text(item.get_text()))
@@ -248,17 +255,17 @@ class ParserPaper:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
         soup_one = copy.copy(self.soup)
-        find_one1 = soup_one.find_all(name=re.compile('^h[1-6]$'))
+        find_one1 = soup_one.find_all(name=patterns.HEADING)
         for e in find_one1:
             e.extract()
-        find_one = soup_one.find_all(name=re.compile('span|p'), limit=1)
+        find_one = soup_one.find_all(name=patterns.SPAN_OR_PARAGRAPH, limit=1)
         list_paragraphs = []
         while len(find_one) != 0:
             text = tl.convert_to_text(find_one[0].get_text())
             if (find_one[0].name is not None) and (len(text) != 0):
                 list_paragraphs.append(text)
             find_one[0].extract()
-            find_one = soup_one.find_all(name=re.compile('span|p'), limit=1)
+            find_one = soup_one.find_all(name=patterns.SPAN_OR_PARAGRAPH, limit=1)
         return list_paragraphs
 
     @property
@@ -266,7 +273,7 @@ class ParserPaper:
         if not self.debugging:
             warnings.warn('Debugging mode has to be True when call the class')
             return None
-        list_paragraphs_soup = self.soup_orig.find_all(name=re.compile('p'))
+        list_paragraphs_soup = self.soup_orig.find_all(name=patterns.PARAGRAPH)
         list_paragraphs = []
         for item in list_paragraphs_soup:
             list_paragraphs.append(item.get_text())
@@ -316,7 +323,7 @@ class ParserPaper:
             # self.save_soup_to_file('selction_found_nothing.html')
             # input('Section not created, selection found nothing')
             return 'Section not created, number of paragraphs equal zero.'
-        inside_tags = inside_tags_inter[0].find_all(re.compile('(p|ol)|span'), recursive=False)
+        inside_tags = inside_tags_inter[0].find_all(patterns.PARAGRAPH_OR_SPAN, recursive=False)
         #inside_tags = inside_tags_inter[0].find_all('p', recursive=False)
         #inside_tags_ol = inside_tags_inter[0].find_all('ol', recursive=False)
         #inside_tags = inside_tags_p + inside_tags_ol
@@ -358,7 +365,7 @@ class ParserPaper:
         :param rule:
         :return:
         """
-        search_str = re.compile('h[2-6]')
+        search_str = ANY_SUBHEADING
         tags = self.soup.find_all(search_str)
         count = 0
         for each_tag in tags:
@@ -395,14 +402,14 @@ class ParserPaper:
         :return: None
         """
         tags = list()
-        for rule in rules:
-            for tag in self.soup.find_all(**rule):
+        for _, found in iter_matches(self.soup, rules):
+            for tag in found:
                 tag.replace_with_children()
                 tags.append(tag.name)
         return tags
 
     def change_name_tag_sections(self):
-        tags = self.soup.find_all(re.compile('^h[2-6]'))
+        tags = self.soup.find_all(patterns.SUBHEADING)
         for each_tag in tags:
             each_tag.parent.name = 'section_{}'.format(each_tag.name)
 
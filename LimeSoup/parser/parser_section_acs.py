@@ -16,18 +16,20 @@ __date__ = "Apr 11 2018"
 
 import warnings
 import bs4
-import re
 
+from LimeSoup.parser import patterns
 from LimeSoup.parser import tools as tl
 
 
 class ParserSections(object):
-    number_paragraphs = 0
-    number_heading = 0
-    list_heading = []
 
     def __init__(self, soup, parameters, debugging=False, parser_type='lxml', new=False):
         # parser_types = ['xml.parser', 'lxml', 'xml5lib', 'lxml-xml']
+        # Counters are kept per instance (and summed up from the nested
+        # ParserSections), so that concurrent parses do not share state.
+        self.number_paragraphs = 0
+        self.number_heading = 0
+        self.list_heading = []
         self.parser_type = parser_type
         self.soup = bs4.BeautifulSoup(repr(soup), parser_type)
         self.soup1 = list(self.soup.children)
@@ -60,7 +62,7 @@ class ParserSections(object):
                     #print('IT\'S A HEADING!')
                     self.content_section.append({
                             'type': item.name,
-                            'name': re.sub('(?<!\.)\\n','',item.section_title.get_text()),
+                            'name': patterns.UNWRAPPED_NEWLINE.sub('',item.section_title.get_text()),
                             'content': []
                             })
     
@@ -89,12 +91,12 @@ class ParserSections(object):
         save_lost = False
         tags_lost = self.soup.find_all()
         for tag in tags_lost:
-            text1 = tl.convert_to_text(re.sub('(?<!\.)\\n','',tag.get_text()))
+            text1 = tl.convert_to_text(patterns.UNWRAPPED_NEWLINE.sub('',tag.get_text()))
             if len(text1) > 0:
                 save_lost = True
                 lost_section['content'].append(text1)
             tag.extract()
-        text1 = tl.convert_to_text(re.sub('(?<!\.)\\n','',self.soup1.get_text()))
+        text1 = tl.convert_to_text(patterns.UNWRAPPED_NEWLINE.sub('',self.soup1.get_text()))
         if len(text1) > 0:
             save_lost = True
             lost_section['content'].append(text1)
@@ -119,8 +121,8 @@ class ParserSections(object):
                 " Section with no name - deal_para "
                 + "the name was defined as no_name_section"
             )
-        ParserSections.number_paragraphs += 1
-        txt_paragraph = tl.convert_to_text(re.sub('(?<!\.)\\n','',self.content.get_text()))
+        self.number_paragraphs += 1
+        txt_paragraph = tl.convert_to_text(patterns.UNWRAPPED_NEWLINE.sub('',self.content.get_text()))
         #print('The paragraph is', txt_paragraph)
         if txt_paragraph != '' or txt_paragraph is None:
             #print('We add it to the content_section')
@@ -160,12 +162,15 @@ class ParserSections(object):
         parse_intern = ParserSections(self.content, self.parameters, parser_type=self.parser_type)
         #print('We get the first element of:',parse_intern.data)
         self.content_section[self.i]['content'].append(parse_intern.data[0])
+        self.number_paragraphs += parse_intern.number_paragraphs
+        self.number_heading += parse_intern.number_heading
+        self.list_heading.extend(parse_intern.list_heading)
         del parse_intern
 
     def _deal_default(self):
         #print('DEFAULT')
-        ParserSections.number_paragraphs += len(list(self.content.find_all('p')))
-        txt_paragraph = tl.convert_to_text(re.sub('(?<!\.)\\n','',self.content.get_text()))
+        self.number_paragraphs += len(list(self.content.find_all('p')))
+        txt_paragraph = tl.convert_to_text(patterns.UNWRAPPED_NEWLINE.sub('',self.content.get_text()))
         if self.content_section is None:
             self._create_section()
             warnings.warn(
@@ -177,14 +182,14 @@ class ParserSections(object):
 
     @property
     def heading(self):
-        lista = ParserSections.list_heading
-        ParserSections.list_heading = []
+        lista = self.list_heading
+        self.list_heading = []
         return lista
 
     @property
     def get_number_paragraphs(self):
-        number_paragraphs = ParserSections.number_paragraphs
-        ParserSections.number_paragraphs = 0
+        number_paragraphs = self.number_paragraphs
+        self.number_paragraphs = 0
         return number_paragraphs
 
     def save_soup_to_file(self, filename='soup.xml', prettify=True):
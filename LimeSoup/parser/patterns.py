@@ -0,0 +1,64 @@
+"""
+Regular expressions of the parsers, compiled once at import.
+
+The parsers used to build their patterns inside the functions that use them,
+for every section, paragraph or text node of every paper: re.compile(),
+re.sub() and the other functions of re look the pattern up in the cache of re
+on each call, and compile it again once it is evicted from that cache (512
+patterns) by the other patterns of a batch. The patterns shared by several
+parsers are compiled here, the others as constants of their own modules:
+
+    from LimeSoup.parser import patterns
+
+    tags = soup.find_all(patterns.SUBHEADING)
+    text = patterns.NEWLINE.sub(' ', text)
+
+Patterns only known at run time (e.g. the rules of a soup) are compiled by
+compiled(), which keeps them. LimeSoup/parser/test/test_patterns.py fails on
+a literal pattern compiled or matched inside a function.
+"""
+import functools
+import re
+
+__all__ = ['HEADING', 'SUBHEADING', 'SECTION_HEADING', 'PARAGRAPH', 'PARA', 'PARAGRAPH_OR_SPAN', 'SPAN_OR_PARAGRAPH',
+           'SECTION_ID', 'NEWLINE', 'UNWRAPPED_NEWLINE', 'SPACES', 'WHITESPACES', 'SPACED_COMMA', 'SPACED_PERIOD',
+           'GREEK_ENTITY', 'FIRST_PUBLISHED', 'ACKNOWLEDGEMENT', 'REFERENCE', 'compiled']
+
+# Tag names, searched by BeautifulSoup
+HEADING = re.compile('^h[1-6]$')
+SUBHEADING = re.compile('^h[2-6]')
+# The headings renamed by ParserPaper.change_name_tag_sections
+SECTION_HEADING = re.compile('section_h[1-6]')
+# Any name with a p: p, sup, caption...
+PARAGRAPH = re.compile('p')
+PARA = re.compile('para')
+PARAGRAPH_OR_SPAN = re.compile('(p|ol)|span')
+SPAN_OR_PARAGRAPH = re.compile('span|p')
+
+# Attribute values
+SECTION_ID = re.compile('^sect[0-9]+$')
+FIRST_PUBLISHED = re.compile('First published on')
+
+# Text
+NEWLINE = re.compile(r'\n')
+# Newlines of the markup, not ending a sentence
+UNWRAPPED_NEWLINE = re.compile(r'(?<!\.)\n')
+SPACES = re.compile('\n*\\s+\n*')
+WHITESPACES = re.compile(r'\s+')
+SPACED_COMMA = re.compile(r'\s,\s')
+# Any character between spaces, as the parsers always did
+SPACED_PERIOD = re.compile(r'\s.\s')
+GREEK_ENTITY = re.compile(r'\&(\w+?)gr;')
+
+# Headings of the sections left out of the text
+ACKNOWLEDGEMENT = re.compile('.*?acknowledge?ment.*?', re.IGNORECASE)
+REFERENCE = re.compile('.*?reference.*?', re.IGNORECASE)
+
+
+@functools.lru_cache(maxsize=None)
+def compiled(pattern, flags=0):
+    """
+    :param pattern: str or bytes pattern known at run time.
+    :return: the compiled pattern, the same object for the same arguments.
+    """
+    return re.compile(pattern, flags)
@@ -0,0 +1,236 @@
+"""
+Checks of the raw markup of a paper, run by a soup before its ingredients,
+which reject in a few regex scans the pages that the ingredients would spend
+a full parse on: not markup at all, paywalls, cookie walls, error pages,
+abstracts and landing pages.
+
+A soup whose parser cannot do without some element (the body of a JATS
+article, the <fulltext> of an AIP response...) declares markers of that
+element. A page without any of them has no full text:
+
+    Soup(parser_version=__version__, accepts_bytes=True,
+         precheck=Precheck(body=['<body'], abstract=['<abstract']))
+
+and the verdict tells why, from the other markers found (see REASONS):
+'paywall', 'cookie_wall', 'error_page', then 'abstract_only' if the soup has
+abstract markers and one is found, 'landing' if none is, and 'no_body'
+without abstract markers. Soup.parse(precheck=True) and the batch runner
+raise the error of the reason (see LimeSoup.errors). A page with a body
+marker goes on to the ingredients, whatever else it has.
+
+Markers are matched ignoring case, on str or on bytes (in an ASCII-compatible
+encoding) without decoding them. Bytes in other encodings (UTF-16, UTF-32),
+told by their BOM or declared, are not checked. Precheck.scan() reads a file by chunks and
+stops at the first body marker, to validate papers without reading them
+whole, see LimeSoup.validate.
+"""
+import codecs
+import collections
+import functools
+import re
+
+from LimeSoup.errors import AbstractOnly, BodyNotFound, LandingPage, MalformedMarkup, NotAnArticle, Paywalled
+
+__all__ = ['PAYWALL_MARKERS', 'COOKIE_WALL_MARKERS', 'ERROR_PAGE_MARKERS', 'REASONS', 'Verdict', 'ascii_compatible',
+           'Precheck']
+
+STAGE = 'precheck'
+
+# Characters of the head of a paper that must have a tag, and where the
+# markers of a Precheck `only_if` are looked for
+HEAD_SIZE = 4096
+
+CHUNK_SIZE = 1 << 16
+
+PAYWALL_MARKERS = (
+    'purchase this article', 'purchase pdf', 'buy this article', 'buy article', 'rent this article',
+    'get access to the full', 'subscribe to this journal', 'access through your institution',
+    'you do not have access', 'you do not have full access', 'log in to view the full text',
+)
+
+COOKIE_WALL_MARKERS = (
+    'enable cookies', 'cookies are disabled', 'cookies must be enabled', 'cookie_consent', 'cookie-wall',
+)
+
+ERROR_PAGE_MARKERS = (
+    '<title>404', '<title>403', '<title>500', '<title>503', 'page not found', 'access denied',
+    'service unavailable', 'too many requests', 'an error occurred while processing your request',
+)
+
+# Reasons of the verdicts, and the errors raised by the soups for them
+REASONS = collections.OrderedDict([
+    ('pdf', MalformedMarkup),
+    ('not_markup', MalformedMarkup),
+    ('paywall', Paywalled),
+    ('cookie_wall', NotAnArticle),
+    ('error_page', NotAnArticle),
+    ('abstract_only', AbstractOnly),
+    ('landing', LandingPage),
+    ('no_body', BodyNotFound),
+])
+
+MESSAGES = {
+    'pdf': 'A PDF, not markup',
+    'not_markup': 'No markup in the first %d characters' % HEAD_SIZE,
+    'paywall': 'Paywall page, no article body',
+    'cookie_wall': 'Cookie wall, no article body',
+    'error_page': 'Error page, no article body',
+    'abstract_only': 'Abstract only, no article body',
+    'landing': 'Neither article body nor abstract',
+    'no_body': 'Cannot find article body',
+}
+
+# Markers are ASCII, and cannot be found in these encodings without decoding
+WIDE_BOMS = (codecs.BOM_UTF32_LE, codecs.BOM_UTF32_BE, codecs.BOM_UTF16_LE, codecs.BOM_UTF16_BE)
+
+_TAG = re.compile('<'), re.compile(b'<')
+_PDF = re.compile(r'\s*%PDF-'), re.compile(br'\s*%PDF-')
+
+
+class Verdict(collections.namedtuple('Verdict', 'ok reason')):
+    """
+    ok: the paper may be parsed; reason: None if ok, or a key of REASONS.
+    """
+    __slots__ = ()
+
+    def error(self):
+        """
+        :return: the LimeSoup.errors.LimeSoupError of the reason.
+        """
+        return REASONS[self.reason](MESSAGES[self.reason], stage=STAGE)
+
+
+OK = Verdict(True, None)
+
+
+@functools.lru_cache(maxsize=None)
+def ascii_compatible(encoding):
+    """
+    :param encoding: declared encoding of bytes, None if unknown.
+    :return: whether the ASCII markers can be found in the bytes as they are:
+        False for UTF-16 and UTF-32, True for unknown encodings.
+    """
+    if encoding is None:
+        return True
+    try:
+        return '<body'.encode(encoding) == b'<body'
+    except LookupError:
+        return True
+
+
+def _patterns(markers):
+    """
+    :return: (str pattern, bytes pattern) finding any of the markers, or
+        None without markers.
+    """
+    if not markers:
+        return None
+    text = '|'.join(re.escape(x) for x in markers)
+    return re.compile(text, re.IGNORECASE), re.compile(text.encode('ascii'), re.IGNORECASE)
+
+
+class Precheck(object):
+    # Marker groups telling why there is no body, in order of precedence
+    WHY = ('paywall', 'cookie_wall', 'error_page', 'abstract')
+
+    def __init__(self, body=(), abstract=(), paywall=PAYWALL_MARKERS, cookie_wall=COOKIE_WALL_MARKERS,
+                 error_page=ERROR_PAGE_MARKERS, only_if=()):
+        """
+        :param body: markers of the elements the soup needs, the page is not
+            checked further if one of them is found. Without body markers,
+            only the markup itself is checked.
+        :param abstract: markers of an abstract.
+        :param paywall: markers of a paywall.
+        :param cookie_wall: markers of a page asking to accept cookies.
+        :param error_page: markers of an HTTP error page.
+        :param only_if: markers of the head of the pages the body markers
+            apply to, for soups parsing several formats.
+        """
+        self.markers = collections.OrderedDict([
+            ('body', tuple(body)), ('abstract', tuple(abstract)), ('paywall', tuple(paywall)),
+            ('cookie_wall', tuple(cookie_wall)), ('error_page', tuple(error_page)), ('only_if', tuple(only_if)),
+        ])
+        self._patterns = {name: _patterns(markers) for name, markers in self.markers.items()}
+        # Markers may be cut between two chunks
+        self._overlap = max(len(x) for markers in self.markers.values() for x in markers or ('',))
+
+    def fingerprint(self):
+        return repr(list(self.markers.items()))
+
+    def __call__(self, raw):
+        """
+        :param raw: raw paper, str or bytes-like (bytes, mmap, memoryview).
+        :raise LimeSoup.errors.LimeSoupError: the error of the verdict if the
+            page cannot be an article the soup parses, see REASONS.
+        """
+        verdict = self.verdict(raw)
+        if not verdict.ok:
+            raise verdict.error()
+
+    def verdict(self, raw, encoding=None):
+        """
+        :param raw: raw paper, str or bytes-like (bytes, mmap, memoryview).
+        :param encoding: encoding of bytes, None to sniff a BOM.
+        :return: Verdict.
+        """
+        return self.scan([raw], encoding)
+
+    def scan(self, chunks, encoding=None):
+        """
+        :param chunks: iterable of consecutive parts of a raw paper, all str or
+            all bytes-like, the first of at least HEAD_SIZE characters unless
+            it is the whole paper. Chunks are read until a body marker is found.
+        :param encoding: encoding of bytes, None to sniff a BOM.
+        :return: Verdict.
+        """
+        found = set()
+        tail = None
+        for chunk in chunks:
+            is_bytes = not isinstance(chunk, str)
+            if tail is None:
+                head = self._head(chunk, is_bytes, encoding)
+                if head is not None:
+                    return head
+                text = chunk
+            else:
+                text = tail + chunk
+            if self._patterns['body'][is_bytes].search(text) is not None:
+                return OK
+            for name in self.WHY:
+                if name not in found and self._patterns[name] is not None and \
+                        self._patterns[name][is_bytes].search(text) is not None:
+                    found.add(name)
+            tail = bytes(text[-self._overlap:]) if is_bytes else text[-self._overlap:]
+        if tail is None:
+            return Verdict(False, 'not_markup')
+        for name in self.WHY[:-1]:
+            if name in found:
+                return Verdict(False, name)
+        if self._patterns['abstract'] is None:
+            return Verdict(False, 'no_body')
+        return Verdict(False, 'abstract_only' if 'abstract' in found else 'landing')
+
+    def _head(self, chunk, is_bytes, encoding=None):
+        """
+        :return: the verdict of a paper from its first chunk, None to scan it.
+        """
+        if is_bytes and (bytes(chunk[:4]).startswith(WIDE_BOMS) or not ascii_compatible(encoding)):
+            return OK
+        if _PDF[is_bytes].match(chunk, 0, HEAD_SIZE):
+            return Verdict(False, 'pdf')
+        if _TAG[is_bytes].search(chunk, 0, HEAD_SIZE) is None:
+            return Verdict(False, 'not_markup')
+        if self._patterns['body'] is None:
+            return OK
+        only_if = self._patterns['only_if']
+        if only_if is not None and only_if[is_bytes].search(chunk, 0, HEAD_SIZE) is None:
+            return OK
+        return None
+
+    def scan_file(self, f, chunk_size=CHUNK_SIZE, encoding=None):
+        """
+        :param f: binary file object of a raw paper, read from its position.
+        :param encoding: encoding of the file, None to sniff a BOM.
+        :return: Verdict.
+        """
+        return self.scan(iter(lambda: f.read(chunk_size), b''), encoding)
@@ -0,0 +1,261 @@
+"""
+Hit counters for the bs4 rules of the parsers (the lists of find_all()
+rules given to remove_tags(), strip_tags(), etc.).
+
+Rule lists grow with every change of the publisher templates, and rules for
+old templates are rarely removed. Each rule still costs a scan of the tree.
+Counting how often each rule matches over a corpus shows the dead ones:
+
+    from LimeSoup.parser import rule_stats
+
+    stats = rule_stats.enable()
+    for paper in papers:
+        WileySoup.parse(paper)
+    rule_stats.disable()
+    print(stats.format_report(dead_only=True))
+
+With prune=True, rules are also ordered by how often they match, and rules
+that never matched on a template (see template_fingerprint()) are skipped
+after `warmup` documents of that template. Every `full_check_every`
+documents all the rules run again, and a warning is emitted when a skipped
+rule matches, so that template changes do not go unnoticed.
+
+Counters are kept per process. To collect them over a corpus, parse in one
+process (serially or with threads).
+"""
+import contextlib
+import threading
+import warnings
+import zlib
+from collections import defaultdict
+
+import bs4
+
+__all__ = [
+    'RuleStats', 'RuleRevivedWarning',
+    'enable', 'disable', 'active', 'stage',
+    'iter_matches', 'rule_key', 'template_fingerprint',
+]
+
+_local = threading.local()
+_stats = None
+
+
+class RuleRevivedWarning(UserWarning):
+    pass
+
+
+def rule_key(rule):
+    """
+    :param rule: dict of bs4 find_all() arguments.
+    :return: a readable string identifying the rule.
+    """
+    items = []
+    for name, value in sorted(rule.items()):
+        pattern = getattr(value, 'pattern', None)
+        items.append('%s=%s' % (name, 're(%r)' % pattern if pattern is not None else repr(value)))
+    return ', '.join(items)
+
+
+# Tags of the metadata of a page, which differ from article to article
+METADATA_TAGS = frozenset(['head', 'meta', 'link', 'script', 'style', 'title'])
+
+
+def _body(soup):
+    # Looked for at the top of the tree only, soup.body would search XML
+    # papers (without <body>) whole
+    for child in soup.children:
+        if isinstance(child, bs4.Tag):
+            if child.name == 'body':
+                return child
+            if child.name == 'html':
+                return _body(child)
+    return soup
+
+
+def template_fingerprint(soup, depth=3):
+    """
+    A cheap signature of the page template: the distinct names and classes
+    of the tags in the first levels of the body (of the soup itself if it has
+    no <body>), without the metadata tags. Articles of a template share it
+    whatever their metadata, length or number of sections.
+
+    :param soup: bs4 soup or tag.
+    :return: a hex string.
+    """
+    signature = set()
+    level = [_body(soup)]
+    for _ in range(depth):
+        next_level = []
+        for tag in level:
+            for child in tag.children:
+                if isinstance(child, bs4.Tag) and child.name not in METADATA_TAGS:
+                    signature.add('%s.%s' % (child.name, '.'.join(child.get('class') or ())))
+                    next_level.append(child)
+        level = next_level
+    return '%08x' % zlib.crc32('|'.join(sorted(signature)).encode('utf-8'))
+
+
+class RuleStats(object):
+    def __init__(self, prune=False, warmup=50, full_check_every=100):
+        """
+        :param prune: order rules by hit rate and skip the rules that never
+            matched on the template of the document.
+        :param warmup: number of documents of a template before skipping.
+        :param full_check_every: run all the rules every that many documents.
+        """
+        self.prune = prune
+        self.warmup = warmup
+        self.full_check_every = full_check_every
+
+        self._lock = threading.Lock()
+        # (stage, rule) -> number of scans, scans with matches, matched tags
+        self.scans = defaultdict(int)
+        self.hits = defaultdict(int)
+        self.matches = defaultdict(int)
+        # (stage, template, rule) -> number of documents, documents with matches
+        self._template_documents = defaultdict(int)
+        self._template_hits = defaultdict(int)
+
+    def order(self, stage_name, fingerprint, keyed_rules):
+        """
+        Sort (key, rule) pairs, the rules that match most often first.
+        """
+        with self._lock:
+            def hit_rate(keyed_rule):
+                template_rule = (stage_name, fingerprint, keyed_rule[0])
+                return -self._template_hits[template_rule] / max(self._template_documents[template_rule], 1)
+            return sorted(keyed_rules, key=hit_rate)
+
+    def _is_pruned(self, template_rule, documents):
+        return documents >= self.warmup and self._template_hits[template_rule] == 0
+
+    def should_scan(self, stage_name, fingerprint, key):
+        """
+        Count a document of the template, and decide whether the rule runs.
+        """
+        template_rule = (stage_name, fingerprint, key)
+        with self._lock:
+            documents = self._template_documents[template_rule]
+            self._template_documents[template_rule] = documents + 1
+            if not self.prune or not self._is_pruned(template_rule, documents):
+                return True
+            return documents % self.full_check_every == 0
+
+    def record(self, stage_name, fingerprint, key, n_matches):
+        """
+        Record the result of one scan with a rule.
+        """
+        template_rule = (stage_name, fingerprint, key)
+        with self._lock:
+            self.scans[stage_name, key] += 1
+            if not n_matches:
+                return
+            if self.prune and self._is_pruned(template_rule, self._template_documents[template_rule] - 1):
+                warnings.warn('Rule {%s} in %s matched again on template %s, it will not be skipped anymore.' % (
+                    key, stage_name, fingerprint), RuleRevivedWarning)
+            self.hits[stage_name, key] += 1
+            self.matches[stage_name, key] += n_matches
+            self._template_hits[template_rule] += 1
+
+    def report(self):
+        """
+        :return: list of dict(stage, rule, scans, hits, matches), sorted by
+            stage and number of hits.
+        """
+        with self._lock:
+            rows = [{
+                'stage': stage_name,
+                'rule': key,
+                'scans': scans,
+                'hits': self.hits[stage_name, key],
+                'matches': self.matches[stage_name, key],
+            } for (stage_name, key), scans in self.scans.items()]
+        return sorted(rows, key=lambda x: (x['stage'], x['hits'], x['rule']))
+
+    def dead_rules(self):
+        """
+        :return: list of (stage, rule) that never matched.
+        """
+        return [(x['stage'], x['rule']) for x in self.report() if x['hits'] == 0]
+
+    def format_report(self, dead_only=False):
+        lines = ['%-32s %8s %8s %8s  %s' % ('stage', 'scans', 'hits', 'matches', 'rule')]
+        for row in self.report():
+            if dead_only and row['hits']:
+                continue
+            lines.append('%-32s %8d %8d %8d  {%s}' % (
+                row['stage'], row['scans'], row['hits'], row['matches'], row['rule']))
+        return '\n'.join(lines)
+
+
+def enable(stats=None, **kwargs):
+    """
+    Start counting rule hits.
+
+    :param stats: RuleStats to use, or None to create one with kwargs.
+    :return: the RuleStats collecting the counters.
+    """
+    global _stats
+    _stats = stats if stats is not None else RuleStats(**kwargs)
+    return _stats
+
+
+def disable():
+    """
+    Stop counting rule hits.
+
+    :return: the RuleStats that was collecting the counters, if any.
+    """
+    global _stats
+    stats, _stats = _stats, None
+    return stats
+
+
+def active():
+    return _stats
+
+
+@contextlib.contextmanager
+def stage(name):
+    """
+    Attribute the rules run in this context (and thread) to a stage, usually
+    the name of a rule ingredient.
+    """
+    previous = getattr(_local, 'stage', None)
+    _local.stage = name
+    try:
+        yield
+    finally:
+        _local.stage = previous
+
+
+def iter_matches(soup, rules, reorder=False):
+    """
+    Yield (rule, soup.find_all(**rule)) for each rule, counting hits if
+    enabled. Each rule is searched after the caller has processed the tags
+    of the previous rule.
+
+    :param soup: bs4 soup or tag.
+    :param rules: list of dict of bs4 find_all() arguments.
+    :param reorder: whether the rules may run in a different order, only
+        when the result does not depend on it (e.g. removing tags).
+    """
+    stats = _stats
+    if stats is None:
+        for rule in rules:
+            yield rule, soup.find_all(**rule)
+        return
+
+    stage_name = getattr(_local, 'stage', None) or '<unknown>'
+    fingerprint = template_fingerprint(soup) if stats.prune else None
+    keyed_rules = [(rule_key(rule), rule) for rule in rules]
+    if reorder and stats.prune:
+        keyed_rules = stats.order(stage_name, fingerprint, keyed_rules)
+
+    for key, rule in keyed_rules:
+        if not stats.should_scan(stage_name, fingerprint, key):
+            continue
+        tags = soup.find_all(**rule)
+        stats.record(stage_name, fingerprint, key, len(tags))
+        yield rule, tags
@@ -0,0 +1,106 @@
+import unittest
+
+from LimeSoup import ACSSoup, ECSSoup, SpringerSoup
+from LimeSoup.batch import parse_documents, parse_many, parse_records, resolve_executor, run_batch
+from LimeSoup.parser.test.test_errors import JATS_ABSTRACT
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.registry import detect_publisher, publisher_of_doi
+from LimeSoup.schedule import CostModel, iter_longest_first
+from LimeSoup.sinks import CallbackSink
+
+
+class TestParseMany(unittest.TestCase):
+    def setUp(self):
+        self.papers = [SPRINGER_HTML.format(i) for i in range(6)]
+        self.expected = [SpringerSoup.parse(paper) for paper in self.papers]
+
+    def test_executors_keep_order(self):
+        for executor in ('serial', 'thread', 'process'):
+            results = list(SpringerSoup.parse_many(self.papers, executor=executor, max_workers=2))
+            self.assertEqual(results, self.expected, executor)
+
+    def test_return_exceptions(self):
+        # Not an ECS paper at all
+        results = list(parse_many(ECSSoup, ['<html></html>'], executor='thread',
+                                  return_exceptions=True))
+        self.assertIsInstance(results[0], Exception)
+
+        with self.assertRaises(Exception):
+            list(parse_many(ECSSoup, ['<html></html>'], executor='serial'))
+
+    def test_unknown_executor(self):
+        with self.assertRaises(ValueError):
+            resolve_executor('cluster')
+
+
+class TestParseRecords(unittest.TestCase):
+    def test_records(self):
+        papers = [('springer', SPRINGER_HTML.format(1)), ('ecs', '<html></html>'), (None, '<html>')]
+        records = list(parse_records(papers, executor='process', max_workers=2))
+        self.assertEqual([x['parser_successful'] for x in records], [True, False, False])
+        self.assertEqual(records[0]['result'], SpringerSoup.parse(SPRINGER_HTML.format(1)))
+        self.assertEqual(records[0]['parser_version'], SpringerSoup.version)
+        self.assertIsNone(records[2]['parser_version'])
+        self.assertTrue(records[2]['parser_error'].startswith('ValueError'))
+
+    def test_precheck(self):
+        papers = [('acs', JATS_ABSTRACT)]
+        record, = parse_records(papers, executor='serial')
+        self.assertEqual(record['result'], ACSSoup.parse(JATS_ABSTRACT))
+        record, = parse_documents([{'html_string': JATS_ABSTRACT, 'publisher': 'acs'}], executor='serial',
+                                  precheck=True)
+        self.assertEqual((record['parser_error_type'], record['parser_error_stage']), ('AbstractOnly', 'precheck'))
+
+    def test_documents(self):
+        # A bad document fails alone, in its slot
+        docs = [{'html_string': SPRINGER_HTML.format(1), 'publisher': 'Springer'}, {'doi': '10.1007/x'},
+                {'html_string': SPRINGER_HTML.format(2), 'publisher': 3}, SPRINGER_HTML.format(3)]
+        records = list(parse_documents(docs, executor='thread', max_workers=2))
+        self.assertEqual([x['parser_successful'] for x in records], [True, False, False, False])
+        self.assertEqual(records[0]['result'], SpringerSoup.parse(SPRINGER_HTML.format(1)))
+        self.assertTrue(records[1]['parser_error'].startswith('ValueError'))
+        self.assertTrue(records[2]['parser_error'].startswith('AttributeError'))
+        self.assertIsNone(records[3]['publisher'])
+
+    def test_detect_publisher(self):
+        self.assertEqual(publisher_of_doi('10.1039/C8TA01234A'), 'rsc')
+        self.assertIsNone(publisher_of_doi('10.0000/synthetic'))
+        self.assertIsNone(publisher_of_doi(None))
+        html = '<meta name="dc.identifier" content="doi:10.1002/adma.1">' + SPRINGER_HTML.format(1)
+        self.assertEqual(detect_publisher(html), 'wiley')
+        self.assertEqual(detect_publisher(html.encode('utf-8')), 'wiley')
+        self.assertIsNone(detect_publisher('<html></html>'))
+
+
+class TestSchedule(unittest.TestCase):
+    def test_cost_model(self):
+        model = CostModel(min_observations=2)
+        self.assertEqual(model.predict(('rsc', 'paper', b'x' * 10)), 10)
+        for size in (1000, 2000, 3000):
+            model.observe('wiley', size, 0.01 + size * 1e-6)
+            model.observe('rsc', size, size * 1e-7)
+        intercept, slope = model.coefficients('wiley')
+        self.assertAlmostEqual(intercept, 0.01)
+        self.assertAlmostEqual(slope, 1e-6)
+        self.assertGreater(model.predict(('wiley', 'a', b'x' * 100)), model.predict(('rsc', 'b', b'x' * 1000)))
+        # Unknown publishers use the fit over all publishers
+        self.assertIsNotNone(model.coefficients('acs'))
+
+    def test_longest_first(self):
+        papers = [('rsc', str(i), b'x' * size) for i, size in enumerate([1, 5, 3, 8, 2])]
+        names = [x[1] for x in iter_longest_first(lambda paper: paper, papers, None, window=3)]
+        self.assertEqual(names, ['1', '2', '0', '3', '4'])
+
+    def test_run_batch(self):
+        papers = [('springer', str(i), SPRINGER_HTML.format(i).encode('utf-8') * (i + 1)) for i in range(5)]
+        for schedule in ('size', 'cost'):
+            records = []
+            model = CostModel()
+            with CallbackSink(records.extend) as sink:
+                stats = run_batch(papers, sink, executor='thread', max_workers=2, schedule=schedule,
+                                  cost_model=model)
+            self.assertEqual(stats['successful'], 5)
+            self.assertEqual(sorted(x['path'] for x in records), ['0', '1', '2', '3', '4'])
+            self.assertEqual(model.sums['springer'][0], 5)
+        with self.assertRaises(ValueError):
+            run_batch(papers, CallbackSink(records.extend), schedule='random')
@@ -0,0 +1,172 @@
+import gzip
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+
+from LimeSoup import ACSSoup, ECSSoup, ElsevierSoup, IOPSoup, NatureSoup, RSCSoup
+from LimeSoup.batch import run_batch
+from LimeSoup.errors import (AbstractOnly, BodyNotFound, LandingPage, LimeSoupError, MalformedMarkup, Paywalled,
+                             UnsupportedTemplate, error_stage)
+from LimeSoup.lime_soup import RuleIngredient, Soup
+from LimeSoup.parser.prechecks import Precheck, Verdict
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.readers import open_binary
+from LimeSoup.sinks import CallbackSink
+from LimeSoup.validate import precheck_of, validate, validate_file
+
+JATS_ABSTRACT = b'<?xml version="1.0"?><article><front><abstract><p>Abstract.</p></abstract></front></article>'
+ELSEVIER_ABSTRACT = (
+    b'<full-text-retrieval-response xmlns:ce="http://www.elsevier.com/xml/common/dtd">'
+    b'<coredata><dc:description>Abstract.</dc:description></coredata></full-text-retrieval-response>')
+PAYWALL = b'<html><body><h1>Title</h1><p>Abstract.</p><a>Purchase this article</a></body></html>'
+
+
+class TestPrechecks(unittest.TestCase):
+    def assertRejects(self, error, soup, raw, stage='precheck'):
+        with self.assertRaises(error) as context:
+            soup.parse(raw, precheck=True)
+        self.assertEqual(error_stage(context.exception), stage)
+
+    def test_not_articles(self):
+        self.assertRejects(AbstractOnly, ACSSoup, JATS_ABSTRACT)
+        self.assertRejects(AbstractOnly, ACSSoup, JATS_ABSTRACT.decode('utf-8'))
+        self.assertRejects(AbstractOnly, ElsevierSoup, ELSEVIER_ABSTRACT)
+        self.assertRejects(LandingPage, IOPSoup, b'<article><front><title>T</title></front></article>')
+        self.assertRejects(Paywalled, NatureSoup, PAYWALL)
+        self.assertRejects(BodyNotFound, NatureSoup, b'<html><body><h1>Journal home</h1></body></html>')
+
+    def test_opt_in(self):
+        # Without the precheck, parse() keeps what the page has
+        result = ACSSoup.parse(JATS_ABSTRACT)
+        self.assertEqual(result['Sections'], [{'type': 'abstract', 'name': 'Abstract', 'content': 'Abstract.'}])
+
+    def test_malformed(self):
+        self.assertRejects(MalformedMarkup, ACSSoup, b'%PDF-1.4\n<< /Type /Catalog >>')
+        self.assertRejects(MalformedMarkup, ACSSoup, b'Service unavailable')
+        self.assertRejects(MalformedMarkup, ACSSoup, b'')
+
+    def test_body_passes(self):
+        check = Precheck(body=['<body'], abstract=['<abstract'])
+        self.assertIsNone(check(b'<article><abstract/><BODY>Purchase this article</BODY></article>'))
+        # Markers cannot be found in UTF-16 without decoding, the ingredients decide
+        self.assertIsNone(check('<article/>'.encode('utf-16')))
+        self.assertIsNone(Precheck()(PAYWALL))
+
+
+class TestErrors(unittest.TestCase):
+    def test_stages(self):
+        # The missing abstract section of ECS was a StopIteration
+        page = b'<html><body><div class="fulltext-view"><h1>Title</h1></div></body></html>'
+        with self.assertRaises(UnsupportedTemplate) as context:
+            ECSSoup.parse(page)
+        self.assertEqual(context.exception.stage, 'ECSCollectAbstract')
+
+        with self.assertRaises(UnsupportedTemplate) as context:
+            RSCSoup.parse('<html><body><p>Text</p></body></html>')
+        self.assertEqual(context.exception.stage, 'RSCCollect')
+        self.assertIsInstance(context.exception, ValueError)
+
+    def test_bugs_are_not_template_errors(self):
+        class Broken(RuleIngredient):
+            @staticmethod
+            def _parse(html_str):
+                return None.find('body')
+
+        soup = Soup(parser_version='0')
+        soup.add_ingredient(Broken())
+        # assertRaises would clear the frames of the traceback
+        try:
+            soup.parse('<html/>')
+        except AttributeError as e:
+            self.assertNotIsInstance(e, LimeSoupError)
+            self.assertEqual(error_stage(e), 'Broken')
+        else:
+            self.fail('AttributeError not raised')
+
+    def test_pickle(self):
+        error = pickle.loads(pickle.dumps(BodyNotFound('Cannot find article body', stage='NatureExtractArticleBody')))
+        self.assertEqual((str(error), error.stage), ('Cannot find article body', 'NatureExtractArticleBody'))
+        self.assertIsInstance(error, LimeSoupError)
+
+    def test_batch_counts(self):
+        papers = [('acs', 'a', JATS_ABSTRACT), ('acs', 'b', JATS_ABSTRACT), ('nature', 'c', PAYWALL),
+                  ('ecs', 'd', b'<html><body><div class="fulltext-view"></div></body></html>')]
+        records = []
+        with CallbackSink(records.extend) as sink:
+            stats = run_batch(papers, sink, executor='serial', validate=True)
+        self.assertEqual(stats['failed'], 4)
+        self.assertEqual(stats['errors'], {
+            'AbstractOnly': {'precheck': 2},
+            'Paywalled': {'precheck': 1},
+            'UnsupportedTemplate': {'ECSCollectAbstract': 1},
+        })
+        record = next(x for x in records if x['path'] == 'a')
+        self.assertEqual((record['parser_error_type'], record['parser_error_stage']), ('AbstractOnly', 'precheck'))
+
+
+    def test_batch_without_validation(self):
+        # Like Soup.parse(), the batch runner parses all the papers it does not validate
+        records = []
+        with CallbackSink(records.extend) as sink:
+            stats = run_batch([('acs', 'a', JATS_ABSTRACT)], sink, executor='serial', validate=False)
+        self.assertEqual((stats['successful'], stats['failed']), (1, 0))
+        self.assertEqual(records[0]['result'], ACSSoup.parse(JATS_ABSTRACT))
+
+
+class TestValidate(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def write(self, name, data):
+        path = os.path.join(self.directory, name)
+        with (gzip.open if name.endswith('.gz') else open)(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def test_verdicts(self):
+        self.assertEqual(validate('acs', JATS_ABSTRACT), Verdict(False, 'abstract_only'))
+        self.assertEqual(validate('nature', PAYWALL), Verdict(False, 'paywall'))
+        self.assertEqual(validate('nature', b'<html><title>404 Page not found</title></html>').reason, 'error_page')
+        self.assertEqual(validate('rsc', PAYWALL), Verdict(True, None))
+        self.assertEqual(validate('rsc', b'%PDF-1.4').reason, 'pdf')
+        # Elsevier HTML pages have no ce:sections
+        self.assertTrue(validate('elsevier', b'<html><body><div><p>Text</p></div></body></html>').ok)
+        self.assertEqual(validate('elsevier', ELSEVIER_ABSTRACT).reason, 'abstract_only')
+
+    def test_streaming(self):
+        article = b'<article><front>' + b' ' * 100000 + b'</front><body><p>Text</p></body></article>'
+        path = self.write('article.xml.gz', article)
+        self.assertTrue(validate_file('acs', path).ok)
+        # A marker cut between two chunks is found
+        self.assertTrue(validate_file('acs', path, chunk_size=100026).ok)
+        with open_binary(self.write('abstract.xml', JATS_ABSTRACT + b' ' * 1000)) as f:
+            self.assertEqual(precheck_of('acs').scan_file(f, chunk_size=64).reason, 'abstract_only')
+        self.assertEqual(validate_file('acs', self.write('empty.xml', b'')).reason, 'not_markup')
+
+    def test_encodings(self):
+        article = '<article><front/><body><p>Text</p></body></article>'
+        path = self.write('article.xml', article.encode('utf-16-le'))
+        # Without its BOM, UTF-16 is only known if declared
+        self.assertFalse(validate_file('acs', path).ok)
+        self.assertTrue(validate_file('acs', path, encoding='utf-16-le').ok)
+        self.assertTrue(validate('acs', JATS_ABSTRACT.decode('ascii').encode('utf-32-be'), 'UTF-32BE').ok)
+        self.assertEqual(validate('acs', JATS_ABSTRACT, 'utf-8').reason, 'abstract_only')
+        records = []
+        with CallbackSink(records.extend) as sink:
+            stats = run_batch([('acs', path)], sink, executor='serial', encoding='utf-16-le', validate=True)
+        self.assertEqual(stats['rejected'], 0)
+
+    def test_batch_skips(self):
+        papers = [('acs', 'a', JATS_ABSTRACT), ('springer', 's', SPRINGER_HTML.format(0).encode('utf-8')),
+                  ('nature', 'c', PAYWALL)]
+        records = []
+        with CallbackSink(records.extend) as sink:
+            stats = run_batch(papers, sink, executor='serial', validate=True)
+        self.assertEqual((stats['documents'], stats['successful'], stats['rejected']), (3, 1, 2))
+        rejected = sorted((x['path'], x['parser_failure'], x['parser_error_type']) for x in records[1:])
+        self.assertEqual(rejected, [('a', 'rejected', 'AbstractOnly'), ('c', 'rejected', 'Paywalled')])
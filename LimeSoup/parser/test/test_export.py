@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from LimeSoup.export import iter_rows, paragraph_table
+from LimeSoup.parser.tools import iter_paragraphs
+from LimeSoup.sinks import open_sink
+
+try:
+    import pyarrow.parquet as pq
+except ImportError:
+    pq = None
+
+RESULT = {
+    'DOI': ['10.1021/x'],
+    'Sections': [
+        'Abstract.',
+        {'type': 'section_h2', 'name': 'Introduction', 'content': [
+            'One.',
+            {'type': 'section_h3', 'name': 'Background', 'content': 'Two.'},
+            'Three.',
+        ]},
+        {'type': 'section_h2', 'name': '', 'content': ['Four.']},
+    ],
+}
+
+
+class TestIterParagraphs(unittest.TestCase):
+    def test_document_order(self):
+        self.assertEqual(list(iter_paragraphs(RESULT['Sections'])), [
+            ((), 'Abstract.'),
+            (('Introduction',), 'One.'),
+            (('Introduction', 'Background'), 'Two.'),
+            (('Introduction',), 'Three.'),
+            (('',), 'Four.'),
+        ])
+
+    def test_rows(self):
+        rows = list(iter_rows(RESULT, 'acs'))
+        self.assertEqual(rows[2], ('10.1021/x', 'acs', 'Background', ('Introduction', 'Background'), 2, 2, 'Two.'))
+        self.assertIsNone(rows[0][2])
+
+
+@unittest.skipIf(pq is None, 'requires pyarrow')
+class TestParquetExport(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_table(self):
+        table = paragraph_table([RESULT, RESULT], publisher='acs')
+        self.assertEqual(table.num_rows, 10)
+        self.assertEqual(table.column('publisher').num_chunks, 1)
+        self.assertEqual(table.column('publisher').chunk(0).dictionary.to_pylist(), ['acs'])
+        self.assertEqual(table.column('section').chunk(0).dictionary.to_pylist(),
+                         ['Introduction', 'Background', ''])
+        self.assertEqual(table.column('section_path').to_pylist()[2], ['Introduction', 'Background'])
+
+    def test_row_groups(self):
+        filename = os.path.join(self.directory, 'paragraphs.parquet')
+        records = [{'publisher': 'acs', 'DOI': '10.1021/%d' % i, 'result': RESULT} for i in range(3)]
+        records.append({'publisher': 'acs', 'DOI': None, 'result': None})
+        with open_sink(filename, row_group_size=4, batch_size=2) as sink:
+            sink.write_many(records)
+        self.assertEqual(sink.rows, 15)
+
+        parquet = pq.ParquetFile(filename)
+        self.assertEqual(parquet.num_row_groups, 4)
+        table = parquet.read()
+        self.assertEqual(table.column('doi').to_pylist()[5], '10.1021/1')
+        self.assertEqual(table.column('depth').to_pylist()[:5], [0, 1, 2, 1, 1])
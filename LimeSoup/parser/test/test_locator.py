@@ -0,0 +1,84 @@
+import unittest
+from unittest import mock
+
+from LimeSoup import AIPSoup, ECSSoup, NatureSoup
+from LimeSoup.parser.locator import ElementLocator
+
+CHROME = '<nav class="menu">' + \
+         ''.join('<a href="/link{0}">Link {0}</a>'.format(i) for i in range(20)) + \
+         '</nav><script>var s = "<div class=\\"fulltext-view\\"><article>";</script>' \
+         '<!-- <div data-article-body="true"> -->'
+
+ECS_HTML = """<html><head><title>ECS</title></head><body>""" + CHROME + """
+<div class="highwire-markup"><div class="fulltext-view">
+<h1>ECS title</h1>
+<ul class="kwd-group"><li class="kwd">battery</li><li class="kwd">anode</li></ul>
+<div class="section abstract"><h2>Abstract</h2><p>The abstract of the paper.</p></div>
+<div class="section"><h2>Introduction</h2><p>Intro <a href="#ref-1">1</a> text.</p>
+<div class="section"><h3>Details</h3><p>Some details.</p></div></div>
+<div class="section"><h2>Acknowledgments</h2><p>Thanks.</p></div>
+</div></div>
+<div class="sidebar">""" + CHROME + """</div></body></html>"""
+
+NATURE_HTML = """<html><head>
+<meta name="citation_doi" content="doi:10.1038/s41586-019-0001-1">
+<meta name="citation_title" content="Nature title">
+<meta name="citation_journal_title" content="Nature">
+<meta name="keywords" content="catalysis"></head><body>""" + CHROME + """
+<article><header><h1>Nature title</h1></header>
+<div class="c-article-body" data-article-body="true">
+<section><h2>Abstract</h2><p>Abstract with <sub>2</sub> text.</p></section>
+<section><h2>Main</h2><p>Main text.</p><h3>Sub</h3><p>Sub text.</p>
+<figure><figcaption>Figure</figcaption></figure></section>
+<section><h2>Acknowledgements</h2><p>Thanks.</p></section>
+</div></article><footer>""" + CHROME + """</footer></body></html>"""
+
+AIP_XML = """<response><meta-info>""" + CHROME + """</meta-info><fulltext><article>
+<abstract><p>The abstract.</p></abstract>
+<body><sec id="s1"><label>I.</label><title>INTRODUCTION</title>
+<p>Intro text<xref ref-type="bibr">1</xref>.</p>
+<sec id="s1A"><title>Sub</title><p>Sub text.</p></sec></sec></body>
+</article></fulltext><other>""" + CHROME + """</other></response>"""
+
+
+class TestElementLocator(unittest.TestCase):
+    def test_skips_comments_and_scripts(self):
+        locator = ElementLocator('div', {'class': 'fulltext-view'})
+        start = ECS_HTML.index('<div class="fulltext-view">')
+        end = ECS_HTML.index('</div></div>\n<div class="sidebar">') + len('</div>')
+        self.assertEqual(locator.extract(ECS_HTML), ECS_HTML[start:end])
+
+    def test_nested_elements(self):
+        locator = ElementLocator('fulltext')
+        self.assertEqual(
+            locator.extract('<a><FullText x="1"><fulltext>a</fulltext><br/></FullText></a>'),
+            '<FullText x="1"><fulltext>a</fulltext><br/></FullText>')
+
+    def test_any_tag_with_attribute(self):
+        locator = ElementLocator(attrs={'data-article-body': 'true'})
+        self.assertEqual(
+            locator.extract('<div data-article-body="false"></div><section data-article-body="true">'
+                            '<section>a</section></section>'),
+            '<section data-article-body="true"><section>a</section></section>')
+
+    def test_bytes(self):
+        locator = ElementLocator('div', {'class': 'fulltext-view'})
+        expected = locator.extract(ECS_HTML).encode('utf-8')
+        for raw in (ECS_HTML.encode('utf-8'), memoryview(ECS_HTML.encode('utf-8'))):
+            self.assertEqual(locator.extract(raw), expected)
+        self.assertEqual(ElementLocator('br').extract(b'<a><br/></a>'), b'<br/>')
+
+    def test_not_found(self):
+        self.assertIsNone(ElementLocator('div', {'class': 'missing'}).extract(ECS_HTML))
+        self.assertIsNone(ElementLocator('div').extract('<div><div></div>'))
+
+
+class TestSelectiveParsing(unittest.TestCase):
+    def test_same_results_as_full_page(self):
+        for soup, paper in [(ECSSoup, ECS_HTML), (NatureSoup, NATURE_HTML), (AIPSoup, AIP_XML)]:
+            selective = soup.parse(paper)
+            with mock.patch.object(ElementLocator, 'extract', return_value=None):
+                full_page = soup.parse(paper)
+            self.assertEqual(selective, full_page)
+            self.assertEqual(soup.parse(paper.encode('utf-8')), full_page)
+            self.assertGreater(len(selective['Sections']), 0)
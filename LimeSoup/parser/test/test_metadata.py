@@ -0,0 +1,151 @@
+import unittest
+
+from LimeSoup import ACSSoup, ElsevierSoup, NatureSoup, WileySoup
+from LimeSoup.lime_soup import Soup
+from LimeSoup.parser.metadata import read_html_meta
+from LimeSoup.parser.test.test_locator import NATURE_HTML
+from LimeSoup.registry import SOUPS
+
+WILEY_HTML = """<html><head>
+<meta name="citation_journal_title" content="Advanced
+    Materials">
+<meta name="citation_doi" content="10.1002/adma.201900001">
+<meta name="citation_title" content="A  Wiley   title">
+<meta name="citation_keywords" content="perovskite">
+<meta name="citation_keywords" content="solar cell">
+</head><body><section class="article-section__full"><p>Text.</p></section></body></html>"""
+
+JATS_XML = """<?xml version="1.0" encoding="UTF-8"?>
+<article><front><journal-meta><journal-title-group>
+<journal-title>Chemistry of Materials</journal-title></journal-title-group></journal-meta>
+<article-meta><article-id pub-id-type="doi">10.1021/cm000001</article-id>
+<title-group><article-title>An <italic>ACS</italic> title</article-title></title-group>
+<kwd-group><kwd>zeolite</kwd></kwd-group></article-meta></front>
+<body><sec><title>Introduction</title><p>Text.</p></sec></body>
+<back><ref-list><ref><article-title>A cited title</article-title></ref></ref-list></back></article>"""
+
+ELSEVIER_XML = """<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd" \
+xmlns:prism="http://prismstandard.org/namespaces/basic/2.0/" xmlns:dc="http://purl.org/dc/elements/1.1/" \
+xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd" xmlns:ce="http://www.elsevier.com/xml/common/dtd" \
+xmlns:ja="http://www.elsevier.com/xml/ja/dtd">
+<coredata><prism:doi>10.1016/j.x.2020.01.001</prism:doi>\
+<prism:publicationName>Journal of Synthesis</prism:publicationName><dc:title>A title</dc:title></coredata>
+<originalText><xocs:doc><xocs:meta><xocs:doi>10.1016/j.x.2020.01.001</xocs:doi>\
+<xocs:srctitle>Journal of Synthesis</xocs:srctitle></xocs:meta>
+<xocs:serial-item><ja:article><ja:head><ce:title>A title with Li<ce:inf>2</ce:inf>O</ce:title>
+<ce:keywords><ce:keyword><ce:text>battery</ce:text></ce:keyword>\
+<ce:keyword><ce:text>cathode</ce:text></ce:keyword></ce:keywords></ja:head>
+<ja:body><ce:sections><ce:section id="s1"><ce:section-title>Introduction</ce:section-title>\
+<ce:para>Intro text.</ce:para></ce:section></ce:sections></ja:body></ja:article>\
+</xocs:serial-item></xocs:doc></originalText></full-text-retrieval-response>"""
+
+
+HTML_HEAD = ('<head><title>A title</title><meta name="citation_doi" content="10.1000/x.1">'
+             '<meta name="citation_title" content="A title">'
+             '<meta name="citation_journal_title" content="A Journal">'
+             '<meta name="citation_keywords" content="battery"></head>')
+
+JATS_PAPER = """<?xml version="1.0" encoding="UTF-8"?>
+<article><front><journal-meta><journal-title-group><journal-title>A Journal</journal-title>
+</journal-title-group></journal-meta><article-meta><article-id pub-id-type="doi">10.1000/x.1</article-id>
+<title-group><article-title>A title</article-title></title-group><kwd-group><kwd>battery</kwd></kwd-group>
+<abstract><p>Abstract text.</p></abstract></article-meta></front>
+<body><sec id="{0}1"><title>1. Introduction</title><p>Intro text.</p></sec></body></article>"""
+
+# A small page of each publisher that its soup parses in full.
+PAPERS = {
+    'acs': JATS_PAPER.format('sec'),
+    'aip': '<response><meta-info><doi>10.1000/x.1</doi></meta-info><fulltext>%s</fulltext></response>'
+           % JATS_PAPER.format('s').split('\n', 1)[1],
+    'aps': JATS_PAPER.format('sec'),
+    'ecs': ('<html>%s<body><div class="highwire-markup"><div class="fulltext-view"><h1>A title</h1>'
+            '<ul class="kwd-group"><li class="kwd">battery</li></ul>'
+            '<div class="section abstract"><h2>Abstract</h2><p>Abstract text.</p></div>'
+            '<div class="section" id="sec-1"><h2>1. Introduction</h2><p>Intro text.</p></div>'
+            '</div></div></body></html>') % HTML_HEAD,
+    'elsevier': ELSEVIER_XML,
+    'iop': JATS_PAPER.format('s'),
+    'nature': NATURE_HTML,
+    'rsc': ('<html>%s<body><h1 class="article__title">A title</h1><div id="wrapper">'
+            '<p class="abstract">Abstract text.</p><div id="pnlArticleContent">'
+            '<h2><span class="a_heading">1. Introduction</span></h2><p>Intro text.</p></div></div>'
+            '</body></html>') % HTML_HEAD,
+    'springer': ('<html>%s<body><span class="JournalTitle">A Journal</span><h1 class="ArticleTitle">A title</h1>'
+                 '<div class="KeywordGroup"><span class="Keyword">battery</span></div>'
+                 '<section id="Sec1"><h2 class="Heading">1. Introduction</h2><div class="Para">Intro text.</div>'
+                 '</section></body></html>') % HTML_HEAD,
+    'wiley': ('<html>%s<body><article><h1 class="citation__title">A title</h1>'
+              '<section class="article-section article-section__full"><section class="article-section__content">'
+              '<h2 class="article-section__title">1. Introduction</h2><p>Intro text.</p></section></section>'
+              '</article></body></html>') % HTML_HEAD,
+}
+
+
+class TestParseMetadata(unittest.TestCase):
+    def assertSameMetadata(self, metadata, parsed, msg=None):
+        """
+        The metadata has the types of the parse result, and its values where
+        the full parser found one.
+        """
+        for key in ('DOI', 'Title', 'Journal', 'Keywords'):
+            if key not in parsed:
+                continue
+            label = '%s %s' % (msg, key) if msg else key
+            if parsed[key] is not None and metadata[key] is not None:
+                self.assertIs(type(metadata[key]), type(parsed[key]), label)
+            if parsed[key]:
+                self.assertEqual(metadata[key], parsed[key], label)
+
+    def test_same_as_parse(self):
+        self.assertEqual(sorted(PAPERS), sorted(SOUPS))
+        for publisher, soup in SOUPS.items():
+            raw = PAPERS[publisher]
+            self.assertSameMetadata(soup.parse_metadata(raw), soup.parse(raw), publisher)
+
+    def test_nature(self):
+        metadata = NatureSoup.parse_metadata(NATURE_HTML)
+        self.assertSameMetadata(metadata, NatureSoup.parse(NATURE_HTML))
+        self.assertEqual(metadata['DOI'], '10.1038/s41586-019-0001-1')
+
+    def test_wiley(self):
+        self.assertEqual(WileySoup.parse_metadata(WILEY_HTML), {
+            'DOI': '10.1002/adma.201900001',
+            'Title': 'A Wiley title',
+            'Keywords': ['perovskite', 'solar cell'],
+            'Journal': 'Advanced Materials',
+        })
+        self.assertEqual(WileySoup.parse_metadata('<html><head><title>Wiley</title></head></html>'), {
+            'DOI': None,
+            'Title': None,
+            'Keywords': [],
+            'Journal': None,
+        })
+
+    def test_elsevier_xml(self):
+        metadata = ElsevierSoup.parse_metadata(ELSEVIER_XML)
+        self.assertSameMetadata(metadata, ElsevierSoup.parse(ELSEVIER_XML))
+        self.assertEqual(metadata['Title'], 'A title with Li2O')
+
+    def test_jats(self):
+        metadata = ACSSoup.parse_metadata(JATS_XML)
+        self.assertEqual(metadata, {
+            'DOI': ['10.1021/cm000001'],
+            'Title': 'An ACS title',
+            'Journal': 'Chemistry of Materials',
+            'Keywords': ['zeolite'],
+        })
+        self.assertSameMetadata(metadata, ACSSoup.parse(JATS_XML))
+
+    def test_stops_at_end_of_head(self):
+        metas = read_html_meta(
+            '<html><head><meta name="a" content="1"></head>'
+            '<body><meta name="a" content="2"></body></html>')
+        self.assertEqual(metas, {'a': ['1']})
+
+    def test_no_metadata_ingredient(self):
+        with self.assertRaises(ValueError):
+            Soup(parser_version='0').parse_metadata('<html></html>')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,75 @@
+import ast
+import os
+import re
+import unittest
+
+import LimeSoup
+from LimeSoup.parser import patterns
+from LimeSoup.parser.parser_paper_springer import ParserPaper
+
+PACKAGE = os.path.dirname(LimeSoup.__file__)
+
+# Functions of re taking the pattern as first argument
+RE_FUNCTIONS = {'compile', 'sub', 'subn', 'match', 'search', 'fullmatch', 'findall', 'finditer', 'split'}
+
+# Functions compiling patterns built at run time, which keep what they compile
+COMPILERS = {
+    ('parser/patterns.py', 'compiled'),
+    ('parser/locator.py', '_compile'),
+    ('parser/prechecks.py', '_patterns'),
+}
+
+
+def iter_modules():
+    for root, dirs, files in os.walk(PACKAGE):
+        dirs[:] = sorted(x for x in dirs if x not in ('test', '__pycache__'))
+        for name in sorted(files):
+            if name.endswith('.py'):
+                path = os.path.join(root, name)
+                yield os.path.relpath(path, PACKAGE).replace(os.sep, '/'), path
+
+
+def compiles_per_call(function, may_compile=False):
+    """
+    :param may_compile: whether the function may compile patterns built at
+        run time, see COMPILERS.
+    :return: (line, call) of the calls of a function compiling or matching a
+        pattern on every call.
+    """
+    for node in ast.walk(function):
+        if not isinstance(node, ast.Call) or not isinstance(node.func, ast.Attribute) or not node.args:
+            continue
+        module = node.func.value.id if isinstance(node.func.value, ast.Name) else None
+        literal = isinstance(node.args[0], (ast.Constant, ast.JoinedStr))
+        if module in ('re', 'regex'):
+            if node.func.attr in RE_FUNCTIONS and literal:
+                yield node.lineno, '%s.%s' % (module, node.func.attr)
+            elif node.func.attr == 'compile' and not may_compile:
+                yield node.lineno, '%s.compile of a run-time pattern' % module
+        elif node.func.attr == 'compile' and literal:
+            # e.g. parser.compile('...') of the ParserPaper classes
+            yield node.lineno, '.compile'
+
+
+class TestPatterns(unittest.TestCase):
+    def test_no_patterns_compiled_per_call(self):
+        found = []
+        for module, path in iter_modules():
+            with open(path, encoding='utf-8') as f:
+                tree = ast.parse(f.read(), path)
+            for function in ast.walk(tree):
+                if not isinstance(function, (ast.FunctionDef, ast.AsyncFunctionDef)):
+                    continue
+                may_compile = (module, function.name) in COMPILERS
+                found.extend('%s:%d %s' % (module, line, call)
+                             for line, call in compiles_per_call(function, may_compile))
+        # Nested functions are walked with their enclosing function too
+        found = sorted(set(found))
+        self.assertEqual(found, [], 'Compile patterns once, in LimeSoup.parser.patterns or as module constants')
+
+    def test_compiled(self):
+        self.assertIs(patterns.compiled('^h[1-6]$'), patterns.compiled('^h[1-6]$'))
+        self.assertIsNot(patterns.compiled('a'), patterns.compiled('a', re.IGNORECASE))
+        self.assertIs(ParserPaper.compile('First published on'), patterns.compiled('First published on'))
+        for name in patterns.__all__[:-1]:
+            self.assertIsInstance(getattr(patterns, name), re.Pattern, name)
@@ -0,0 +1,93 @@
+import gc
+import os
+import time
+import unittest
+from unittest import mock
+
+from LimeSoup import SpringerSoup
+from LimeSoup.lime_soup import RuleIngredient, Soup
+from LimeSoup.batch import parse_records
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.pool import (
+    DocumentMemoryExceeded, DocumentTimeout, LimitedProcessPool, WorkerDied, process_rss)
+
+
+def run(task):
+    if task == 'sleep':
+        time.sleep(30)
+    elif task == 'memory':
+        data = bytearray(512 * 1024 * 1024)
+        time.sleep(30)
+        return len(data)
+    elif task == 'exit':
+        os._exit(3)
+    elif task == 'raise':
+        raise KeyError(task)
+    elif task == 'frozen':
+        return gc.get_freeze_count()
+    return task, os.getpid()
+
+
+class Sleep(RuleIngredient):
+    @staticmethod
+    def _parse(html_str):
+        if html_str == 'sleep':
+            time.sleep(30)
+        return html_str
+
+
+SLEEPY_SOUP = Soup(parser_version='0')
+SLEEPY_SOUP.add_ingredient(Sleep())
+
+
+@unittest.skipIf(process_rss() is None, 'cannot read the memory of processes')
+class TestLimitedProcessPool(unittest.TestCase):
+    def test_limits(self):
+        start = time.time()
+        with LimitedProcessPool(2, timeout=1, max_rss=256 * 1024 * 1024) as pool:
+            futures = [pool.submit(run, x) for x in (1, 'sleep', 'memory', 'exit', 'raise', 2)]
+            self.assertEqual(futures[0].result()[0], 1)
+            self.assertRaises(DocumentTimeout, futures[1].result)
+            self.assertRaises(DocumentMemoryExceeded, futures[2].result)
+            self.assertRaises(WorkerDied, futures[3].result)
+            self.assertRaises(KeyError, futures[4].result)
+            self.assertEqual(futures[5].result()[0], 2)
+            # Workers were replaced
+            self.assertEqual([x[0] for x in pool.map(run, range(4))], [0, 1, 2, 3])
+        self.assertLess(time.time() - start, 20)
+
+    def test_recycling(self):
+        with LimitedProcessPool(1, max_tasks_per_worker=2) as pool:
+            pids = [pid for _, pid in pool.map(run, range(5))]
+            self.assertGreater(pool.submit(run, 'frozen').result(), 0)
+        stats = pool.stats()
+        self.assertEqual(len(set(pids)), 3)
+        self.assertEqual(pids[0], pids[1])
+        self.assertEqual((stats['tasks'], stats['workers_recycled'], stats['workers_started']), (6, 3, 4))
+        self.assertGreater(stats['max_rss'], 0)
+        self.assertGreaterEqual(stats['gc_pause'], stats['gc_max_pause'])
+
+    def test_failed_records(self):
+        # Forked workers inherit the patch: the paper 'sleep' hangs.
+        parse = SpringerSoup.parse
+
+        def slow_parse(html_str, encoding=None, precheck=False):
+            if html_str == 'sleep':
+                time.sleep(30)
+            return parse(html_str, encoding, precheck)
+
+        papers = [('springer', SPRINGER_HTML.format(1)), ('springer', 'sleep'), ('springer', '<html>')]
+        with mock.patch.object(SpringerSoup, 'parse', side_effect=slow_parse):
+            records = list(parse_records(papers, executor='process', max_workers=2, timeout=1))
+        results = list(SLEEPY_SOUP.parse_many(['sleep', 'awake'], executor='process', timeout=1,
+                                              return_exceptions=True))
+        self.assertEqual(records[0]['result'], parse(SPRINGER_HTML.format(1)))
+        self.assertEqual([x['parser_failure'] for x in records], [None, 'timeout', None])
+        self.assertTrue(records[1]['parser_error'].startswith('DocumentTimeout'))
+        self.assertEqual(records[1]['parser_version'], SpringerSoup.version)
+        self.assertIsInstance(results[0], DocumentTimeout)
+        self.assertEqual(results[1], 'awake')
+
+    def test_process_executor_only(self):
+        with self.assertRaises(ValueError):
+            list(parse_records([('springer', '')], executor='thread', timeout=1))
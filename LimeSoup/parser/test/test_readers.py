@@ -0,0 +1,116 @@
+import gzip
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+from unittest import mock
+
+from LimeSoup import ElsevierSoup, SpringerSoup
+from LimeSoup.batch import iter_papers, parse_file
+from LimeSoup.parser.encoding import sniff_encoding, to_text, xml_declaration_end
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.readers import iter_inputs, open_paper
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+ELSEVIER_XML = """<?xml version="1.0" encoding="ISO-8859-1"?>
+<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd"
+ xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd" xmlns:ce="http://www.elsevier.com/xml/common/dtd"
+ xmlns:ja="http://www.elsevier.com/xml/ja/dtd" xmlns:dc="http://purl.org/dc/elements/1.1/">
+<coredata><dc:title>Caf\xe9 &alpha;</dc:title></coredata>
+<originalText><xocs:doc><xocs:serial-item><ja:article><ja:body><ce:sections>
+<ce:section><ce:section-title>Intro</ce:section-title><ce:para>Na&minus;\xe9</ce:para></ce:section>
+</ce:sections></ja:body></ja:article></xocs:serial-item></xocs:doc></originalText>
+</full-text-retrieval-response>"""
+
+
+class TestEncoding(unittest.TestCase):
+    def test_sniff(self):
+        self.assertEqual(sniff_encoding(b'\xef\xbb\xbf<html>'), 'utf-8-sig')
+        self.assertEqual(sniff_encoding(ELSEVIER_XML.encode('latin-1')), 'iso8859-1')
+        self.assertEqual(sniff_encoding(b'<html><head><meta charset="windows-1252">'), 'cp1252')
+        self.assertEqual(sniff_encoding(b'<html><meta charset="nonsense">'), 'utf-8')
+        self.assertEqual(to_text(memoryview('é'.encode('utf-8'))), 'é')
+        self.assertEqual(xml_declaration_end(ELSEVIER_XML), ELSEVIER_XML.index('\n'))
+
+    def test_parse_bytes(self):
+        html = SPRINGER_HTML.format(1).replace('Title 1', 'Titlé 1')
+        expected = SpringerSoup.parse(html)
+        self.assertEqual(SpringerSoup.parse(html.encode('utf-8')), expected)
+        self.assertEqual(SpringerSoup.parse(memoryview(html.encode('utf-8'))), expected)
+        self.assertEqual(SpringerSoup.parse(html.encode('cp1252'), encoding='cp1252'), expected)
+
+    def test_declared_encoding(self):
+        html = SPRINGER_HTML.format(1).replace('Title 1', 'Titlé 1').encode('utf-8')
+        with mock.patch('LimeSoup.lime_soup.to_text', wraps=to_text) as decode:
+            SpringerSoup.parse(html, encoding='UTF8')
+            self.assertFalse(decode.called)
+            SpringerSoup.parse(html, encoding='latin-1')
+            self.assertTrue(decode.called)
+
+    def test_elsevier_bytes(self):
+        result = ElsevierSoup.parse(ELSEVIER_XML.encode('latin-1'))
+        self.assertEqual(result, ElsevierSoup.parse(ELSEVIER_XML.split('\n', 1)[1]))
+        self.assertEqual(result['Sections'][0]['content'], ['Na−\xe9'])
+        self.assertEqual(ElsevierSoup.parse_metadata(ELSEVIER_XML.encode('latin-1'))['Title'], 'Caf\xe9 α')
+
+
+class TestReaders(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.papers = [SPRINGER_HTML.format(i).encode('utf-8') for i in range(3)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def path(self, name):
+        return os.path.join(self.directory, name)
+
+    def test_single_files(self):
+        with open(self.path('paper.html'), 'wb') as f:
+            f.write(self.papers[0])
+        with gzip.open(self.path('paper.html.gz'), 'wb') as f:
+            f.write(self.papers[0])
+        for name in ('paper.html', 'paper.html.gz'):
+            with open_paper(self.path(name)) as data:
+                self.assertEqual(data[:], self.papers[0])
+            papers = [(x.name, x.data[:]) for x in iter_inputs(self.path(name))]
+            self.assertEqual(papers, [(self.path(name), self.papers[0])])
+
+    def test_jsonl(self):
+        lines = b''.join(json.dumps({'doi': '10.1/%d' % i, 'publisher': 'springer',
+                                     'html': x.decode('utf-8')}).encode('utf-8') + b'\n'
+                         for i, x in enumerate(self.papers))
+        names = ['shard.jsonl', 'shard.jsonl.gz']
+        with open(self.path('shard.jsonl'), 'wb') as f:
+            f.write(lines)
+        with gzip.open(self.path('shard.jsonl.gz'), 'wb') as f:
+            f.write(lines)
+        if zstandard is not None:
+            names.append('shard.jsonl.zst')
+            with open(self.path('shard.jsonl.zst'), 'wb') as f:
+                f.write(zstandard.ZstdCompressor().compress(lines))
+        for name in names:
+            papers = list(iter_inputs(self.path(name)))
+            self.assertEqual([x.name for x in papers], ['10.1/0', '10.1/1', '10.1/2'], name)
+            self.assertEqual(papers[2].data, self.papers[2].decode('utf-8'), name)
+            self.assertEqual(papers[2].publisher, 'springer')
+
+    def test_tar_batch(self):
+        with tarfile.open(self.path('papers.tar.gz'), 'w:gz') as tar:
+            for i, paper in enumerate(self.papers):
+                member = tarfile.TarInfo('springer/%d.html' % i)
+                member.size = len(paper)
+                tar.addfile(member, io.BytesIO(paper))
+
+        papers = list(iter_papers([self.path('papers.tar.gz')]))
+        self.assertEqual([x[:2] for x in papers],
+                         [('springer', self.path('papers.tar.gz') + '/springer/%d.html' % i) for i in range(3)])
+        record = parse_file(papers[1])
+        self.assertEqual(record['result'], SpringerSoup.parse(SPRINGER_HTML.format(1)))
@@ -0,0 +1,52 @@
+import json
+import pickle
+import unittest
+
+from LimeSoup import SpringerSoup
+from LimeSoup.export import iter_rows
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.parser.tools import document_stats
+from LimeSoup.result import Document, Section
+
+RESULT = {
+    'Title': 'Title',
+    'DOI': ['10.1021/x'],
+    'Keywords': ['one'],
+    'Sections': [
+        'Loose paragraph.',
+        {'type': 'section_h2', 'name': 'Introduction', 'content': [
+            'One.',
+            {'name': 'Background', 'type': 'section_h3', 'content': 'Two.'},
+            {'type': 'lost_content', 'name': None, 'content': [], 'level': 3},
+        ]},
+    ],
+    'References': [{'title': 'Ref', 'authors': ['A', 'B']}],
+}
+
+
+class TestDocument(unittest.TestCase):
+    def test_round_trip(self):
+        document = Document.from_dict(RESULT)
+        self.assertEqual(document.to_dict(), RESULT)
+        self.assertEqual(document.to_json(), json.dumps(RESULT))
+        self.assertEqual(list(document.to_dict()['Sections'][1]['content'][1]), ['name', 'type', 'content'])
+
+        parsed = SpringerSoup.parse(SPRINGER_HTML.format(1))
+        self.assertEqual(Document.from_dict(parsed).to_dict(), parsed)
+
+    def test_compact(self):
+        document = Document.from_dict(RESULT)
+        section = document.sections[1]
+        self.assertIsInstance(section, Section)
+        self.assertIsInstance(section.content, tuple)
+        self.assertEqual(section.content[2].extra, (('level', 3),))
+        self.assertEqual(document['DOI'], ('10.1021/x',))
+        self.assertIs(Document.from_dict(dict(RESULT)).sections[1].type, section.type)
+
+    def test_mapping_and_pickle(self):
+        document = Document.from_dict(RESULT)
+        self.assertIn('Title', document)
+        self.assertIsNone(document.get('Journal'))
+        self.assertEqual(pickle.loads(pickle.dumps(document)), document)
+        self.assertEqual(document_stats(document), document_stats(RESULT))
+        self.assertEqual(list(iter_rows(document)), list(iter_rows(RESULT)))
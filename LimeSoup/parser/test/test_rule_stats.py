@@ -0,0 +1,101 @@
+import unittest
+import warnings
+
+from bs4 import BeautifulSoup
+
+from LimeSoup import SpringerSoup
+from LimeSoup.parser import rule_stats
+from LimeSoup.parser.parser_paper import ParserPaper
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+
+ARTICLE = '<html><head><title>{0}</title><meta name="citation_title" content="{0}">{1}</head>' \
+          '<body><div class="nav">Menu</div><article><h1>{0}</h1>{2}</article></body></html>'
+
+
+def article(i):
+    # The same template, with different metadata and lengths
+    authors = ''.join('<meta name="citation_author" content="Author %d">' % j for j in range(i + 1))
+    paragraphs = ''.join('<section><h2>Section %d</h2><p>Text.</p></section>' % j for j in range(i + 1))
+    return ARTICLE.format('Article %d' % i, authors, paragraphs)
+
+
+PAGE = '<html><body><div class="nav">Menu</div><p>Text <span>x</span></p></body></html>'
+RULES = [{'name': 'footer'}, {'name': 'div', 'class': 'nav'}]
+
+
+class TestRuleStats(unittest.TestCase):
+    def tearDown(self):
+        rule_stats.disable()
+
+    def remove_trash(self, page=PAGE):
+        parser = ParserPaper(page, parser_type='html.parser')
+        with rule_stats.stage('RemoveTrash'):
+            parser.remove_tags(rules=RULES)
+        return parser.raw_html
+
+    def test_disabled_by_default(self):
+        self.assertIsNone(rule_stats.active())
+        self.assertNotIn('Menu', self.remove_trash())
+
+    def test_counts_hits_per_stage(self):
+        stats = rule_stats.enable()
+        for _ in range(3):
+            self.remove_trash()
+        self.assertEqual(stats.dead_rules(), [('RemoveTrash', "name='footer'")])
+        self.assertEqual(stats.report()[-1], {
+            'stage': 'RemoveTrash', 'rule': "class='nav', name='div'",
+            'scans': 3, 'hits': 3, 'matches': 3,
+        })
+
+    def test_soup_ingredients_are_stages(self):
+        stats = rule_stats.enable()
+        SpringerSoup.parse(SPRINGER_HTML.format(0))
+        stages = {x['stage'] for x in stats.report()}
+        self.assertIn('SpringerRemoveTrash', stages)
+        self.assertIn('SpringerRemoveTagsSmallSub', stages)
+        self.assertGreater(len(stats.dead_rules()), 0)
+
+    def test_prune_and_full_check(self):
+        stats = rule_stats.enable(prune=True, warmup=2, full_check_every=5)
+        for _ in range(10):
+            self.remove_trash()
+        footer = ('RemoveTrash', "name='footer'")
+        # 2 warm-up documents, then a full check every 5 documents
+        self.assertEqual(stats.scans[footer], 3)
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            for _ in range(5):
+                self.remove_trash(PAGE.replace('</body>', '<footer>Footer</footer></body>'))
+        # The template changed, so all rules run again
+        self.assertEqual(stats.hits[footer], 5)
+        self.assertEqual(len(caught), 0)
+
+    def test_template_ignores_metadata(self):
+        fingerprints = {rule_stats.template_fingerprint(BeautifulSoup(article(i), 'html.parser')) for i in range(5)}
+        self.assertEqual(len(fingerprints), 1)
+        self.assertNotEqual(fingerprints.pop(), rule_stats.template_fingerprint(BeautifulSoup(PAGE, 'html.parser')))
+
+        stats = rule_stats.enable(prune=True, warmup=2, full_check_every=100)
+        for i in range(10):
+            self.remove_trash(article(i))
+        # Skipped after the warm-up on all the articles
+        self.assertEqual(stats.scans['RemoveTrash', "name='footer'"], 2)
+        self.assertEqual(stats.hits['RemoveTrash', "class='nav', name='div'"], 10)
+
+    def test_warns_when_skipped_rule_matches(self):
+        stats = rule_stats.enable(prune=True, warmup=1, full_check_every=3)
+        fingerprint = rule_stats.template_fingerprint(BeautifulSoup(PAGE, 'html.parser'))
+        key = "name='footer'"
+        self.assertTrue(stats.should_scan('RemoveTrash', fingerprint, key))
+        stats.record('RemoveTrash', fingerprint, key, 0)
+        self.assertFalse(stats.should_scan('RemoveTrash', fingerprint, key))
+        self.assertFalse(stats.should_scan('RemoveTrash', fingerprint, key))
+        self.assertTrue(stats.should_scan('RemoveTrash', fingerprint, key))
+        with self.assertWarns(rule_stats.RuleRevivedWarning):
+            stats.record('RemoveTrash', fingerprint, key, 1)
+        self.assertTrue(stats.should_scan('RemoveTrash', fingerprint, key))
+
+
+if __name__ == '__main__':
+    unittest.main()
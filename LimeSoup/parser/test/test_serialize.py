@@ -0,0 +1,50 @@
+import io
+import json
+import unittest
+from unittest import mock
+
+from LimeSoup import SpringerSoup, serialize
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.result import Document
+
+RESULT = {
+    'Title': 'Li₂O – "quoted" \\ é',
+    'DOI': None,
+    'Keywords': ['b', 'a'],
+    'Sections': [{'type': 'section_h2', 'name': 'Intro', 'content': ['One.\n', 'Two .']}],
+    'Count': 3,
+    'Valid': True,
+}
+
+
+class TestSerialize(unittest.TestCase):
+    def backends(self):
+        yield 'json', mock.patch.object(serialize, 'orjson', None)
+        if serialize.orjson is not None:
+            yield 'orjson', mock.patch.object(serialize, 'orjson', serialize.orjson)
+
+    def test_canonical(self):
+        expected = json.dumps(RESULT, sort_keys=True, ensure_ascii=False,
+                              separators=(',', ':')).encode('utf-8')
+        for name, patch in self.backends():
+            with patch:
+                self.assertEqual(serialize.backend(), name)
+                self.assertEqual(serialize.dumps(RESULT), expected, name)
+                self.assertEqual(serialize.loads(serialize.dumps(RESULT)), RESULT, name)
+
+                f = io.BytesIO()
+                serialize.dump(RESULT, f)
+                self.assertFalse(f.closed)
+                self.assertEqual(f.getvalue(), expected, name)
+
+    def test_documents(self):
+        for name, patch in self.backends():
+            with patch:
+                document = Document.from_dict(RESULT)
+                self.assertEqual(document.dumps(), serialize.dumps(RESULT), name)
+                self.assertEqual(serialize.dumps({'result': document}),
+                                 serialize.dumps({'result': RESULT}), name)
+
+    def test_parse_to_json(self):
+        html = SPRINGER_HTML.format(1)
+        self.assertEqual(serialize.loads(SpringerSoup.parse_to_json(html)), SpringerSoup.parse(html))
@@ -0,0 +1,103 @@
+import concurrent.futures
+import http.client
+import json
+import threading
+import unittest
+
+from LimeSoup import ACSSoup, SpringerSoup
+from LimeSoup.parser.test.test_errors import JATS_ABSTRACT
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.serve import ParsePool, ParseServer
+
+
+class TestParseServer(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.pool = ParsePool(workers=2, queue_size=3)
+        cls.server = ParseServer(('127.0.0.1', 0), cls.pool)
+        cls.thread = threading.Thread(target=cls.server.serve_forever)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+        cls.thread.join()
+        cls.pool.shutdown()
+
+    def setUp(self):
+        self.connection = http.client.HTTPConnection('127.0.0.1', self.server.server_port)
+
+    def tearDown(self):
+        self.connection.close()
+
+    def request(self, method, path, body=None, headers=None):
+        self.connection.request(method, path, body, headers or {})
+        response = self.connection.getresponse()
+        return response.status, json.loads(response.read())
+
+    def test_single_and_batch(self):
+        # All on one kept-alive connection
+        html = SPRINGER_HTML.format(1)
+        status, record = self.request('POST', '/parse/springer', html.encode('utf-8'),
+                                      {'Content-Type': 'text/html'})
+        self.assertEqual(status, 200)
+        self.assertEqual(record['result'], SpringerSoup.parse(html))
+
+        documents = [SPRINGER_HTML.format(2), {'html_string': html, 'doi': '10.1007/x'}]
+        status, records = self.request('POST', '/parse', json.dumps({'documents': documents}),
+                                       {'Content-Type': 'application/json'})
+        self.assertEqual(status, 200)
+        self.assertEqual([x['publisher'] for x in records], [None, 'springer'])
+        self.assertEqual([x['parser_successful'] for x in records], [False, True])
+
+        status, health = self.request('GET', '/health')
+        self.assertEqual((status, health['workers'], health['queued']), (200, 2, 0))
+        self.assertGreaterEqual(health['metrics']['tasks'], 3)
+
+    def test_precheck(self):
+        # Off by default, as in Soup.parse()
+        status, record = self.request('POST', '/parse/acs', JATS_ABSTRACT, {'Content-Type': 'text/xml'})
+        self.assertEqual((status, record['parser_successful']), (200, True))
+        self.assertEqual(record['result'], ACSSoup.parse(JATS_ABSTRACT))
+        status, record = self.request('POST', '/parse/acs?precheck=1', JATS_ABSTRACT, {'Content-Type': 'text/xml'})
+        self.assertEqual((status, record['parser_error_type']), (200, 'AbstractOnly'))
+
+    def test_errors(self):
+        self.assertEqual(self.request('POST', '/parse/nobody', b'x')[0], 404)
+        self.assertEqual(self.request('POST', '/parse', b'{', {'Content-Type': 'application/json'})[0], 400)
+
+        # More documents than the queue holds, even when idle
+        status, error = self.request('POST', '/parse/springer', json.dumps(['x'] * 4),
+                                     {'Content-Type': 'application/json'})
+        self.assertEqual(status, 413)
+        self.assertIn('split', error['error'])
+
+    def test_bad_content_length(self):
+        for length in ('many', '-1'):
+            self.connection.putrequest('POST', '/parse/springer')
+            self.connection.putheader('Content-Length', length)
+            self.connection.endheaders()
+            response = self.connection.getresponse()
+            error = json.loads(response.read())
+            self.assertEqual(response.status, 400)
+            self.assertIn('Content-Length', error['error'])
+            self.connection.close()
+
+    def test_worker_error(self):
+        future = concurrent.futures.Future()
+        future.set_exception(RuntimeError('PicklingError: cannot pickle'))
+        record = json.loads(ParsePool._result(future, 'springer'))
+        self.assertEqual((record['parser_successful'], record['parser_failure']), (False, 'error'))
+        self.assertEqual(record['parser_error'], 'RuntimeError: PicklingError: cannot pickle')
+
+    def test_queue_full(self):
+        self.assertTrue(self.pool.queue.acquire(3))
+        try:
+            self.connection.request('POST', '/parse/springer', b'x', {'Content-Type': 'text/html'})
+            response = self.connection.getresponse()
+            error = json.loads(response.read())
+        finally:
+            self.pool.queue.release(3)
+        self.assertEqual((response.status, response.getheader('Retry-After')), (503, '1'))
+        self.assertIn('retry', error['error'])
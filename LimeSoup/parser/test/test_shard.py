@@ -0,0 +1,132 @@
+import io
+import json
+import os
+import shutil
+import tarfile
+import tempfile
+import unittest
+
+from LimeSoup import SpringerSoup
+from LimeSoup.batch import iter_papers, run_batch
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.shard import Manifest, manifest_filename, merge, paper_key, parse_shard, select_shard, shard_of
+from LimeSoup.sinks import CallbackSink, JSONLSink
+
+
+class TestShard(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.papers = [('springer', '10.1007/%d' % i, SPRINGER_HTML.format(i).encode('utf-8'))
+                       for i in range(12)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('1/4'), (1, 4))
+        self.assertIsNone(parse_shard(None))
+        for spec in ('4/4', '1', 'a/b'):
+            self.assertRaises(ValueError, parse_shard, spec)
+
+    def test_stable_partition(self):
+        # Must never change: reruns of a shard parse the same papers.
+        self.assertEqual(shard_of('10.1039/c8ta01234a', 4), 3)
+        self.assertEqual(shard_of('corpus/rsc/a.html', 7), 0)
+        shards = [list(select_shard(self.papers, (i, 3), key=lambda x: x[1])) for i in range(3)]
+        self.assertEqual(sorted(x for shard in shards for x in shard), sorted(self.papers))
+
+    def test_parse_many(self):
+        html_strs = [x[2] for x in self.papers]
+        results = [list(SpringerSoup.parse_many(html_strs, executor='serial', shard=(i, 2))) for i in range(2)]
+        self.assertEqual(len(results[0]) + len(results[1]), len(html_strs))
+
+    def run_shard(self, shard):
+        output = os.path.join(self.directory, 'shard-%d.jsonl' % shard[0])
+        manifest = Manifest(shard)
+        with JSONLSink(output) as sink:
+            run_batch(self.papers, sink, executor='serial', shard=shard, manifest=manifest)
+        manifest.write(manifest_filename(output))
+        return output
+
+    def test_merge(self):
+        outputs = [self.run_shard((i, 3)) for i in range(3)]
+        self.assertEqual(Manifest.read(manifest_filename(outputs[0]))['parser_versions'],
+                         {'springer': [SpringerSoup.version]})
+        records = []
+        report = merge(outputs, CallbackSink(records.extend, batch_size=1))
+        self.assertEqual(report['problems'], {})
+        self.assertEqual(sorted(x['path'] for x in records), sorted(x[1] for x in self.papers))
+
+        report = merge([outputs[0], outputs[1], outputs[1]], CallbackSink(records.extend))
+        self.assertEqual(sorted(report['problems']), ['duplicated', 'shards'])
+        self.assertIn('shard 2/3 is missing', report['problems']['shards'])
+
+    def make_corpus(self, root, archives=False):
+        os.makedirs(os.path.join(root, 'springer'))
+        for _, name, data in self.papers:
+            with open(os.path.join(root, 'springer', name.replace('/', '_') + '.html'), 'wb') as f:
+                f.write(data)
+        if not archives:
+            return
+        with tarfile.open(os.path.join(root, 'a.tar'), 'w') as tar:
+            for _, name, data in self.papers:
+                member = tarfile.TarInfo('springer/%s.html' % name.replace('/', '_'))
+                member.size = len(data)
+                tar.addfile(member, io.BytesIO(data))
+        # Without DOI, the papers are named by their line
+        with open(os.path.join(root, 'papers.jsonl'), 'w') as f:
+            for _, _, data in self.papers:
+                f.write(json.dumps({'html': data.decode('utf-8')}) + '\n')
+
+    def test_relative_keys(self):
+        # The same corpus, mounted at two places, or given as relative and absolute paths
+        roots = [os.path.join(self.directory, x, 'corpus') for x in ('node0', 'node1')]
+        for root in roots:
+            self.make_corpus(root)
+        inputs = [[os.path.relpath(roots[0]) + os.sep], [roots[1]]]
+        keys = [sorted(paper_key(x, paths) for x in iter_papers(paths, 'springer')) for paths in inputs]
+        self.assertEqual(keys[0], keys[1])
+        self.assertIn('springer/10.1007_0.html', keys[0])
+        self.assertEqual(paper_key(('springer', os.path.join(roots[1], 'springer', 'a.html')),
+                                   [os.path.join(roots[1], 'springer', 'a.html')]), 'a.html')
+
+        outputs = []
+        for i, paths in enumerate(inputs):
+            outputs.append(os.path.join(self.directory, 'shard-%d.jsonl' % i))
+            manifest = Manifest((i, 2), paths)
+            with JSONLSink(outputs[-1]) as sink:
+                run_batch(iter_papers(paths, 'springer'), sink, executor='serial', shard=(i, 2),
+                          manifest=manifest, inputs=paths)
+            manifest.write(manifest_filename(outputs[-1]))
+        records = []
+        report = merge(outputs, CallbackSink(records.extend, batch_size=1), inputs=inputs[0], publisher='springer')
+        self.assertEqual(report['problems'], {})
+        self.assertEqual(sorted(x['key'] for x in records), keys[0])
+
+    def test_archive_keys(self):
+        roots = [os.path.join(self.directory, x, 'corpus') for x in ('node0', 'node1')]
+        for root in roots:
+            self.make_corpus(root, archives=True)
+        for inputs in ([os.path.relpath(roots[0])], [roots[1] + os.sep]), \
+                ([os.path.relpath(os.path.join(roots[0], 'a.tar'))], [os.path.join(roots[1], 'a.tar')]):
+            keys = [sorted(paper_key(x, paths) for x in iter_papers(paths, 'springer')) for paths in inputs]
+            self.assertEqual(keys[0], keys[1])
+            self.assertIn('a.tar/springer/10.1007_0.html', keys[0])
+        keys = [paper_key(x, [roots[1]]) for x in iter_papers([roots[1]], 'springer')]
+        self.assertIn('papers.jsonl:12', keys)
+        self.assertEqual(keys, [paper_key(x, [roots[0]]) for x in iter_papers([roots[0]], 'springer')])
+        # A DOI is kept
+        self.assertEqual(paper_key(('springer', '10.1007/1', b''), [roots[1]]), '10.1007/1')
+
+        outputs = []
+        for i, root in enumerate([os.path.relpath(roots[0]), roots[1]]):
+            outputs.append(os.path.join(self.directory, 'shard-%d.jsonl' % i))
+            manifest = Manifest((i, 2), [root])
+            with JSONLSink(outputs[-1]) as sink:
+                run_batch(iter_papers([root], 'springer'), sink, executor='serial', shard=(i, 2),
+                          manifest=manifest, inputs=[root])
+            manifest.write(manifest_filename(outputs[-1]))
+        records = []
+        report = merge(outputs, CallbackSink(records.extend, batch_size=1), inputs=[roots[0]], publisher='springer')
+        self.assertEqual(report['problems'], {})
+        self.assertEqual(len(records), 3 * len(self.papers))
@@ -0,0 +1,103 @@
+import contextlib
+import gzip
+import io
+import json
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from LimeSoup import SpringerSoup
+from LimeSoup.batch import iter_papers, main, run_batch
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.sinks import CallbackSink, GzipJSONLSink, JSONLSink, SQLiteSink, open_sink
+
+
+class TestSinks(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.records = [{'path': 'paper%d' % i, 'publisher': 'springer',
+                         'result': {'Sections': [i]}} for i in range(5)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_flush_by_batch_size(self):
+        batches = []
+        with CallbackSink(batches.append, batch_size=2, flush_interval=None) as sink:
+            sink.write_many(self.records)
+            self.assertEqual([len(x) for x in batches], [2, 2])
+        self.assertEqual([len(x) for x in batches], [2, 2, 1])
+        self.assertEqual(sink.written, 5)
+
+    def test_flush_by_time(self):
+        batches = []
+        sink = CallbackSink(batches.append, batch_size=100, flush_interval=0)
+        sink.write(self.records[0])
+        self.assertEqual(len(batches), 1)
+
+    def test_jsonl(self):
+        for filename, opener in (('papers.jsonl', open), ('papers.jsonl.gz', gzip.open)):
+            filename = os.path.join(self.directory, filename)
+            with open_sink(filename, batch_size=2) as sink:
+                sink.write_many(self.records)
+            self.assertIsInstance(sink, GzipJSONLSink if opener is gzip.open else JSONLSink)
+            with opener(filename, 'rt', encoding='utf-8') as f:
+                self.assertEqual([json.loads(x) for x in f], self.records)
+
+    def test_sqlite(self):
+        connection = sqlite3.connect(':memory:')
+        with SQLiteSink(connection, columns=('path', 'result'), batch_size=3) as sink:
+            sink.write_many(self.records)
+        rows = connection.execute('SELECT path, result FROM papers').fetchall()
+        self.assertEqual(rows[4], ('paper4', '{"Sections":[4]}'))
+
+    def test_unknown_extension(self):
+        with self.assertRaises(ValueError):
+            open_sink('papers.csv')
+
+
+class TestRunBatch(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        os.mkdir(os.path.join(self.directory, 'springer'))
+        for i in range(3):
+            with open(os.path.join(self.directory, 'springer', '%d.html' % i), 'w') as f:
+                f.write(SPRINGER_HTML.format(i))
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_run_batch(self):
+        papers = list(iter_papers([self.directory]))
+        self.assertEqual([x[0] for x in papers], ['springer'] * 3)
+
+        batches = []
+        stats = run_batch(papers, CallbackSink(batches.append, batch_size=2), executor='serial')
+        self.assertEqual(stats, {'documents': 3, 'successful': 3, 'failed': 0})
+        self.assertEqual([len(x) for x in batches], [2])
+        self.assertEqual(batches[0][1]['result'], SpringerSoup.parse(SPRINGER_HTML.format(1)))
+
+    def test_main(self):
+        output = os.path.join(self.directory, 'papers.sqlite')
+        main([os.path.join(self.directory, 'springer'), '--output', output, '--executor', 'serial'])
+        connection = sqlite3.connect(output)
+        rows = connection.execute('SELECT publisher, parser_successful FROM papers').fetchall()
+        connection.close()
+        self.assertEqual(rows, [('springer', 1)] * 3)
+
+    def test_append_jsonl_only(self):
+        for name in ('papers.sqlite', 'papers.parquet'):
+            output = os.path.join(self.directory, name)
+            with self.assertRaises(SystemExit) as context, contextlib.redirect_stderr(io.StringIO()) as stderr:
+                main([os.path.join(self.directory, 'springer'), '--output', output, '--append'])
+            self.assertEqual(context.exception.code, 2)
+            self.assertIn('--append', stderr.getvalue())
+            self.assertFalse(os.path.exists(output))
+
+        output = os.path.join(self.directory, 'papers.jsonl')
+        for _ in range(2):
+            main([os.path.join(self.directory, 'springer'), '--output', output, '--executor', 'serial', '--append'])
+        with open(output) as f:
+            self.assertEqual(len(f.readlines()), 6)
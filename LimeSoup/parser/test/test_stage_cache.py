@@ -0,0 +1,151 @@
+import importlib
+import os
+import shutil
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from LimeSoup import SpringerSoup
+from LimeSoup.batch import run_batch
+from LimeSoup import lime_soup
+from LimeSoup.lime_soup import RuleIngredient, Soup
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+from LimeSoup.shard import read_records
+from LimeSoup.sinks import CallbackSink, JSONLSink
+from LimeSoup.stage_cache import StageCache, cacheable
+
+
+class Upper(RuleIngredient):
+    @staticmethod
+    def _parse(html_str):
+        return html_str.upper()
+
+
+class Strip(RuleIngredient):
+    @staticmethod
+    def _parse(html_str):
+        return html_str.strip()
+
+
+class Collect(RuleIngredient):
+    @staticmethod
+    def _parse(html_str):
+        return {'text': html_str}
+
+
+def make_soup(*ingredients):
+    soup = Soup(parser_version='0')
+    for ingredient in ingredients:
+        soup.add_ingredient(ingredient())
+    return soup
+
+
+class TestFingerprints(unittest.TestCase):
+    def test_chain(self):
+        chain = make_soup(Upper, Strip, Collect).fingerprints
+        self.assertEqual(len(chain), 3)
+        self.assertEqual(chain, make_soup(Upper, Strip, Collect).fingerprints)
+        # A stage that changes changes the chain from that stage on only
+        changed = make_soup(Upper, Upper, Collect).fingerprints
+        self.assertEqual(changed[0], chain[0])
+        self.assertNotEqual(changed[1], chain[1])
+        self.assertNotEqual(changed[2], chain[2])
+        self.assertNotEqual(make_soup(Strip, Strip, Collect).fingerprints[0], chain[0])
+
+    def test_soups(self):
+        self.assertEqual(SpringerSoup.fingerprint, SpringerSoup.fingerprints[-1])
+        self.assertIsNone(Soup(parser_version='0').fingerprint)
+        versions = [Soup(parser_version=x) for x in ('0', '1')]
+        for soup in versions:
+            soup.add_ingredient(Upper())
+        self.assertNotEqual(versions[0].fingerprint, versions[1].fingerprint)
+
+    def test_module_constants(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        sys.path.insert(0, directory)
+        self.addCleanup(sys.path.remove, directory)
+        self.addCleanup(sys.modules.pop, 'fingerprinted_soup', None)
+        source = (
+            'from LimeSoup.lime_soup import RuleIngredient\n'
+            'ENDING_SECTIONS = %r\n'
+            'class Trim(RuleIngredient):\n'
+            '    @staticmethod\n'
+            '    def _parse(sections):\n'
+            '        return [x for x in sections if x not in ENDING_SECTIONS]\n'
+        )
+
+        fingerprints = []
+        for ending_sections in (['References'], ['References', 'Acknowledgements']):
+            with open(os.path.join(directory, 'fingerprinted_soup.py'), 'w') as f:
+                f.write(source % ending_sections)
+            importlib.invalidate_caches()
+            sys.modules.pop('fingerprinted_soup', None)
+            # Modules do not change while a process runs, but here
+            lime_soup._module_fingerprint.cache_clear()
+            fingerprints.append(importlib.import_module('fingerprinted_soup').Trim().fingerprint())
+        self.assertNotEqual(fingerprints[0], fingerprints[1])
+
+
+class TestStageCache(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = StageCache(os.path.join(self.directory, 'stages.sqlite'))
+
+    def tearDown(self):
+        self.cache.close()
+        shutil.rmtree(self.directory)
+
+    def test_cacheable(self):
+        self.assertTrue(cacheable(('a', [1, 2.0, None], {'b': b'c'})))
+        self.assertFalse(cacheable({1: 'a'}))
+        self.assertFalse(cacheable(['a', object()]))
+
+    def test_parse_cached(self):
+        html_str = SPRINGER_HTML.format(1)
+        expected = SpringerSoup.parse(html_str)
+        self.assertEqual(SpringerSoup.parse_cached(html_str, self.cache), expected)
+        self.assertEqual(len(self.cache), len(SpringerSoup.ingredients) - 1)
+
+        # Resumed from the output of the stage before the last one
+        ingredients = SpringerSoup.ingredients
+        with mock.patch.object(type(ingredients[0]), 'run', side_effect=AssertionError):
+            self.assertEqual(SpringerSoup.parse_cached(html_str, self.cache), expected)
+
+    def test_uncacheable_stages(self):
+        soup = make_soup(Upper, Strip, Collect)
+        self.assertEqual(soup.parse_cached(' a ', self.cache), {'text': 'A'})
+        with mock.patch.object(self.cache, 'get', return_value=None):
+            self.assertEqual(soup.parse_cached(' a ', self.cache), {'text': 'A'})
+        self.assertFalse(self.cache.put('key', 'fingerprint', object()))
+
+
+class TestIncremental(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.papers = [('springer', '10.1007/%d' % i, SPRINGER_HTML.format(i).encode('utf-8'))
+                       for i in range(4)]
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def test_unchanged_records_are_copied(self):
+        previous = os.path.join(self.directory, 'previous.jsonl')
+        with JSONLSink(previous) as sink:
+            run_batch(self.papers, sink, executor='serial')
+        first = list(read_records(previous))
+        self.assertEqual(first[0]['parser_fingerprints'], SpringerSoup.fingerprints)
+
+        records = []
+        with CallbackSink(records.extend) as sink:
+            stats = run_batch(self.papers, sink, executor='serial', previous=previous)
+        self.assertEqual((stats['documents'], stats['unchanged']), (4, 4))
+        self.assertEqual(records, first)
+
+        # A changed pipeline parses the paper again
+        fingerprints = {'10.1007/0': 'old', '10.1007/1': SpringerSoup.fingerprint}
+        with mock.patch('LimeSoup.batch._previous_fingerprints', return_value=fingerprints):
+            with CallbackSink(records.extend) as sink:
+                stats = run_batch(self.papers, sink, executor='serial', previous=previous)
+        self.assertEqual((stats['documents'], stats['unchanged']), (4, 1))
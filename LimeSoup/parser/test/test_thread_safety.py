@@ -0,0 +1,65 @@
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+
+from bs4 import BeautifulSoup
+
+from LimeSoup import SpringerSoup
+from LimeSoup.parser.parser_section_acs import ParserSections
+
+SPRINGER_HTML = """<html><head><title>Paper</title></head><body>
+<span class="JournalTitle">Journal {0}</span>
+<h1 class="ArticleTitle">Title {0}</h1>
+<span class="Keyword">Keyword {0}</span>
+<div class="AbstractSection"><h2>Abstract</h2><p>Abstract of paper {0}.</p></div>
+<section>
+<h2 class="Heading">Introduction</h2>
+<div class="Para">Introduction of paper {0} with Li<sub>2</sub>O.</div>
+<h3 class="Heading">Methods</h3>
+<div class="Para">Methods of paper {0}.</div>
+</section>
+</body></html>"""
+
+
+class TestConcurrentParsing(unittest.TestCase):
+    def test_springer_journal_name(self):
+        papers = [SPRINGER_HTML.format(i) for i in range(16)]
+        expected = [SpringerSoup.parse(paper) for paper in papers]
+        for i, result in enumerate(expected):
+            self.assertEqual(result['Journal'], 'Journal {}'.format(i))
+
+        with ThreadPoolExecutor(max_workers=16) as executor:
+            results = list(executor.map(SpringerSoup.parse, papers * 8))
+
+        self.assertEqual(results, expected * 8)
+
+
+SECTIONS_XML = [
+    '<root><section_h2><section_title>Intro</section_title>\n<para>One.</para>\n<para>Two.</para>\n'
+    '</section_h2></root>',
+    '<root><section_h2><section_title>Methods</section_title>\n<para>One.</para>\n'
+    '<div><p>Two.</p><p>Three.</p></div>\n<para>Four.</para>\n</section_h2></root>',
+]
+
+
+def parse_sections(xml_string):
+    parser = ParserSections(BeautifulSoup(xml_string, 'lxml').find('root'), {'name': 'section_h2'})
+    return parser.get_number_paragraphs, parser.data
+
+
+class TestParserSectionsState(unittest.TestCase):
+    def test_counters_are_per_instance(self):
+        first, second = [parse_sections(x) for x in SECTIONS_XML]
+        self.assertEqual(first[0], 2)
+        self.assertEqual(second[0], 4)
+        self.assertEqual(second[1][0]['content'], ['One.', 'Two.Three.', 'Four.'])
+        # Counts do not add up across instances, nor share the list of headings
+        self.assertEqual(parse_sections(SECTIONS_XML[0]), first)
+        parsers = [ParserSections(BeautifulSoup(x, 'lxml').find('root'), {'name': 'section_h2'})
+                   for x in SECTIONS_XML]
+        self.assertIsNot(parsers[0].list_heading, parsers[1].list_heading)
+
+    def test_concurrent_instances(self):
+        expected = [parse_sections(x) for x in SECTIONS_XML]
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            results = list(executor.map(parse_sections, SECTIONS_XML * 32))
+        self.assertEqual(results, expected * 32)
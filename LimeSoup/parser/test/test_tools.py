@@ -0,0 +1,48 @@
+import unittest
+
+from LimeSoup.parser.tools import PARAGRAPH, SECTION, document_stats, n_paragraphs_sections, walk_sections
+
+RESULT = {
+    'DOI': ['10.1021/x'],
+    'Title': ' A  title ',
+    'Keywords': ['one', 'two'],
+    'Sections': [
+        {'type': 'section_h2', 'name': 'Abstract', 'content': 'Abstract.'},
+        {'type': 'section_h2', 'name': 'Methods_and_materials', 'content': [
+            'One.',
+            {'type': 'section_h3', 'name': 'Synthesis_1', 'content': ['Two.', 'Three.']},
+        ]},
+        {'type': 'section_h2', 'name': None, 'content': []},
+    ],
+}
+
+
+class TestWalkSections(unittest.TestCase):
+    def test_events(self):
+        self.assertEqual(list(walk_sections(RESULT['Sections'])), [
+            (SECTION, ('Abstract',), 'Abstract'),
+            (PARAGRAPH, ('Abstract',), 'Abstract.'),
+            (SECTION, ('Methods_and_materials',), 'Methods_and_materials'),
+            (PARAGRAPH, ('Methods_and_materials',), 'One.'),
+            (SECTION, ('Methods_and_materials', 'Synthesis_1'), 'Synthesis_1'),
+            (PARAGRAPH, ('Methods_and_materials', 'Synthesis_1'), 'Two.'),
+            (PARAGRAPH, ('Methods_and_materials', 'Synthesis_1'), 'Three.'),
+            (SECTION, ('',), None),
+        ])
+
+    def test_n_paragraphs_sections(self):
+        self.assertEqual(n_paragraphs_sections(RESULT), {
+            'headings': ['A title', 'Abstract', 'Methods_and_materials', 'Synthesis_1'],
+            'paragraphs': ['Abstract.', 'One.', 'Two.', 'Three.'],
+            'keywords': 2,
+        })
+
+    def test_document_stats(self):
+        self.assertEqual(document_stats(RESULT), {
+            'paragraphs': 4,
+            'characters': 23,
+            'sections': 4,
+            'max_depth': 2,
+            'keywords': 2,
+        })
+        self.assertEqual(document_stats({'Sections': ['Text.']})['max_depth'], 0)
@@ -0,0 +1,32 @@
+import unittest
+from unittest import mock
+
+from LimeSoup import SpringerSoup
+from LimeSoup.parser import trees
+from LimeSoup.parser.test.test_thread_safety import SPRINGER_HTML
+
+
+class TestDecomposing(unittest.TestCase):
+    def test_soups_decomposed_after_parse(self):
+        soups = []
+
+        def track(soup):
+            soups.append(soup)
+            return trees_track(soup)
+
+        trees_track = trees.track
+        html = SPRINGER_HTML.format(1)
+        with mock.patch('LimeSoup.parser.encoding.track', side_effect=track):
+            result = SpringerSoup.parse(html)
+        self.assertTrue(soups)
+        self.assertTrue(all(soup.decomposed for soup in soups))
+
+        # Same result when the trees are left to the garbage collector
+        with mock.patch.object(trees, 'DECOMPOSE', False):
+            self.assertEqual(SpringerSoup.parse(html), result)
+
+    def test_not_tracked_outside_parse(self):
+        from LimeSoup.parser.encoding import beautiful_soup
+        soup = beautiful_soup('<p>text</p>', 'html.parser')
+        self.assertFalse(soup.decomposed)
+        self.assertEqual(soup.p.text, 'text')
@@ -1,6 +1,7 @@
 """
 tools has some general functions that help during the parser process.
 """
+from LimeSoup.result import Section
 
 __author__ = "Tiago Botari"
 __copyright__ = ""
@@ -9,6 +10,9 @@ __maintainer__ = "Tiago Botari"
 __email__ = "tiagobotari@gmail.com"
 __date__ = "Mar 12 2018"
 
+SECTION = 'section'
+PARAGRAPH = 'paragraph'
+
 
 def convert_to_text(text_input):
     # import unicodedata
@@ -40,21 +44,93 @@ def flatten_json(y):
 
 
 def n_paragraphs_sections(data):
-    pd = flatten_json(data)
-    paragraphs = list()
+    """
+    :param data: parse result, with 'Title', 'Keywords' and 'Sections'.
+    :return: dict with the headings (title and section names), the
+        paragraphs and the number of keywords.
+    """
     headings = list()
-    n_keywords = 0
-    for item in pd:
-        content = item.split('_')[-1]
-        initial = item.split('_')[0]
-        if content == 'name' or initial == 'Title':
-            headings.append(convert_to_text(pd[item]))
-        elif initial == 'Keywords':
-            n_keywords += 1
-        elif content.replace('.', '', 1).isdigit():
-            paragraphs.append(pd[item])
+    paragraphs = list()
+    if isinstance(data.get('Title'), str):
+        headings.append(convert_to_text(data['Title']))
+    for kind, _, text in walk_sections(data.get('Sections') or []):
+        if kind is PARAGRAPH:
+            paragraphs.append(text)
+        elif text is not None:
+            headings.append(convert_to_text(text))
     return {
         'headings': headings,
         'paragraphs': paragraphs,
-        'keywords': n_keywords
+        'keywords': len(data.get('Keywords') or [])
+    }
+
+
+def document_stats(data):
+    """
+    Statistics of a parse result, in one walk of its sections.
+
+    :param data: parse result, with 'Keywords' and 'Sections'.
+    :return: dict with the numbers of paragraphs, characters (of the
+        paragraphs), sections and keywords, and the maximum depth of the
+        sections (0 when the paragraphs are not in sections).
+    """
+    stats = {
+        'paragraphs': 0,
+        'characters': 0,
+        'sections': 0,
+        'max_depth': 0,
+        'keywords': len(data.get('Keywords') or []),
     }
+    for kind, path, text in walk_sections(data.get('Sections') or []):
+        if kind is PARAGRAPH:
+            stats['paragraphs'] += 1
+            stats['characters'] += len(text)
+        else:
+            stats['sections'] += 1
+            if len(path) > stats['max_depth']:
+                stats['max_depth'] = len(path)
+    return stats
+
+
+def walk_sections(sections):
+    """
+    Walk a 'Sections' tree in document order, without recursion.
+
+    :param sections: list of paragraphs (str) and section dicts with
+        'type', 'name' and 'content' (a list, or a single paragraph), or
+        the same as LimeSoup.result.Section objects.
+    :return: generator of (kind, path, text). When a section starts:
+        (SECTION, path including the section, name of the section); for
+        each paragraph: (PARAGRAPH, path of the enclosing sections, text).
+        A path is the tuple of the section names, None names become ''.
+    """
+    stack = [((), iter(sections))]
+    while stack:
+        path, items = stack[-1]
+        for item in items:
+            if isinstance(item, str):
+                yield PARAGRAPH, path, item
+            elif isinstance(item, Section) or (isinstance(item, dict) and 'content' in item):
+                if isinstance(item, Section):
+                    name, content = item.name, item.content
+                else:
+                    name, content = item.get('name'), item['content']
+                section_path = path + (name or '',)
+                yield SECTION, section_path, name
+                if isinstance(content, str):
+                    content = [content]
+                stack.append((section_path, iter(content)))
+                break
+        else:
+            stack.pop()
+
+
+def iter_paragraphs(sections):
+    """
+    :param sections: see walk_sections.
+    :return: generator of (section path, paragraph), the section path being
+        the tuple of the names of the enclosing sections.
+    """
+    for kind, path, text in walk_sections(sections):
+        if kind is PARAGRAPH:
+            yield path, text
@@ -0,0 +1,64 @@
+"""
+Release the bs4 trees built while parsing a paper.
+
+Every node of a bs4 tree refers to its parent and to the previous and next
+elements, so a tree is never freed by reference counting: it waits for a
+full (generation 2) collection of the garbage collector. In a worker parsing
+thousands of papers, the trees of past papers pile up between collections,
+and every collection walks all of them.
+
+Soup.parse() collects the trees built by beautiful_soup() while the paper
+is parsed (in its thread), and decompose()s them once the result is ready,
+so that their memory is given back right away:
+
+    with trees.decomposing():
+        result = ingredients.parse(html_str)
+
+Results must not keep bs4 nodes (they hold strings, lists and dicts). Set
+DECOMPOSE to False to leave the trees to the garbage collector, e.g. to
+compare both in benchmarks.
+"""
+import contextlib
+import threading
+import weakref
+
+__all__ = ['DECOMPOSE', 'decomposing', 'track']
+
+DECOMPOSE = True
+
+_local = threading.local()
+
+
+def track(soup):
+    """
+    Decompose soup at the end of the current decomposing() block, if any.
+
+    :param soup: bs4.BeautifulSoup
+    :return: soup
+    """
+    soups = getattr(_local, 'soups', None)
+    if soups is not None:
+        # Not kept alive: the trees dropped by the ingredients before the
+        # end of the parse may be collected as usual.
+        soups.append(weakref.ref(soup))
+    return soup
+
+
+@contextlib.contextmanager
+def decomposing():
+    """
+    Decompose the soups tracked in this context (and thread) when it exits.
+    Nested contexts leave the soups to the outermost one.
+    """
+    if not DECOMPOSE or getattr(_local, 'soups', None) is not None:
+        yield
+        return
+    _local.soups = soups = []
+    try:
+        yield
+    finally:
+        _local.soups = None
+        for ref in soups:
+            soup = ref()
+            if soup is not None:
+                soup.decompose()
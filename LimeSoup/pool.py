@@ -0,0 +1,394 @@
+"""
+A process pool that limits the wall time and memory of every task.
+
+concurrent.futures.ProcessPoolExecutor cannot stop a task: a paper that takes
+minutes or gigabytes (huge Wiley pages, Elsevier XML with giant MathML
+tables) holds its worker for as long as it runs, and a worker killed by the
+system breaks the whole pool. LimitedProcessPool is an Executor whose
+workers each run one task at a time, watched by a supervisor thread. A
+worker that runs a task for longer than `timeout` seconds, or whose
+resident memory grows over `max_rss` bytes, is killed and replaced by a new
+one; the future of its task fails with DocumentTimeout or
+DocumentMemoryExceeded, and the other tasks go on.
+
+    with LimitedProcessPool(max_workers=4, timeout=60, max_rss=2 * 1024 ** 3) as pool:
+        future = pool.submit(soup.parse, html_str)
+
+The memory of the workers is read from /proc (Linux), or with psutil when
+it is installed.
+
+Long-running workers also slow down with time: every full collection of the
+garbage collector walks all the objects of the process, including the
+modules, soups and tables imported or read once at start. Workers therefore
+gc.freeze() these after their initializer, so collections skip them (and do
+not write to the memory pages shared with the parent after a fork). With
+max_tasks_per_worker, a worker is also replaced by a fresh one after that
+many tasks, giving back whatever memory it accumulated. stats() reports the
+resident memory and the garbage collection pauses of the workers:
+
+    pool.stats()
+    {'tasks': 1000, 'workers_started': 8, 'workers_recycled': 4, 'max_rss': 181092352,
+     'gc_collections': 5203, 'gc_pause': 0.61, 'gc_max_pause': 0.012}
+"""
+import collections
+import concurrent.futures
+import gc
+import multiprocessing
+import multiprocessing.connection
+import os
+import threading
+import time
+
+__all__ = ['DocumentLimitExceeded', 'DocumentTimeout', 'DocumentMemoryExceeded', 'WorkerDied',
+           'LimitedProcessPool', 'GCPauses', 'process_rss']
+
+
+class DocumentLimitExceeded(Exception):
+    """
+    A task was stopped, and its worker killed. kind is 'timeout', 'oom' or
+    'died'.
+    """
+    kind = None
+
+
+class DocumentTimeout(DocumentLimitExceeded):
+    kind = 'timeout'
+
+
+class DocumentMemoryExceeded(DocumentLimitExceeded):
+    kind = 'oom'
+
+
+class WorkerDied(DocumentLimitExceeded):
+    """
+    The worker exited while running the task, e.g. killed by the system.
+    """
+    kind = 'died'
+
+
+def _proc_rss(pid):
+    with open('/proc/%d/statm' % pid) as f:
+        return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+
+
+def _psutil_rss(pid):
+    import psutil
+    return psutil.Process(pid).memory_info().rss
+
+
+def _rss_reader():
+    if os.path.exists('/proc/self/statm'):
+        return _proc_rss
+    try:
+        import psutil  # noqa: F401
+    except ImportError:
+        return None
+    return _psutil_rss
+
+
+def process_rss(pid=None):
+    """
+    :return: resident memory of a process in bytes, None if it cannot be
+        read on this system.
+    """
+    reader = _rss_reader()
+    if reader is None:
+        return None
+    try:
+        return reader(pid or os.getpid())
+    except (OSError, ValueError):
+        return None
+
+
+class GCPauses(object):
+    """
+    Time the collections of the garbage collector, with gc.callbacks.
+    """
+
+    def __init__(self):
+        self.collections = 0
+        self.pause = 0.0
+        self.max_pause = 0.0
+        self._start = None
+
+    def _callback(self, phase, info):
+        if phase == 'start':
+            self._start = time.perf_counter()
+        elif self._start is not None:
+            pause = time.perf_counter() - self._start
+            self._start = None
+            self.collections += 1
+            self.pause += pause
+            self.max_pause = max(self.max_pause, pause)
+
+    def install(self):
+        gc.callbacks.append(self._callback)
+        return self
+
+    def uninstall(self):
+        gc.callbacks.remove(self._callback)
+
+    def take(self):
+        """
+        :return: (collections, total pause, longest pause) since the last
+            take(), in seconds.
+        """
+        counts = (self.collections, self.pause, self.max_pause)
+        self.collections, self.pause, self.max_pause = 0, 0.0, 0.0
+        return counts
+
+
+def _work(connection, initializer, initargs, gc_freeze):
+    if initializer is not None:
+        initializer(*initargs)
+    if gc_freeze:
+        gc.freeze()
+    pauses = GCPauses().install()
+    while True:
+        try:
+            task = connection.recv()
+        except EOFError:
+            return
+        if task is None:
+            return
+        function, args, kwargs = task
+        try:
+            message = (True, function(*args, **kwargs))
+        except BaseException as e:
+            message = (False, e)
+        metrics = (process_rss(),) + pauses.take()
+        try:
+            connection.send(message + (metrics,))
+        except Exception as e:
+            # The result or the exception cannot be pickled
+            connection.send((False, RuntimeError('%s: %s' % (type(e).__name__, e)), metrics))
+
+
+class _Worker(object):
+    __slots__ = ('process', 'connection', 'future', 'started', 'tasks')
+
+    def __init__(self, context, initializer, initargs, gc_freeze):
+        self.connection, child = context.Pipe()
+        self.process = context.Process(target=_work, args=(child, initializer, initargs, gc_freeze),
+                                       daemon=True)
+        self.process.start()
+        child.close()
+        self.future = None
+        self.started = None
+        self.tasks = 0
+
+    def run(self, future, task):
+        self.future = future
+        self.started = time.monotonic()
+        self.connection.send(task)
+
+    def done(self):
+        future, self.future, self.started = self.future, None, None
+        self.tasks += 1
+        return future
+
+    def kill(self):
+        self.process.kill()
+        self.process.join()
+        self.connection.close()
+
+    def stop(self):
+        try:
+            self.connection.send(None)
+        except OSError:
+            pass
+        self.process.join()
+        self.connection.close()
+
+
+class LimitedProcessPool(concurrent.futures.Executor):
+    def __init__(self, max_workers=None, timeout=None, max_rss=None, initializer=None, initargs=(),
+                 poll_interval=0.05, mp_context=None, max_tasks_per_worker=None, gc_freeze=True):
+        """
+        :param max_workers: number of worker processes, by default the CPU count.
+        :param timeout: seconds a task may run, None for no limit.
+        :param max_rss: bytes of resident memory a worker may use while
+            running a task, None for no limit.
+        :param initializer: called with initargs in every new worker.
+        :param poll_interval: seconds between two checks of the limits.
+        :param mp_context: multiprocessing context, by default the default one.
+        :param max_tasks_per_worker: tasks run by a worker before it is
+            replaced by a new one, None to keep workers for good.
+        :param gc_freeze: gc.freeze() the objects of new workers after the
+            initializer.
+        """
+        if max_rss is not None and _rss_reader() is None:
+            raise ValueError('max_rss needs /proc or psutil to read the memory of the workers')
+        if max_tasks_per_worker is not None and max_tasks_per_worker < 1:
+            raise ValueError('max_tasks_per_worker must be at least 1')
+        self.max_workers = max_workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.max_rss = max_rss
+        self.max_tasks_per_worker = max_tasks_per_worker
+        self.poll_interval = poll_interval
+        self._context = mp_context or multiprocessing.get_context()
+        self._initializer = initializer
+        self._initargs = initargs
+        self._gc_freeze = gc_freeze
+        self._rss = _rss_reader()
+        self._stats = dict.fromkeys(('tasks', 'workers_started', 'workers_recycled', 'max_rss',
+                                     'gc_collections', 'gc_pause', 'gc_max_pause'), 0)
+
+        self._tasks = collections.deque()
+        self._lock = threading.Lock()
+        self._shutdown = False
+        self._wakeup_reader, self._wakeup_writer = self._context.Pipe(duplex=False)
+
+        self._workers = [self._spawn() for _ in range(self.max_workers)]
+        self._supervisor = threading.Thread(target=self._supervise, daemon=True)
+        self._supervisor.start()
+
+    def _spawn(self):
+        with self._lock:
+            self._stats['workers_started'] += 1
+        return _Worker(self._context, self._initializer, self._initargs, self._gc_freeze)
+
+    def stats(self):
+        """
+        :return: dict with the numbers of tasks run, workers started and
+            recycled (after max_tasks_per_worker tasks), the largest resident
+            memory of a worker after a task in bytes (0 if unknown), and the
+            number, total and longest pause in seconds of the garbage
+            collections in the workers.
+        """
+        with self._lock:
+            return dict(self._stats)
+
+    def _record(self, metrics):
+        rss, collections, pause, max_pause = metrics
+        with self._lock:
+            stats = self._stats
+            stats['tasks'] += 1
+            stats['max_rss'] = max(stats['max_rss'], rss or 0)
+            stats['gc_collections'] += collections
+            stats['gc_pause'] += pause
+            stats['gc_max_pause'] = max(stats['gc_max_pause'], max_pause)
+
+    def _wakeup(self):
+        try:
+            self._wakeup_writer.send_bytes(b'')
+        except OSError:
+            pass
+
+    def submit(self, fn, *args, **kwargs):
+        future = concurrent.futures.Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError('cannot schedule new futures after shutdown')
+            self._tasks.append((future, (fn, args, kwargs)))
+        self._wakeup()
+        return future
+
+    def shutdown(self, wait=True, cancel_futures=False):
+        with self._lock:
+            self._shutdown = True
+            if cancel_futures:
+                while self._tasks:
+                    self._tasks.popleft()[0].cancel()
+        self._wakeup()
+        if wait:
+            self._supervisor.join()
+
+    def _replace(self, worker, error):
+        """
+        Kill a worker, fail its task with error and start a new worker.
+        """
+        worker.kill()
+        future = worker.done()
+        if future is not None:
+            future.set_exception(error)
+        self._workers[self._workers.index(worker)] = self._spawn()
+
+    def _dispatch(self):
+        for worker in self._workers:
+            if worker.future is not None:
+                continue
+            while True:
+                with self._lock:
+                    if not self._tasks:
+                        return
+                    future, task = self._tasks.popleft()
+                if future.set_running_or_notify_cancel():
+                    break
+            try:
+                worker.run(future, task)
+            except Exception as e:
+                # The task cannot be pickled, or the worker is gone.
+                worker.done()
+                future.set_exception(e)
+
+    def _collect(self, ready):
+        for worker in list(self._workers):
+            if worker.future is None or worker.connection not in ready:
+                continue
+            try:
+                successful, value, metrics = worker.connection.recv()
+            except (EOFError, OSError):
+                worker.process.join(1)
+                self._replace(worker, WorkerDied('Worker exited with code %s while parsing' % (
+                    worker.process.exitcode,)))
+                continue
+            future = worker.done()
+            self._record(metrics)
+            if successful:
+                future.set_result(value)
+            else:
+                future.set_exception(value)
+            if self.max_tasks_per_worker is not None and worker.tasks >= self.max_tasks_per_worker:
+                self._recycle(worker)
+
+    def _recycle(self, worker):
+        # The new worker is started before the old one is stopped, which
+        # may take a while to free a large heap.
+        self._workers[self._workers.index(worker)] = self._spawn()
+        worker.stop()
+        with self._lock:
+            self._stats['workers_recycled'] += 1
+
+    def _check_limits(self):
+        now = time.monotonic()
+        for worker in list(self._workers):
+            if worker.future is None:
+                # Memory kept by an idle worker would count against its
+                # next task: start afresh.
+                if not worker.process.is_alive() or (
+                        self.max_rss is not None and self._worker_rss(worker) > self.max_rss):
+                    worker.kill()
+                    self._workers[self._workers.index(worker)] = self._spawn()
+                continue
+            if self.timeout is not None and now - worker.started > self.timeout:
+                self._replace(worker, DocumentTimeout('Parsing took more than %g s' % self.timeout))
+            elif self.max_rss is not None:
+                rss = self._worker_rss(worker)
+                if rss > self.max_rss:
+                    self._replace(worker, DocumentMemoryExceeded(
+                        'Parsing used %d MB, more than %d MB' % (rss >> 20, self.max_rss >> 20)))
+
+    def _worker_rss(self, worker):
+        try:
+            return self._rss(worker.process.pid)
+        except (OSError, ValueError):
+            return 0
+
+    def _supervise(self):
+        while True:
+            self._dispatch()
+            busy = [x.connection for x in self._workers if x.future is not None]
+            with self._lock:
+                if self._shutdown and not busy and not self._tasks:
+                    break
+            ready = multiprocessing.connection.wait(busy + [self._wakeup_reader], self.poll_interval)
+            if self._wakeup_reader in ready:
+                while self._wakeup_reader.poll():
+                    self._wakeup_reader.recv_bytes()
+            self._collect(ready)
+            self._check_limits()
+        for worker in self._workers:
+            worker.stop()
+        self._wakeup_reader.close()
+        self._wakeup_writer.close()
@@ -0,0 +1,193 @@
+"""
+Read raw papers out of the files of a crawl, as bytes, without decoding
+them: the soups detect their encoding (see LimeSoup.parser.encoding).
+
+    papers/0001.html            plain file, memory-mapped
+    papers/0001.html.gz         gzip or zstd compressed file (.gz, .zst)
+    shard-00.jsonl.gz           JSON lines (plain, .gz or .zst), one paper per line
+    papers.tar.gz               tar archive (plain, .gz, .zst), one paper per member
+
+iter_inputs() yields an Input per paper. Archives and JSON lines are
+streamed: only one paper is held in memory at a time. Reading .zst files
+requires the zstandard package.
+"""
+import contextlib
+import gzip
+import io
+import json
+import mmap
+import os
+import tarfile
+
+__all__ = ['Input', 'open_binary', 'mapped', 'open_paper', 'read_bytes', 'iter_jsonl', 'iter_tar',
+           'iter_inputs', 'is_archive']
+
+JSONL_EXTENSIONS = ('.jsonl', '.ndjson')
+TAR_EXTENSIONS = ('.tar', '.tgz')
+COMPRESSED_EXTENSIONS = ('.gz', '.zst', '.zstd')
+
+# Keys of a JSON line record holding the raw paper, its name and publisher
+DATA_KEYS = ('html', 'xml', 'raw', 'content', 'html_string', 'xml_string')
+NAME_KEYS = ('doi', 'DOI', 'id', '_id')
+PUBLISHER_KEYS = ('publisher', 'Publisher')
+
+
+class Input(object):
+    """
+    A raw paper: name (path, archive member or DOI), data (bytes, mmap or
+    str for JSON lines) and publisher when the source records it.
+    """
+    __slots__ = ('name', 'data', 'publisher')
+
+    def __init__(self, name, data, publisher=None):
+        self.name = name
+        self.data = data
+        self.publisher = publisher
+
+    def __repr__(self):
+        return 'Input(%r, <%d>)' % (self.name, len(self.data))
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError('Reading .zst files requires zstandard, run: pip install zstandard')
+    return zstandard
+
+
+def _strip_compression(path):
+    lower = path.lower()
+    for extension in COMPRESSED_EXTENSIONS:
+        if lower.endswith(extension):
+            return lower[:-len(extension)]
+    return lower
+
+
+def is_archive(path):
+    """
+    :return: True for JSON lines and tar files, which hold many papers.
+    """
+    lower = _strip_compression(path)
+    return lower.endswith(JSONL_EXTENSIONS + TAR_EXTENSIONS)
+
+
+def open_binary(path):
+    """
+    :return: binary file object of the decompressed content of path.
+    """
+    lower = path.lower()
+    if lower.endswith(('.gz', '.tgz')):
+        return gzip.open(path, 'rb')
+    if lower.endswith(('.zst', '.zstd')):
+        f = open(path, 'rb')
+        reader = _zstandard().ZstdDecompressor().stream_reader(f, closefd=True)
+        return io.BufferedReader(reader)
+    return open(path, 'rb')
+
+
+@contextlib.contextmanager
+def mapped(path):
+    """
+    Memory-map a plain file, read-only. The mmap must not be used after the
+    with block.
+
+    :return: context manager of the mmap (b'' for empty files).
+    """
+    with open(path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield b''
+            return
+        data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            yield data
+        finally:
+            data.close()
+
+
+@contextlib.contextmanager
+def open_paper(path):
+    """
+    :param path: file of a single paper, compressed or not.
+    :return: context manager of the raw paper, the mmap of a plain file or
+        the decompressed bytes.
+    """
+    if _strip_compression(path) != path.lower():
+        yield read_bytes(path)
+    else:
+        with mapped(path) as data:
+            yield data
+
+
+def read_bytes(path):
+    """
+    :return: the decompressed content of a (compressed) file, bytes.
+    """
+    with open_binary(path) as f:
+        return f.read()
+
+
+def _first(record, keys):
+    for key in keys:
+        if record.get(key) is not None:
+            return record[key]
+    return None
+
+
+def iter_jsonl(path, data_key=None):
+    """
+    :param data_key: key of the raw paper in the records, by default the
+        first of DATA_KEYS present.
+    :return: generator of Input.
+    """
+    with open_binary(path) as f:
+        for i, line in enumerate(f):
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            data = record.get(data_key) if data_key else _first(record, DATA_KEYS)
+            if data is None:
+                raise ValueError('%s:%d has none of the keys %r' % (
+                    path, i + 1, (data_key,) if data_key else DATA_KEYS))
+            name = _first(record, NAME_KEYS) or '%s:%d' % (path, i + 1)
+            yield Input(name, data, _first(record, PUBLISHER_KEYS))
+
+
+def iter_tar(path):
+    """
+    :return: generator of Input, one per regular file of the archive, in
+        archive order.
+    """
+    with open_binary(path) as f:
+        # Stream mode: members are read in order, the archive is not seeked.
+        with tarfile.open(fileobj=f, mode='r|') as tar:
+            for member in tar:
+                if not member.isfile():
+                    continue
+                with tar.extractfile(member) as member_file:
+                    data = member_file.read()
+                yield Input('%s/%s' % (path, member.name), data,
+                            os.path.basename(os.path.dirname(member.name)) or None)
+
+
+def iter_inputs(path, data_key=None):
+    """
+    Read the papers of a file, by extension: JSON lines and tar archives
+    (compressed or not) hold many papers, other files one.
+
+    Plain files are memory-mapped: their Input.data is only valid until the
+    generator resumes.
+
+    :param data_key: see iter_jsonl.
+    :return: generator of Input.
+    """
+    lower = _strip_compression(path)
+    if lower.endswith(JSONL_EXTENSIONS):
+        for paper in iter_jsonl(path, data_key):
+            yield paper
+    elif lower.endswith(TAR_EXTENSIONS):
+        for paper in iter_tar(path):
+            yield paper
+    else:
+        with open_paper(path) as data:
+            yield Input(path, data)
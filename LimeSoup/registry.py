@@ -0,0 +1,91 @@
+"""
+Registry of all the soups, keyed by a short publisher name.
+"""
+import re
+from collections import OrderedDict
+
+from LimeSoup.ACSSoup import ACSSoup
+from LimeSoup.AIPSoup import AIPSoup
+from LimeSoup.APSSoup import APSSoup
+from LimeSoup.ECSSoup import ECSSoup
+from LimeSoup.ElsevierSoup import ElsevierSoup
+from LimeSoup.IOPSoup import IOPSoup
+from LimeSoup.NatureSoup import NatureSoup
+from LimeSoup.RSCSoup import RSCSoup
+from LimeSoup.SpringerSoup import SpringerSoup
+from LimeSoup.WileySoup import WileySoup
+
+__all__ = ['SOUPS', 'DOI_PREFIXES', 'get_soup', 'publisher_of_doi', 'detect_publisher']
+
+SOUPS = OrderedDict([
+    ('acs', ACSSoup),
+    ('aip', AIPSoup),
+    ('aps', APSSoup),
+    ('ecs', ECSSoup),
+    ('elsevier', ElsevierSoup),
+    ('iop', IOPSoup),
+    ('nature', NatureSoup),
+    ('rsc', RSCSoup),
+    ('springer', SpringerSoup),
+    ('wiley', WileySoup),
+])
+
+
+def get_soup(publisher):
+    """
+    :param publisher: publisher name, such as 'rsc' or 'RSC'.
+    :return: the soup of the publisher.
+    """
+    try:
+        return SOUPS[publisher.lower()]
+    except KeyError:
+        raise ValueError('Unknown publisher %r, choose from: %s' % (
+            publisher, ', '.join(SOUPS)))
+
+
+# DOI registrant prefixes of the publishers
+DOI_PREFIXES = OrderedDict([
+    ('10.1021', 'acs'),
+    ('10.1063', 'aip'),
+    ('10.1103', 'aps'),
+    ('10.1149', 'ecs'),
+    ('10.1016', 'elsevier'),
+    ('10.1088', 'iop'),
+    ('10.1038', 'nature'),
+    ('10.1039', 'rsc'),
+    ('10.1007', 'springer'),
+    ('10.1186', 'springer'),
+    ('10.1002', 'wiley'),
+    ('10.1111', 'wiley'),
+])
+
+# The DOI of a paper is in its metadata, near the start of the markup.
+DETECT_SIZE = 64 * 1024
+DOI_PREFIX = re.compile(r'\b(10\.\d{4,5})/')
+DOI_PREFIX_BYTES = re.compile(br'\b(10\.\d{4,5})/')
+
+
+def publisher_of_doi(doi):
+    """
+    :param doi: DOI, e.g. '10.1039/c8ta01234a'.
+    :return: publisher name, or None if the DOI prefix is unknown.
+    """
+    match = DOI_PREFIX.match(doi.strip()) if doi else None
+    return DOI_PREFIXES.get(match.group(1)) if match else None
+
+
+def detect_publisher(raw):
+    """
+    Tell the publisher of a raw paper from the first known DOI prefix in its
+    first DETECT_SIZE characters.
+
+    :param raw: raw paper, str or bytes-like.
+    :return: publisher name, or None.
+    """
+    pattern = DOI_PREFIX if isinstance(raw, str) else DOI_PREFIX_BYTES
+    for match in pattern.finditer(raw[:DETECT_SIZE]):
+        prefix = match.group(1)
+        publisher = DOI_PREFIXES.get(prefix if isinstance(prefix, str) else prefix.decode('ascii'))
+        if publisher is not None:
+            return publisher
+    return None
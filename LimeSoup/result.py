@@ -0,0 +1,187 @@
+"""
+Compact model of parse results, for holding many results in memory or
+sending them between processes.
+
+The soups return nested dicts:
+
+    {'DOI': ..., 'Title': ..., 'Sections': [
+        {'type': 'section_h2', 'name': 'Introduction', 'content': ['...', {...}]},
+    ]}
+
+Document.from_dict() turns such a result into __slots__ objects: sections
+are Section objects with interned type strings, and lists are tuples.
+to_dict() gives back exactly the original dicts, keys in the same order,
+and to_json() their JSON. dumps() and dump() serialize a document with
+LimeSoup.serialize, keys sorted.
+"""
+import json
+import sys
+
+__all__ = ['Section', 'Document']
+
+SECTION_KEYS = ('type', 'name', 'content')
+
+
+def _intern(value):
+    return sys.intern(value) if type(value) is str else value
+
+
+def _freeze(value):
+    if isinstance(value, list):
+        return tuple(_freeze(x) for x in value)
+    return value
+
+
+def _thaw(value):
+    if isinstance(value, tuple):
+        return [_thaw(x) for x in value]
+    if isinstance(value, (Section, Document)):
+        return value.to_dict()
+    return value
+
+
+class Section(object):
+    """
+    A section: type, name and content, a paragraph (str) or a tuple of
+    paragraphs and Sections. Keys of the dict other than type, name and
+    content are kept in extra, as a tuple of (key, value).
+    """
+    __slots__ = ('type', 'name', 'content', 'extra', '_keys')
+
+    def __init__(self, type, name, content, extra=None, keys=SECTION_KEYS):
+        self.type = _intern(type)
+        self.name = name
+        self.content = content
+        self.extra = extra
+        self._keys = keys
+
+    @classmethod
+    def from_dict(cls, section):
+        content = section['content']
+        if isinstance(content, list):
+            content = tuple(_section_item(x) for x in content)
+        keys = tuple(section)
+        extra = tuple((k, _freeze(v)) for k, v in section.items() if k not in SECTION_KEYS)
+        return cls(section.get('type'), section.get('name'), content,
+                   extra=extra or None,
+                   keys=SECTION_KEYS if keys == SECTION_KEYS else tuple(sys.intern(x) for x in keys))
+
+    def to_dict(self):
+        values = {'type': self.type, 'name': self.name, 'content': _thaw(self.content)}
+        if self.extra:
+            values.update((k, _thaw(v)) for k, v in self.extra)
+        return {key: values[key] for key in self._keys}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def __reduce__(self):
+        return Section, (self.type, self.name, self.content, self.extra, self._keys)
+
+    def __eq__(self, other):
+        if not isinstance(other, Section):
+            return NotImplemented
+        return self.__reduce__() == other.__reduce__()
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'Section(%r, %r, <%d items>)' % (
+            self.type, self.name, 1 if isinstance(self.content, str) else len(self.content))
+
+
+def _section_item(item):
+    if isinstance(item, dict) and 'content' in item:
+        return Section.from_dict(item)
+    return _freeze(item)
+
+
+class Document(object):
+    """
+    A parse result. Read-only mapping access works as on the dict
+    (document['DOI'], document.get('Sections'), 'Title' in document), with
+    tuples in place of lists and Sections in place of section dicts.
+    """
+    __slots__ = ('_keys', '_values')
+
+    def __init__(self, keys, values):
+        self._keys = keys
+        self._values = values
+
+    @classmethod
+    def from_dict(cls, result):
+        keys = tuple(sys.intern(x) for x in result)
+        values = tuple(
+            tuple(_section_item(x) for x in value)
+            if key == 'Sections' and isinstance(value, list) else _freeze(value)
+            for key, value in result.items())
+        return cls(keys, values)
+
+    def to_dict(self):
+        return {key: _thaw(value) for key, value in zip(self._keys, self._values)}
+
+    def to_json(self, **kwargs):
+        return json.dumps(self.to_dict(), **kwargs)
+
+    def dumps(self):
+        """
+        :return: canonical JSON, bytes, see LimeSoup.serialize.dumps.
+        """
+        from LimeSoup.serialize import dumps
+        return dumps(self.to_dict())
+
+    def dump(self, fp):
+        """
+        :param fp: file object opened in binary mode.
+        """
+        from LimeSoup.serialize import dump
+        dump(self.to_dict(), fp)
+
+    @property
+    def sections(self):
+        return self.get('Sections', ())
+
+    def keys(self):
+        return self._keys
+
+    def get(self, key, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    def __getitem__(self, key):
+        try:
+            return self._values[self._keys.index(key)]
+        except ValueError:
+            raise KeyError(key)
+
+    def __contains__(self, key):
+        return key in self._keys
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self):
+        return len(self._keys)
+
+    def __reduce__(self):
+        return Document, (self._keys, self._values)
+
+    def __eq__(self, other):
+        if not isinstance(other, Document):
+            return NotImplemented
+        return self._keys == other._keys and self._values == other._values
+
+    def __ne__(self, other):
+        result = self.__eq__(other)
+        return result if result is NotImplemented else not result
+
+    __hash__ = None
+
+    def __repr__(self):
+        return 'Document(%s)' % ', '.join(self._keys)
@@ -0,0 +1,176 @@
+"""
+Longest-first scheduling of papers over a pool of workers.
+
+Parsing time grows with the size of a paper, and corpora are heavy-tailed: a
+few 20 MB Elsevier books among thousands of 50 KB letters. Sent in the order
+they come, the giants may start last, and one worker parses them while the
+others are idle. Sorted by their expected cost, largest first, and handed to
+the workers one at a time as they become free, the giants start first and
+the small papers fill the gaps.
+
+The cost of a paper is its size in bytes, or the parsing time predicted by a
+CostModel learned from the papers already parsed, per publisher (a Wiley page
+costs more per KB than an RSC one):
+
+    model = CostModel.load('costs.json')
+    for record in iter_longest_first(parse, papers, executor, cost=model.predict, model=model):
+        ...
+    model.save('costs.json')
+
+Papers are sorted within windows of `window` papers, to hold a bounded
+number of papers (and of their data, for papers read from archives) in
+memory. The results come in the order in which the papers are parsed.
+"""
+import collections
+import concurrent.futures
+import itertools
+import json
+import os
+import time
+
+from LimeSoup.pool import DocumentLimitExceeded
+
+__all__ = ['SCHEDULES', 'CostModel', 'paper_size', 'iter_longest_first']
+
+SCHEDULES = ('input', 'size', 'cost')
+
+
+def paper_size(paper):
+    """
+    :param paper: (publisher, path) or (publisher, name, data), see
+        LimeSoup.batch.iter_papers.
+    :return: size of the paper in bytes (compressed, for compressed files).
+    """
+    if len(paper) > 2:
+        return len(paper[2])
+    try:
+        return os.path.getsize(paper[1])
+    except OSError:
+        return 0
+
+
+class CostModel(object):
+    """
+    Parsing time as a linear function of the size of a paper, fitted by least
+    squares per publisher, and over all publishers for the publishers with too
+    few observations.
+    """
+
+    def __init__(self, min_observations=5):
+        self.min_observations = min_observations
+        # publisher -> [n, sum x, sum y, sum x^2, sum xy], x in bytes, y in s
+        self.sums = collections.defaultdict(lambda: [0, 0.0, 0.0, 0.0, 0.0])
+
+    def observe(self, publisher, size, seconds):
+        for key in (publisher, None):
+            sums = self.sums[key]
+            sums[0] += 1
+            sums[1] += size
+            sums[2] += seconds
+            sums[3] += size * size
+            sums[4] += size * seconds
+
+    def coefficients(self, publisher):
+        """
+        :return: (seconds per paper, seconds per byte), or None if the model
+            knows too little.
+        """
+        for key in (publisher, None):
+            n, x, y, xx, xy = self.sums.get(key) or (0, 0, 0, 0, 0)
+            if n < self.min_observations:
+                continue
+            variance = n * xx - x * x
+            if variance <= 0:
+                return 0.0, y / x if x else 0.0
+            slope = max((n * xy - x * y) / variance, 0.0)
+            return max((y - slope * x) / n, 0.0), slope
+        return None
+
+    def predict(self, paper):
+        """
+        :param paper: see paper_size.
+        :return: expected cost of the paper, in seconds once the model is
+            fitted, in bytes before.
+        """
+        size = paper_size(paper)
+        coefficients = self.coefficients(paper[0])
+        if coefficients is None:
+            return size
+        intercept, slope = coefficients
+        return intercept + slope * size
+
+    def to_dict(self):
+        return {publisher or '': sums for publisher, sums in self.sums.items()}
+
+    def save(self, filename):
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1, sort_keys=True)
+
+    @classmethod
+    def load(cls, filename, **kwargs):
+        """
+        :return: the model saved in filename, or a new one if it does not exist.
+        """
+        model = cls(**kwargs)
+        if os.path.exists(filename):
+            with open(filename) as f:
+                for publisher, sums in json.load(f).items():
+                    model.sums[publisher or None] = list(sums)
+        return model
+
+
+def _timed(parse, paper):
+    start = time.perf_counter()
+    result = parse(paper)
+    return time.perf_counter() - start, result
+
+
+def iter_longest_first(parse, papers, executor, cost=paper_size, window=1000, failed=None, model=None):
+    """
+    Parse papers in an executor, the most costly first within each window,
+    one paper per task, so that free workers take the next paper (unlike
+    map() with chunks).
+
+    :param parse: function of a paper, picklable for process pools.
+    :param papers: iterable of papers, see paper_size.
+    :param executor: concurrent.futures.Executor, e.g. a
+        LimeSoup.pool.LimitedProcessPool, or None to parse in this thread.
+    :param cost: function of a paper giving its expected cost.
+    :param window: papers sorted at a time.
+    :param failed: see LimeSoup.batch._iter_limited.
+    :param model: CostModel learning from the parsing times, or None.
+    :return: generator of the results, as the papers are parsed.
+    """
+    papers = iter(papers)
+    pending = {}
+    while True:
+        batch = sorted(itertools.islice(papers, window), key=cost, reverse=True)
+        if not batch and not pending:
+            return
+        if executor is None:
+            for paper in batch:
+                yield _observed(model, paper, _timed(parse, paper))
+            continue
+        for paper in batch:
+            pending[executor.submit(_timed, parse, paper)] = paper
+        # The next window is sorted once this one is mostly done, keeping the
+        # workers busy while bounding the papers held.
+        while pending and (not batch or len(pending) > window // 2):
+            done, _ = concurrent.futures.wait(pending, return_when=concurrent.futures.FIRST_COMPLETED)
+            for future in done:
+                paper = pending.pop(future)
+                try:
+                    timed = future.result()
+                except DocumentLimitExceeded as e:
+                    if failed is None:
+                        raise
+                    yield failed(paper, e)
+                    continue
+                yield _observed(model, paper, timed)
+
+
+def _observed(model, paper, timed):
+    seconds, result = timed
+    if model is not None:
+        model.observe(paper[0], paper_size(paper), seconds)
+    return result
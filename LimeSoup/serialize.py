@@ -0,0 +1,82 @@
+"""
+Serialize parse results to JSON bytes, with orjson when it is installed and
+the standard json module otherwise.
+
+The output is canonical: keys sorted, no whitespace, UTF-8 without escaping
+non-ASCII characters. Both backends give the same bytes for parse results
+(str keys, str/list/dict/None/bool/int values), so that the output can be
+hashed or cached whichever backend made it.
+
+    data = dumps(result)              # bytes
+    dump(result, f)                   # f opened in binary mode
+    result = loads(data)
+"""
+import io
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+__all__ = ['backend', 'dumps', 'dump', 'loads']
+
+
+def backend():
+    """
+    :return: 'orjson' or 'json'
+    """
+    return 'json' if orjson is None else 'orjson'
+
+
+def _default(value):
+    # LimeSoup.result.Document and Section
+    to_dict = getattr(value, 'to_dict', None)
+    if to_dict is None:
+        raise TypeError('Object of type %s is not JSON serializable' % type(value).__name__)
+    return to_dict()
+
+
+def _encoder():
+    return json.JSONEncoder(sort_keys=True, ensure_ascii=False, separators=(',', ':'),
+                            default=_default)
+
+
+def dumps(result):
+    """
+    :param result: parse result (dict), or LimeSoup.result.Document.
+    :return: canonical JSON, bytes.
+    """
+    if orjson is not None:
+        return orjson.dumps(result, default=_default, option=orjson.OPT_SORT_KEYS)
+    return _encoder().encode(result).encode('utf-8')
+
+
+def dump(result, fp):
+    """
+    Write the canonical JSON of a result to a binary file. The standard json
+    backend encodes and writes it chunk by chunk, without building the
+    whole JSON string.
+
+    :param fp: file object opened in binary mode, left open.
+    """
+    if orjson is not None:
+        fp.write(orjson.dumps(result, default=_default, option=orjson.OPT_SORT_KEYS))
+        return
+    writer = io.TextIOWrapper(fp, encoding='utf-8', newline='')
+    try:
+        for chunk in _encoder().iterencode(result):
+            writer.write(chunk)
+        writer.flush()
+    finally:
+        writer.detach()
+
+
+def loads(data):
+    """
+    :param data: JSON, bytes or str.
+    :return: the parse result, as dicts.
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
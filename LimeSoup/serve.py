@@ -0,0 +1,305 @@
+"""
+A standalone HTTP parse server, with the standard library only:
+
+    python -m LimeSoup.serve [--host 127.0.0.1] [--port 8080] [--workers 4] [--queue-size 256]
+
+Papers are parsed in a pool of processes, forked and warmed up (soups
+imported, Elsevier entities read from the DTD) before the server accepts
+connections. Connections are kept alive (HTTP/1.1). With --timeout or
+--max-rss (MB), a worker taking longer or more memory for a paper is killed
+and replaced, and the paper gets a failed record (parser_failure 'timeout'
+or 'oom'), see LimeSoup.pool. With --max-docs-per-worker, a worker is
+replaced by a fresh one after parsing that many papers; /health reports the
+memory and garbage collection pauses of the workers.
+
+    POST /parse/<publisher>     parse papers of a publisher
+    POST /parse                 parse papers of any publishers, told from their DOI
+    POST /parse?precheck=1      reject the pages that are no full text (abstracts,
+                                paywalls...) with a failed record instead of parsing
+                                them, see Soup.parse()
+    GET  /health                workers, queued documents, capacity and worker metrics
+    GET  /versions              parser version of every publisher
+
+The body of a POST is either a raw paper (any Content-Type but JSON), or
+JSON: a document ({"html_string": ..., "publisher": ..., "doi": ...}, see
+LimeSoup.batch.document_paper), or a list of documents (raw strings or
+dicts), or {"documents": [...]}. The response is the record of the paper
+(see LimeSoup.batch.parse_record), or the list of records of a batch, as
+canonical JSON (LimeSoup.serialize).
+
+At most --queue-size documents are queued or being parsed at a time. A
+request that would exceed it is refused with 503 Service Unavailable and a
+Retry-After header, instead of waiting. A batch of more documents than that
+can never be parsed, and is refused with 413 Payload Too Large: split it.
+"""
+import argparse
+import http.server
+import json
+import os
+import re
+import threading
+import urllib.parse
+
+from LimeSoup import serialize
+from LimeSoup.batch import document_paper, failed_record, parse_record
+from LimeSoup.pool import LimitedProcessPool
+from LimeSoup.registry import SOUPS
+
+__all__ = ['BoundedQueue', 'ParsePool', 'ParseServer', 'ParseHandler', 'warm_up', 'serve']
+
+PARSE_PATH = re.compile(r'^/parse(?:/([A-Za-z]+))?/?$')
+TRUE = ('1', 'true', 'yes')
+
+
+def warm_up():
+    """
+    Import all the soups and read the Elsevier entities, so that no request
+    pays for it. Done in the server process, whose forked workers inherit
+    them, and again in workers started otherwise. The workers then
+    gc.freeze() all of it, see LimeSoup.pool.
+    """
+    from LimeSoup.parser.elsevier_xml import elsevier_entities
+    elsevier_entities()
+
+
+def _parse(publisher, data, precheck=False):
+    # Serialized in the worker: bytes are much cheaper to send back than
+    # the nested dicts of the result.
+    return serialize.dumps(parse_record(publisher, data, precheck=precheck))
+
+
+class BoundedQueue(object):
+    """
+    Count the documents queued or being parsed, up to a capacity.
+    """
+
+    def __init__(self, capacity):
+        self.capacity = capacity
+        self.size = 0
+        self._lock = threading.Lock()
+
+    def acquire(self, n=1):
+        """
+        :return: True if n more documents fit, and are now counted.
+        """
+        with self._lock:
+            if self.size + n > self.capacity:
+                return False
+            self.size += n
+            return True
+
+    def release(self, n=1):
+        with self._lock:
+            self.size -= n
+
+
+class ParsePool(object):
+    """
+    A pool of warmed-up worker processes, behind a BoundedQueue.
+    """
+
+    def __init__(self, workers=None, queue_size=256, timeout=None, max_rss=None,
+                 max_docs_per_worker=None):
+        """
+        :param timeout: seconds a paper may take, see LimeSoup.pool.
+        :param max_rss: bytes of memory a worker may use for a paper.
+        :param max_docs_per_worker: papers parsed by a worker before it is
+            replaced by a new one, None to keep the workers for good.
+        """
+        self.workers = workers or os.cpu_count() or 1
+        self.queue = BoundedQueue(queue_size)
+        warm_up()
+        # All the workers are started now, rather than on the first requests.
+        self.executor = LimitedProcessPool(self.workers, timeout=timeout, max_rss=max_rss,
+                                           initializer=warm_up, max_tasks_per_worker=max_docs_per_worker)
+
+    def parse(self, papers, precheck=False):
+        """
+        :param papers: list of (publisher, raw paper).
+        :param precheck: see LimeSoup.batch.parse_record.
+        :return: list of the records of the papers, serialized, or None if
+            the queue is full (or the papers are more than it holds).
+        """
+        if not self.queue.acquire(len(papers)):
+            return None
+        try:
+            futures = [self.executor.submit(_parse, publisher, data, precheck) for publisher, data in papers]
+            return [self._result(future, publisher) for future, (publisher, _) in zip(futures, papers)]
+        finally:
+            self.queue.release(len(papers))
+
+    @staticmethod
+    def _result(future, publisher):
+        try:
+            return future.result()
+        except Exception as e:
+            # A DocumentLimitExceeded, or a result that the worker could not
+            # send back: a failed record rather than a dropped connection.
+            return serialize.dumps(failed_record(publisher, e))
+
+    def shutdown(self):
+        self.executor.shutdown()
+
+
+class ParseHandler(http.server.BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    server_version = 'LimeSoup'
+
+    def do_GET(self):
+        if self.path == '/health':
+            pool = self.server.pool
+            self._send(200, serialize.dumps({
+                'status': 'ok',
+                'workers': pool.workers,
+                'queued': pool.queue.size,
+                'capacity': pool.queue.capacity,
+                'metrics': pool.executor.stats(),
+            }))
+        elif self.path == '/versions':
+            self._send(200, serialize.dumps({x: soup.version for x, soup in SOUPS.items()}))
+        else:
+            self._error(404, 'Not found: %s' % self.path)
+
+    def do_POST(self):
+        try:
+            body = self._read_body()
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+        url = urllib.parse.urlsplit(self.path)
+        match = PARSE_PATH.match(url.path)
+        if match is None:
+            self._error(404, 'Not found: %s' % self.path)
+            return
+        publisher = match.group(1) and match.group(1).lower()
+        if publisher is not None and publisher not in SOUPS:
+            self._error(404, 'Unknown publisher %r, choose from: %s' % (publisher, ', '.join(SOUPS)))
+            return
+
+        if body is None:
+            self._error(411, 'Content-Length is required')
+            return
+        try:
+            docs, batch = self._documents(body)
+            papers = [document_paper(doc, publisher) for doc in docs]
+        except ValueError as e:
+            self._error(400, str(e))
+            return
+
+        capacity = self.server.pool.queue.capacity
+        if len(papers) > capacity:
+            self._error(413, 'Batch of %d documents, the server parses at most %d at a time: split it'
+                        % (len(papers), capacity))
+            return
+        query = urllib.parse.parse_qs(url.query)
+        precheck = query.get('precheck', ['0'])[-1].lower() in TRUE
+        records = self.server.pool.parse(papers, precheck)
+        if records is None:
+            self._error(503, 'Too many documents queued, retry later', {'Retry-After': '1'})
+        elif batch:
+            self._send(200, b'[' + b','.join(records) + b']')
+        else:
+            self._send(200, records[0])
+
+    def _read_body(self):
+        """
+        :return: the body of the request, or None without a Content-Length.
+        :raises ValueError: if the Content-Length is not a length.
+        """
+        length = self.headers.get('Content-Length')
+        if length is None:
+            self.close_connection = True
+            return None
+        try:
+            size = int(length)
+        except ValueError:
+            size = -1
+        if size < 0:
+            # Where the body ends is unknown, so is the next request.
+            self.close_connection = True
+            raise ValueError('Invalid Content-Length: %r' % length)
+        return self.rfile.read(size)
+
+    def _documents(self, body):
+        """
+        :return: (list of documents, True if the request is a batch)
+        """
+        content_type = self.headers.get('Content-Type', '').split(';')[0].strip().lower()
+        if content_type != 'application/json':
+            return [body], False
+        try:
+            payload = json.loads(body)
+        except ValueError as e:
+            raise ValueError('Invalid JSON: %s' % e)
+        if isinstance(payload, dict) and 'documents' in payload:
+            payload = payload['documents']
+        if isinstance(payload, list):
+            return payload, True
+        if isinstance(payload, (dict, str)):
+            return [payload], False
+        raise ValueError('Expected a document or a list of documents')
+
+    def _send(self, status, body, headers=None):
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _error(self, status, message, headers=None):
+        self._send(status, serialize.dumps({'error': message}), headers)
+
+    def log_message(self, format, *args):
+        if self.server.verbose:
+            super(ParseHandler, self).log_message(format, *args)
+
+
+class ParseServer(http.server.ThreadingHTTPServer):
+    """
+    One thread per connection, parsing in the processes of a ParsePool.
+    """
+    daemon_threads = True
+
+    def __init__(self, address, pool, verbose=False):
+        super(ParseServer, self).__init__(address, ParseHandler)
+        self.pool = pool
+        self.verbose = verbose
+
+
+def serve(host='127.0.0.1', port=8080, workers=None, queue_size=256, verbose=False, timeout=None,
+          max_rss=None, max_docs_per_worker=None):
+    pool = ParsePool(workers, queue_size, timeout, max_rss, max_docs_per_worker)
+    server = ParseServer((host, port), pool, verbose)
+    print('LimeSoup serving on http://%s:%d with %d workers' % (host, server.server_port, pool.workers))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        pool.shutdown()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Serve the LimeSoup parsers over HTTP.')
+    arg_parser.add_argument('--host', default='127.0.0.1')
+    arg_parser.add_argument('--port', type=int, default=8080)
+    arg_parser.add_argument('--workers', type=int, help='worker processes, by default the CPU count')
+    arg_parser.add_argument('--queue-size', type=int, default=256,
+                            help='documents queued or being parsed before refusing requests (503)')
+    arg_parser.add_argument('--timeout', type=float,
+                            help='seconds a paper may take before its worker is killed (timeout failure)')
+    arg_parser.add_argument('--max-rss', type=float,
+                            help='MB of memory a worker may use for a paper before it is killed (oom failure)')
+    arg_parser.add_argument('--max-docs-per-worker', type=int,
+                            help='papers parsed by a worker before it is replaced by a new one')
+    arg_parser.add_argument('--verbose', action='store_true', help='log every request')
+    args = arg_parser.parse_args(argv)
+    serve(args.host, args.port, args.workers, args.queue_size, args.verbose, args.timeout,
+          int(args.max_rss * 1024 * 1024) if args.max_rss else None, args.max_docs_per_worker)
+
+
+if __name__ == '__main__':
+    main()
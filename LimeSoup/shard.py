@@ -0,0 +1,309 @@
+"""
+Split a batch over machines, and merge the outputs.
+
+Each machine runs the batch runner on the same inputs with its own shard,
+0-based:
+
+    python -m LimeSoup.batch corpus/ --output shard-0.jsonl.gz --shard 0/4
+    ...
+    python -m LimeSoup.batch corpus/ --output shard-3.jsonl.gz --shard 3/4
+
+A paper belongs to shard i of N when a stable hash of its key, modulo N, is
+i. The key of a paper is its path relative to the input it was listed
+from: from the input directory for a paper file, from the archive (and its
+directory) for a tar member or a line of JSON lines without DOI, see
+paper_key(). Machines with the corpus mounted at different places, or given
+it as corpus/ or /mnt/data/corpus/, agree on the shards: give them the same
+inputs. The key of a paper with a DOI in JSON lines is the DOI. The key is
+the 'key' of the record, and a rerun of a shard parses the same papers. Each run writes a manifest next to
+its output (shard-0.jsonl.gz.manifest.json) with the shard, the keys of the
+papers parsed, the failures (by error type and stage) and the parser versions
+used.
+
+The merge command checks the manifests and the outputs, and writes all the
+records to one sink:
+
+    python -m LimeSoup.shard shard-*.jsonl.gz --output papers.jsonl.gz [--inputs corpus/]
+
+It reports missing or duplicated shards, papers in the wrong shard, papers
+found in several shards or missing from an output, papers of --inputs that
+no shard parsed, and publishers parsed with different parser versions. A
+paper found twice is written once. The exit status is 1 if anything is
+wrong.
+"""
+import argparse
+import collections
+import hashlib
+import json
+import os
+import re
+import sys
+import time
+
+from LimeSoup.errors import count_errors
+from LimeSoup.readers import open_binary
+from LimeSoup.sinks import open_sink
+
+__all__ = ['parse_shard', 'format_shard', 'shard_of', 'paper_key', 'record_key', 'content_key',
+           'select_shard', 'Manifest', 'manifest_filename', 'read_records', 'merge']
+
+SHARD_SPEC = re.compile(r'^\s*(\d+)\s*/\s*(\d+)\s*$')
+JSONL_OUTPUT = re.compile(r'\.jsonl?(?:\.gz|\.zst|\.zstd)?$', re.IGNORECASE)
+
+
+def parse_shard(shard):
+    """
+    :param shard: 'i/N', (i, N) or None.
+    :return: (i, N) with 0 <= i < N, or None.
+    """
+    if shard is None:
+        return None
+    if isinstance(shard, str):
+        match = SHARD_SPEC.match(shard)
+        if match is None:
+            raise ValueError('Invalid shard %r, expected i/N' % shard)
+        shard = int(match.group(1)), int(match.group(2))
+    index, count = shard
+    if not 0 <= index < count:
+        raise ValueError('Invalid shard %d/%d, expected 0 <= i < N' % (index, count))
+    return index, count
+
+
+def format_shard(shard):
+    return '%d/%d' % shard
+
+
+def shard_of(key, count):
+    """
+    :param key: str or bytes identifying a paper.
+    :return: shard of the paper, the same on every machine and Python run
+        (unlike hash()).
+    """
+    if isinstance(key, str):
+        key = key.encode('utf-8')
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), 'big') % count
+
+
+def paper_key(paper, inputs=None):
+    """
+    :param paper: (publisher, path) or (publisher, name, data), see
+        LimeSoup.batch.iter_papers.
+    :param inputs: the paths the papers were listed from, None to key the
+        papers by their path or name as listed.
+    :return: the path or name of the paper relative to the input it was
+        listed from ('/'-separated): under an input directory, the path from
+        that directory (corpus/a.tar/nature/p.html is a.tar/nature/p.html);
+        under an input file, from the name of that file (a.tar/nature/p.html,
+        papers.jsonl:3). A name not listed from an input (a DOI in JSON
+        lines) is kept. Also the 'key' of its record.
+    """
+    name = paper[1]
+    if inputs is None:
+        return name
+    for root in inputs:
+        base = root.rstrip('/' + os.sep) or root
+        if not name.startswith(base):
+            continue
+        rest = name[len(base):]
+        if rest and rest[0] not in ('/', os.sep, ':'):
+            continue
+        if os.path.isdir(root):
+            key = rest[1:]
+        else:
+            key = os.path.basename(base) + rest
+        return key.replace(os.sep, '/')
+    return name
+
+
+def content_key(raw):
+    """
+    :param raw: raw paper, str or bytes-like.
+    :return: digest of the paper, the key of papers without path or DOI.
+    """
+    if isinstance(raw, str):
+        raw = raw.encode('utf-8')
+    return hashlib.blake2b(raw, digest_size=16).digest()
+
+
+def select_shard(items, shard, key=paper_key):
+    """
+    :param shard: (i, N) or 'i/N'.
+    :param key: function of an item giving its key.
+    :return: generator of the items of the shard.
+    """
+    index, count = parse_shard(shard)
+    for item in items:
+        if shard_of(key(item), count) == index:
+            yield item
+
+
+def manifest_filename(output):
+    return output + '.manifest.json'
+
+
+class Manifest(object):
+    """
+    What a (shard of a) batch run did, built from its records.
+    """
+
+    def __init__(self, shard=None, inputs=None):
+        """
+        :param shard: (i, N), 'i/N' or None for all the papers.
+        :param inputs: paths given to the batch runner.
+        """
+        self.shard = parse_shard(shard)
+        self.inputs = list(inputs or ())
+        self.keys = []
+        self.failures = collections.Counter()
+        self.errors = collections.Counter()
+        self.parser_versions = collections.defaultdict(set)
+        self.started = time.time()
+        self.finished = None
+
+    def add(self, record):
+        self.keys.append(record_key(record))
+        if not record['parser_successful']:
+            self.failures[record['parser_failure'] or 'error'] += 1
+            self.errors[record.get('parser_error_type'), record.get('parser_error_stage')] += 1
+        if record['parser_version'] is not None:
+            self.parser_versions[record['publisher']].add(record['parser_version'])
+
+    def to_dict(self):
+        failed = sum(self.failures.values())
+        return {
+            'shard': format_shard(self.shard) if self.shard else None,
+            'inputs': self.inputs,
+            'started': self.started,
+            'finished': self.finished,
+            'documents': len(self.keys),
+            'successful': len(self.keys) - failed,
+            'failed': failed,
+            'failures': dict(self.failures),
+            'errors': count_errors(self.errors),
+            'parser_versions': {x: sorted(v) for x, v in sorted(self.parser_versions.items())},
+            'keys': sorted(self.keys),
+        }
+
+    def write(self, filename):
+        self.finished = time.time()
+        with open(filename, 'w') as f:
+            json.dump(self.to_dict(), f, indent=1)
+
+    @staticmethod
+    def read(filename):
+        """
+        :return: the manifest, as a dict (see to_dict).
+        """
+        with open(filename) as f:
+            return json.load(f)
+
+
+def read_records(filename):
+    """
+    :param filename: JSON lines output of the batch runner, compressed or not.
+    :return: generator of records.
+    """
+    if JSONL_OUTPUT.search(filename) is None:
+        raise ValueError('Can only merge JSON lines outputs, not %s' % filename)
+    with open_binary(filename) as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+
+def record_key(record):
+    """
+    :return: the key of the paper of a record, see paper_key. Records of
+        earlier versions have none, their path was the key.
+    """
+    return record.get('key', record['path'])
+
+
+def _expected_keys(inputs, publisher=None, data_key=None):
+    from LimeSoup.batch import iter_papers
+    return {paper_key(paper, inputs) for paper in iter_papers(inputs, publisher, data_key)}
+
+
+def merge(outputs, sink, inputs=None, publisher=None, data_key=None):
+    """
+    Check the shard outputs against their manifests, and write their records
+    to a sink, each paper once.
+
+    :param outputs: JSON lines outputs of the shards, each with its manifest.
+    :param sink: a LimeSoup.sinks.Sink, not closed.
+    :param inputs: inputs of the batch, to check that no paper is missing,
+        or None to check against the manifests only.
+    :return: report dict: shards, documents written, and lists of problems
+        (empty if the merge is complete).
+    """
+    manifests = [Manifest.read(manifest_filename(x)) for x in outputs]
+    problems = collections.OrderedDict((x, []) for x in (
+        'shards', 'wrong_shard', 'duplicated', 'missing_from_output', 'not_in_manifest',
+        'missing', 'parser_versions'))
+
+    counts = {parse_shard(x['shard'])[1] if x['shard'] else 1 for x in manifests}
+    if len(counts) != 1:
+        problems['shards'].append('shards of different splits: %s' % ', '.join(
+            '%s (%s)' % (output, x['shard']) for output, x in zip(outputs, manifests)))
+    count = max(counts) if counts else 1
+    shards = collections.Counter(parse_shard(x['shard'])[0] if x['shard'] else 0 for x in manifests)
+    problems['shards'].extend('shard %d/%d is missing' % (i, count) for i in range(count) if i not in shards)
+    problems['shards'].extend('shard %d/%d is given %d times' % (i, count, n)
+                              for i, n in sorted(shards.items()) if n > 1)
+
+    versions = collections.defaultdict(set)
+    for manifest in manifests:
+        for publisher_name, parser_versions in manifest['parser_versions'].items():
+            versions[publisher_name].update(parser_versions)
+    problems['parser_versions'] = ['%s parsed with versions %s' % (x, ', '.join(sorted(v)))
+                                   for x, v in sorted(versions.items()) if len(v) > 1]
+
+    seen = set()
+    documents = 0
+    for output, manifest in zip(outputs, manifests):
+        index = parse_shard(manifest['shard'])[0] if manifest['shard'] else 0
+        listed = set(manifest['keys'])
+        problems['wrong_shard'].extend(
+            key for key in manifest['keys'] if count > 1 and shard_of(key, count) != index)
+        present = set()
+        for record in read_records(output):
+            key = record_key(record)
+            present.add(key)
+            if key not in listed:
+                problems['not_in_manifest'].append(key)
+            if key in seen:
+                problems['duplicated'].append(key)
+                continue
+            seen.add(key)
+            sink.write(record)
+            documents += 1
+        problems['missing_from_output'].extend(sorted(listed - present))
+
+    if inputs is not None:
+        problems['missing'] = sorted(_expected_keys(inputs, publisher, data_key) - seen)
+    return {
+        'shards': len(manifests),
+        'documents': documents,
+        'problems': {x: v for x, v in problems.items() if v},
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description='Check and merge the outputs of sharded batch runs.')
+    arg_parser.add_argument('outputs', nargs='+', help='JSON lines outputs of the shards, with their manifests')
+    arg_parser.add_argument('--output', '-o', required=True, help='merged output, any sink of LimeSoup.batch')
+    arg_parser.add_argument('--inputs', nargs='*', help='inputs of the batch, to check that no paper is missing')
+    arg_parser.add_argument('--publisher', help='--publisher given to the batch runs')
+    arg_parser.add_argument('--data-key', help='--data-key given to the batch runs')
+    args = arg_parser.parse_args(argv)
+
+    with open_sink(args.output) as sink:
+        report = merge(args.outputs, sink, args.inputs, args.publisher, args.data_key)
+    print('%(documents)d documents merged from %(shards)d shards' % report)
+    for problem, values in report['problems'].items():
+        print('%s (%d): %s' % (problem, len(values), ', '.join(values[:10]) + (', ...' if len(values) > 10 else '')))
+    return 1 if report['problems'] else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""
+Sinks collect parse results and write them in batches, so that writing to a
+file or a database is not a round trip per document.
+
+A sink buffers the records given to write() and flushes them when
+batch_size records are buffered, or when the oldest buffered record is
+older than flush_interval seconds (checked on write). Closing a sink
+flushes what is left; sinks are context managers:
+
+    with open_sink('papers.jsonl.gz') as sink:
+        for record in records:
+            sink.write(record)
+
+Records are JSON-serializable dicts, such as the ones made by
+LimeSoup.batch.parse_file. Their values can also be compact results
+(LimeSoup.result.Document), converted to dicts only when written. JSON is
+written canonical (sorted keys) by LimeSoup.serialize.
+"""
+import gzip
+import sqlite3
+import time
+
+from LimeSoup.serialize import dumps
+
+__all__ = ['Sink', 'JSONLSink', 'GzipJSONLSink', 'SQLiteSink', 'CallbackSink', 'open_sink']
+
+
+class Sink(object):
+    """
+    Base class of the sinks. Subclasses implement _write_batch(), and
+    _close() if they hold resources.
+    """
+
+    def __init__(self, batch_size=100, flush_interval=5.0):
+        """
+        :param batch_size: flush when that many records are buffered.
+        :param flush_interval: flush on write when the oldest buffered record
+            is older than that many seconds, None to flush by size only.
+        """
+        if batch_size < 1:
+            raise ValueError('batch_size must be at least 1')
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.written = 0
+        self._buffer = []
+        self._buffered_since = None
+        self._closed = False
+
+    def write(self, record):
+        if self._closed:
+            raise ValueError('Write to a closed sink')
+        if not self._buffer:
+            self._buffered_since = time.monotonic()
+        self._buffer.append(record)
+        if len(self._buffer) >= self.batch_size or (
+                self.flush_interval is not None and
+                time.monotonic() - self._buffered_since >= self.flush_interval):
+            self.flush()
+
+    def write_many(self, records):
+        for record in records:
+            self.write(record)
+
+    def flush(self):
+        if not self._buffer:
+            return
+        records, self._buffer = self._buffer, []
+        self._write_batch(records)
+        self.written += len(records)
+
+    def close(self):
+        if self._closed:
+            return
+        try:
+            self.flush()
+        finally:
+            self._closed = True
+            self._close()
+
+    def _write_batch(self, records):
+        raise NotImplementedError
+
+    def _close(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+
+class JSONLSink(Sink):
+    """
+    One JSON document per line. Each batch is a single write call of
+    bytes.
+    """
+
+    def __init__(self, filename, append=False, **kwargs):
+        super(JSONLSink, self).__init__(**kwargs)
+        self.filename = filename
+        self._file = self._open(filename, 'ab' if append else 'wb')
+
+    @staticmethod
+    def _open(filename, mode):
+        return open(filename, mode)
+
+    def _write_batch(self, records):
+        self._file.write(b''.join(dumps(record) + b'\n' for record in records))
+        self._file.flush()
+
+    def _close(self):
+        self._file.close()
+
+
+class GzipJSONLSink(JSONLSink):
+    """
+    Gzip compressed JSONL. Appending adds a gzip member, which gzip readers
+    handle transparently.
+    """
+
+    def __init__(self, filename, append=False, compresslevel=6, **kwargs):
+        self.compresslevel = compresslevel
+        super(GzipJSONLSink, self).__init__(filename, append=append, **kwargs)
+
+    def _open(self, filename, mode):
+        return gzip.open(filename, mode, compresslevel=self.compresslevel)
+
+
+class SQLiteSink(Sink):
+    """
+    Rows of a SQLite table, inserted with executemany, one transaction per
+    batch. Values that are not str, int, float or None (results, lists) are
+    stored as JSON text.
+    """
+
+    DEFAULT_COLUMNS = ('path', 'publisher', 'DOI', 'parser_version',
+                       'parser_successful', 'parser_error', 'result')
+
+    def __init__(self, database, table='papers', columns=DEFAULT_COLUMNS, replace=False, **kwargs):
+        """
+        :param database: file name, or an open sqlite3.Connection (which is
+            not closed by the sink).
+        :param table: created if it does not exist.
+        :param columns: record keys stored as columns, missing keys are NULL.
+        :param replace: INSERT OR REPLACE instead of INSERT, for tables with a
+            unique key.
+        """
+        super(SQLiteSink, self).__init__(**kwargs)
+        self.table = table
+        self.columns = tuple(columns)
+        if isinstance(database, sqlite3.Connection):
+            self._connection = database
+            self._owns_connection = False
+        else:
+            self._connection = sqlite3.connect(database)
+            self._owns_connection = True
+        with self._connection:
+            self._connection.execute('CREATE TABLE IF NOT EXISTS "%s" (%s)' % (
+                table, ', '.join('"%s"' % x for x in self.columns)))
+        self._insert = '%s INTO "%s" (%s) VALUES (%s)' % (
+            'INSERT OR REPLACE' if replace else 'INSERT', table,
+            ', '.join('"%s"' % x for x in self.columns), ', '.join('?' * len(self.columns)))
+
+    @staticmethod
+    def _to_sql(value):
+        if value is None or isinstance(value, (str, int, float)):
+            return value
+        return dumps(value).decode('utf-8')
+
+    def _write_batch(self, records):
+        rows = [tuple(self._to_sql(record.get(x)) for x in self.columns) for record in records]
+        with self._connection:
+            self._connection.executemany(self._insert, rows)
+
+    def _close(self):
+        if self._owns_connection:
+            self._connection.close()
+
+
+class CallbackSink(Sink):
+    """
+    Hands each batch, a list of records, to a function. For document stores
+    with a bulk API, e.g. CallbackSink(collection.insert_many).
+    """
+
+    def __init__(self, callback, **kwargs):
+        super(CallbackSink, self).__init__(**kwargs)
+        self.callback = callback
+
+    def _write_batch(self, records):
+        self.callback(records)
+
+
+def open_sink(filename, **kwargs):
+    """
+    Open a sink by file extension: .jsonl.gz, .jsonl (or .json), .sqlite
+    (or .sqlite3, .db), or .parquet for the paragraphs (see LimeSoup.export).
+
+    :param kwargs: passed to the sink, e.g. batch_size, flush_interval.
+    """
+    lower = filename.lower()
+    if lower.endswith('.gz'):
+        return GzipJSONLSink(filename, **kwargs)
+    if lower.endswith(('.jsonl', '.json')):
+        return JSONLSink(filename, **kwargs)
+    if lower.endswith(('.sqlite', '.sqlite3', '.db')):
+        return SQLiteSink(filename, **kwargs)
+    if lower.endswith('.parquet'):
+        from LimeSoup.export import ParquetSink
+        return ParquetSink(filename, **kwargs)
+    raise ValueError('Cannot tell the sink of %r, use .jsonl, .jsonl.gz, .sqlite or .parquet' % filename)
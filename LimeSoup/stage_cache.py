@@ -0,0 +1,111 @@
+"""
+A cache of the outputs of the rule ingredients, to rerun only the stages
+that changed.
+
+When an ingredient of a soup changes, the fingerprints of the pipeline from
+that ingredient on change (see Soup.fingerprints), and the outputs of the
+ingredients before it stay valid. Soup.parse_cached() resumes from the
+output of the last ingredient whose fingerprint is found in the cache:
+
+    cache = StageCache('stages.sqlite')
+    result = NatureSoup.parse_cached(html_str, cache)
+
+Only outputs made of plain data (str, bytes, numbers, lists, tuples and
+dicts of them) are cached: the bs4 trees and ParserPaper objects that some
+ingredients hand over are neither cheap nor safe to pickle. The batch
+runner takes a cache with --stage-cache.
+
+The cache is a SQLite file, shared by the threads and processes of a
+batch, each with its own connection.
+"""
+import hashlib
+import os
+import pickle
+import sqlite3
+import threading
+
+__all__ = ['StageCache', 'cacheable']
+
+PLAIN_TYPES = (str, bytes, int, float, bool, type(None))
+
+
+def cacheable(value):
+    """
+    :return: True if value is made of plain data only.
+    """
+    if isinstance(value, PLAIN_TYPES):
+        return True
+    if type(value) in (list, tuple):
+        return all(cacheable(x) for x in value)
+    if type(value) is dict:
+        return all(isinstance(k, str) and cacheable(v) for k, v in value.items())
+    return False
+
+
+class StageCache(object):
+    def __init__(self, filename):
+        """
+        :param filename: SQLite database, created if it does not exist.
+        """
+        self.filename = filename
+        self._local = threading.local()
+        with self._connection() as connection:
+            connection.execute('CREATE TABLE IF NOT EXISTS stages ('
+                               'key TEXT, fingerprint TEXT, value BLOB, PRIMARY KEY (key, fingerprint))')
+
+    def __getstate__(self):
+        # Sent to worker processes, which open their own connections.
+        return {'filename': self.filename}
+
+    def __setstate__(self, state):
+        self.filename = state['filename']
+        self._local = threading.local()
+
+    def _connection(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is None or self._local.pid != os.getpid():
+            connection = sqlite3.connect(self.filename, timeout=60)
+            connection.execute('PRAGMA journal_mode=WAL')
+            connection.execute('PRAGMA synchronous=NORMAL')
+            self._local.connection, self._local.pid = connection, os.getpid()
+        return connection
+
+    @staticmethod
+    def key(raw):
+        """
+        :param raw: raw paper, str or bytes-like.
+        :return: key of the paper, a digest of its content.
+        """
+        if isinstance(raw, str):
+            raw = raw.encode('utf-8')
+        return hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+    def get(self, key, fingerprint):
+        """
+        :return: the output cached for the stage, None if there is none.
+        """
+        row = self._connection().execute(
+            'SELECT value FROM stages WHERE key = ? AND fingerprint = ?', (key, fingerprint)).fetchone()
+        return pickle.loads(row[0]) if row is not None else None
+
+    def put(self, key, fingerprint, value):
+        """
+        Cache the output of a stage, if it is plain data.
+
+        :return: True if it was cached.
+        """
+        if value is None or not cacheable(value):
+            return False
+        with self._connection() as connection:
+            connection.execute('INSERT OR REPLACE INTO stages VALUES (?, ?, ?)',
+                               (key, fingerprint, pickle.dumps(value, pickle.HIGHEST_PROTOCOL)))
+        return True
+
+    def __len__(self):
+        return self._connection().execute('SELECT COUNT(*) FROM stages').fetchone()[0]
+
+    def close(self):
+        connection = getattr(self._local, 'connection', None)
+        if connection is not None:
+            connection.close()
+            self._local.connection = None
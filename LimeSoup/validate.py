@@ -0,0 +1,98 @@
+"""
+Pre-flight validation of papers: tell, before parsing them, the pages that
+are no full text (paywall stubs, cookie walls, error pages, abstracts,
+landing pages) or no markup at all.
+
+The verdict of a paper comes from the precheck of the soup of its publisher
+(see LimeSoup.parser.prechecks): a scan of its bytes for markers of the
+article body that the parser needs, such as fulltext-view (ECS),
+data-article-body (Nature), <ce:sections> (Elsevier XML) or <body> (JATS).
+Files are read by chunks, up to the first body marker, so that most papers
+are validated without reading them whole, in microseconds:
+
+    verdict = validate_paper(('nature', 'corpus/nature/paper.html'))
+    if not verdict.ok:
+        print(verdict.reason)       # e.g. 'paywall'
+
+The batch runner skips the papers that fail, with a record whose
+parser_failure is 'rejected'. As a script, count the verdicts of files:
+
+    python -m LimeSoup.validate corpus/ [--publisher nature] [--list]
+"""
+import argparse
+import collections
+import sys
+
+from LimeSoup.parser.prechecks import CHUNK_SIZE, Precheck
+from LimeSoup.readers import open_binary
+from LimeSoup.registry import get_soup
+
+__all__ = ['precheck_of', 'validate', 'validate_file', 'validate_paper']
+
+# Soups without a precheck: the markup is checked, not the body
+GENERIC = Precheck()
+
+
+def precheck_of(publisher):
+    """
+    :return: the Precheck of the soup of a publisher.
+    """
+    return get_soup(publisher).precheck or GENERIC
+
+
+def validate(publisher, raw, encoding=None):
+    """
+    :param raw: raw paper, str or bytes-like (bytes, mmap, memoryview).
+    :param encoding: encoding of bytes, None if it is not known. Papers in
+        an encoding other than ASCII-compatible ones are not checked.
+    :return: LimeSoup.parser.prechecks.Verdict.
+    """
+    return precheck_of(publisher).verdict(raw, encoding)
+
+
+def validate_file(publisher, path, chunk_size=CHUNK_SIZE, encoding=None):
+    """
+    :param path: file of a single paper, compressed or not.
+    :param encoding: see validate.
+    :return: LimeSoup.parser.prechecks.Verdict.
+    """
+    with open_binary(path) as f:
+        return precheck_of(publisher).scan_file(f, chunk_size, encoding)
+
+
+def validate_paper(paper, encoding=None):
+    """
+    :param paper: (publisher, path) or (publisher, name, data), see
+        LimeSoup.batch.iter_papers.
+    :param encoding: see validate.
+    :return: LimeSoup.parser.prechecks.Verdict.
+    """
+    if len(paper) > 2:
+        return validate(paper[0], paper[2], encoding)
+    return validate_file(paper[0], paper[1], encoding=encoding)
+
+
+def main(argv=None):
+    from LimeSoup.batch import iter_papers
+
+    arg_parser = argparse.ArgumentParser(description='Count the papers that are no full text, without parsing.')
+    arg_parser.add_argument('paths', nargs='+', help='paper files, archives or directories, see LimeSoup.batch')
+    arg_parser.add_argument('--publisher', help='publisher of all the files, by default their directory name')
+    arg_parser.add_argument('--data-key', help='key of the raw paper in JSON lines')
+    arg_parser.add_argument('--encoding', help='encoding of the papers, by default sniffed from the markup')
+    arg_parser.add_argument('--list', action='store_true', help='print the papers rejected, with the reason')
+    args = arg_parser.parse_args(argv)
+
+    verdicts = collections.Counter()
+    for paper in iter_papers(args.paths, args.publisher, args.data_key):
+        verdict = validate_paper(paper, args.encoding)
+        verdicts[paper[0], verdict.reason or 'ok'] += 1
+        if args.list and not verdict.ok:
+            print('%s\t%s' % (paper[1], verdict.reason))
+    for (publisher, reason), count in sorted(verdicts.items()):
+        print('%8d %s %s' % (count, publisher, reason))
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,92 @@
+"""
+Compare parsing raw bytes with decoding them to str first, per publisher:
+peak memory allocated by Python (tracemalloc) and parsing time.
+
+    python -m benchmarks.bench_bytes [--corpus <corpus>] [--paragraphs 256]
+
+Without a corpus, synthetic papers are used. Memory allocated by lxml and
+libxml2 is not traced, only the copies made in Python (decoded strings,
+slices, formatted strings).
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import list_corpus
+from benchmarks.synthetic import make_paper
+
+
+def peak_allocated(function, data):
+    """
+    :return: peak bytes allocated by Python while function(data) runs.
+    """
+    # Garbage of the previous parse (bs4 trees are cyclic) must not count.
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        function(data)
+        return tracemalloc.get_traced_memory()[1] - before
+    finally:
+        tracemalloc.stop()
+
+
+def best_time(function, papers, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for paper in papers:
+            function(paper)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def load_papers(args):
+    papers = {}
+    if args.corpus:
+        for publisher, filenames in list_corpus(args.corpus, args.publishers).items():
+            papers[publisher] = []
+            for filename in filenames:
+                with open(filename, 'rb') as f:
+                    papers[publisher].append(f.read())
+    else:
+        for publisher in args.publishers or SOUPS:
+            papers[publisher] = [make_paper(publisher, args.paragraphs).encode('utf-8')]
+    return papers
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--paragraphs', type=int, default=256,
+                            help='paragraphs of the synthetic papers')
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    args = arg_parser.parse_args(argv)
+
+    print('%-10s %8s %12s %12s %10s %10s' % (
+        'publisher', 'KB', 'str peak KB', 'bytes peak KB', 'str ms', 'bytes ms'))
+    for publisher, papers in load_papers(args).items():
+        if not papers:
+            continue
+        soup = SOUPS[publisher]
+        decoded = lambda data: soup.parse(data.decode('utf-8'))
+        # Warm up caches (regexes, entity tables) before measuring.
+        decoded(papers[0])
+        soup.parse(papers[0])
+        str_peak = max(peak_allocated(decoded, x) for x in papers)
+        bytes_peak = max(peak_allocated(soup.parse, x) for x in papers)
+        str_seconds = best_time(decoded, papers, args.repeat)
+        bytes_seconds = best_time(soup.parse, papers, args.repeat)
+        print('%-10s %8.0f %12.0f %12.0f %10.2f %10.2f' % (
+            publisher, sum(len(x) for x in papers) / 1024 / len(papers),
+            str_peak / 1024, bytes_peak / 1024,
+            str_seconds * 1000 / len(papers), bytes_seconds * 1000 / len(papers)))
+
+
+if __name__ == '__main__':
+    main()
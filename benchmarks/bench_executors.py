@@ -0,0 +1,73 @@
+"""
+Compare the throughput of Soup.parse_many() with threads and processes,
+per publisher, on the same machine.
+
+    python -m benchmarks.bench_executors <corpus> [--workers 4] [--repeat 3]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+
+from LimeSoup.batch import gil_disabled
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import load_corpus
+
+
+def time_executor(soup, papers, executor, workers, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        results = list(soup.parse_many(
+            papers, executor=executor, max_workers=workers, return_exceptions=True))
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    errors = sum(isinstance(x, Exception) for x in results)
+    return {
+        'seconds': best,
+        'docs_per_sec': len(papers) / best if best else float('inf'),
+        'errors': errors,
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--executors', nargs='*', default=['serial', 'thread', 'process'])
+    arg_parser.add_argument('--workers', type=int, default=os.cpu_count())
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', help='also write the results to this file')
+    args = arg_parser.parse_args(argv)
+
+    print('Python %s, GIL disabled: %s, %d workers' % (
+        sys.version.split()[0], gil_disabled(), args.workers))
+    print('%-10s %6s' % ('publisher', 'docs') +
+          ''.join(' %14s' % ('%s docs/s' % x) for x in args.executors))
+
+    report = {}
+    for publisher, papers in load_corpus(args.corpus, args.publishers).items():
+        texts = [text for _, text in papers]
+        if not texts:
+            continue
+        report[publisher] = {
+            executor: time_executor(SOUPS[publisher], texts, executor, args.workers, args.repeat)
+            for executor in args.executors
+        }
+        print('%-10s %6d' % (publisher, len(texts)) + ''.join(
+            ' %14.1f' % report[publisher][x]['docs_per_sec'] for x in args.executors))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'python': sys.version,
+                'gil_disabled': gil_disabled(),
+                'workers': args.workers,
+                'publishers': report,
+            }, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+"""
+Compare Soup.parse_metadata() with Soup.parse(), per publisher.
+
+    python -m benchmarks.bench_metadata <corpus> [--repeat 3]
+"""
+import argparse
+import json
+import time
+
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import load_corpus
+
+
+def time_function(function, papers, repeat):
+    best = None
+    for _ in range(repeat):
+        errors = 0
+        start = time.perf_counter()
+        for paper in papers:
+            try:
+                function(paper)
+            except Exception:
+                errors += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return {
+        'seconds': best,
+        'docs_per_sec': len(papers) / best if best else float('inf'),
+        'errors': errors,
+    }
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', help='also write the results to this file')
+    args = arg_parser.parse_args(argv)
+
+    print('%-10s %6s %14s %14s %8s' % ('publisher', 'docs', 'parse docs/s', 'meta docs/s', 'speedup'))
+
+    report = {}
+    for publisher, papers in load_corpus(args.corpus, args.publishers).items():
+        texts = [text for _, text in papers]
+        if not texts:
+            continue
+        soup = SOUPS[publisher]
+        full = time_function(soup.parse, texts, args.repeat)
+        metadata = time_function(soup.parse_metadata, texts, args.repeat)
+        report[publisher] = {'parse': full, 'parse_metadata': metadata}
+        print('%-10s %6d %14.1f %14.1f %7.1fx' % (
+            publisher, len(texts), full['docs_per_sec'], metadata['docs_per_sec'],
+            full['seconds'] / metadata['seconds'] if metadata['seconds'] else float('inf')))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the memory and garbage collection pauses of long-running worker
+processes with and without decompose() of the bs4 trees, gc.freeze() after
+warm-up and recycling of the workers.
+
+    python -m benchmarks.bench_recycling [--corpus <corpus>] [--documents 2000] [--workers 4] [--max-docs 500]
+
+Without a corpus, synthetic papers are used, parsed over and over. Max RSS
+is the largest resident memory of a worker after a paper.
+"""
+import argparse
+import itertools
+import time
+
+from LimeSoup.batch import parse_records
+from LimeSoup.pool import LimitedProcessPool
+from LimeSoup.registry import SOUPS
+from LimeSoup.serve import warm_up
+
+from benchmarks.bench_bytes import load_papers
+
+
+def configure(decompose):
+    from LimeSoup.parser import trees
+    trees.DECOMPOSE = decompose
+    warm_up()
+
+
+def run(papers, documents, workers, decompose, gc_freeze, max_docs):
+    pool = LimitedProcessPool(workers, initializer=configure, initargs=(decompose,), gc_freeze=gc_freeze,
+                              max_tasks_per_worker=max_docs)
+    with pool:
+        start = time.perf_counter()
+        for _ in parse_records(itertools.islice(itertools.cycle(papers), documents), executor=pool):
+            pass
+        elapsed = time.perf_counter() - start
+    return elapsed, pool.stats()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--paragraphs', type=int, default=64,
+                            help='paragraphs of the synthetic papers')
+    arg_parser.add_argument('--documents', type=int, default=2000)
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--max-docs', type=int, default=500, help='papers per worker when recycling')
+    args = arg_parser.parse_args(argv)
+
+    papers = [(publisher, data) for publisher, datas in load_papers(args).items() for data in datas]
+    configurations = [
+        ('gc only', False, False, None),
+        ('decompose', True, False, None),
+        ('decompose, freeze', True, True, None),
+        ('decompose, freeze, recycle', True, True, args.max_docs),
+    ]
+    print('%-28s %8s %12s %8s %10s %12s %10s' % (
+        'configuration', 'docs/s', 'max RSS MB', 'GCs', 'GC ms', 'max GC ms', 'recycled'))
+    for name, decompose, gc_freeze, max_docs in configurations:
+        elapsed, stats = run(papers, args.documents, args.workers, decompose, gc_freeze, max_docs)
+        print('%-28s %8.0f %12.1f %8d %10.1f %12.2f %10d' % (
+            name, args.documents / elapsed, stats['max_rss'] / 2 ** 20, stats['gc_collections'],
+            stats['gc_pause'] * 1000, stats['gc_max_pause'] * 1000, stats['workers_recycled']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare parse results held as dicts with the compact model of
+LimeSoup.result: memory of many results, pickle size and pickling time.
+
+    python -m benchmarks.bench_result_model [--papers 200] [--paragraphs 64]
+"""
+import argparse
+import pickle
+import time
+import tracemalloc
+
+from LimeSoup.registry import SOUPS
+from LimeSoup.result import Document
+
+from benchmarks.synthetic import make_paper
+
+
+def allocated(build):
+    """
+    :return: (object built, bytes allocated for it)
+    """
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        value = build()
+        return value, tracemalloc.get_traced_memory()[0] - before
+    finally:
+        tracemalloc.stop()
+
+
+def time_pickle(values, repeat=3):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        data = pickle.dumps(values, protocol=pickle.HIGHEST_PROTOCOL)
+        pickle.loads(data)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return len(data), best
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS), default=list(SOUPS))
+    arg_parser.add_argument('--papers', type=int, default=200)
+    arg_parser.add_argument('--paragraphs', type=int, default=64)
+    args = arg_parser.parse_args(argv)
+
+    print('%-10s %12s %12s %12s %12s %10s %10s' % (
+        'publisher', 'dict MB', 'compact MB', 'dict pickle', 'compact pickle', 'dict ms', 'compact ms'))
+    for publisher in args.publishers:
+        result = SOUPS[publisher].parse(make_paper(publisher, args.paragraphs))
+        serialized = pickle.dumps(result)
+        # Unpickle every copy, so that no two results share strings, like
+        # results coming from worker processes.
+        dicts, dict_bytes = allocated(lambda: [pickle.loads(serialized) for _ in range(args.papers)])
+        documents, document_bytes = allocated(lambda: [Document.from_dict(pickle.loads(serialized))
+                                                       for _ in range(args.papers)])
+        assert documents[0].to_dict() == dicts[0]
+        dict_size, dict_seconds = time_pickle(dicts)
+        document_size, document_seconds = time_pickle(documents)
+        print('%-10s %12.1f %12.1f %12d %14d %10.1f %10.1f' % (
+            publisher, dict_bytes / 2 ** 20, document_bytes / 2 ** 20, dict_size, document_size,
+            dict_seconds * 1000, document_seconds * 1000))
+
+
+if __name__ == '__main__':
+    main()
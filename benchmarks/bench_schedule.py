@@ -0,0 +1,96 @@
+"""
+Compare the makespan of the batch runner on a heavy-tailed corpus with
+papers parsed in input order (chunked map), largest first, or longest first
+according to the cost model.
+
+    python -m benchmarks.bench_schedule [--small 400] [--large 4] [--workers 4]
+
+The synthetic corpus has many small papers and a few large ones, the large
+ones last (the worst case of input order). Each paper is also timed alone,
+and the makespans of the schedules are simulated for --workers workers from
+these times, which does not depend on the CPUs of the machine.
+"""
+import argparse
+import heapq
+import os
+import random
+import shutil
+import tempfile
+import time
+
+from LimeSoup.batch import iter_papers, parse_file, run_batch
+from LimeSoup.registry import SOUPS
+from LimeSoup.schedule import CostModel, paper_size
+from LimeSoup.sinks import CallbackSink
+
+from benchmarks.synthetic import make_paper
+
+
+def write_corpus(directory, small, large, small_paragraphs, large_paragraphs):
+    publishers = list(SOUPS)
+    random.seed(0)
+    papers = [(random.choice(publishers), small_paragraphs) for _ in range(small)]
+    papers += [(random.choice(publishers), large_paragraphs) for _ in range(large)]
+    for i, (publisher, paragraphs) in enumerate(papers):
+        os.makedirs(os.path.join(directory, publisher), exist_ok=True)
+        # Named in order, so that the large papers come last
+        with open(os.path.join(directory, publisher, '%06d.html' % i), 'w', encoding='utf-8') as f:
+            f.write(make_paper(publisher, paragraphs, seed=i))
+
+
+def simulate(times, workers, chunksize=1):
+    """
+    :param times: parsing times of the papers, in the order they are sent.
+    :return: makespan when free workers take the next chunk of papers.
+    """
+    chunks = [sum(times[i:i + chunksize]) for i in range(0, len(times), chunksize)]
+    finish = [0.0] * workers
+    for chunk in chunks:
+        heapq.heapreplace(finish, finish[0] + chunk)
+    return max(finish)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--small', type=int, default=400, help='number of small papers')
+    arg_parser.add_argument('--large', type=int, default=4, help='number of large papers')
+    arg_parser.add_argument('--small-paragraphs', type=int, default=8)
+    arg_parser.add_argument('--large-paragraphs', type=int, default=1500)
+    arg_parser.add_argument('--workers', type=int, default=4)
+    arg_parser.add_argument('--chunksize', type=int, default=4)
+    args = arg_parser.parse_args(argv)
+
+    directory = tempfile.mkdtemp()
+    try:
+        write_corpus(directory, args.small, args.large, args.small_paragraphs, args.large_paragraphs)
+        papers = sorted(iter_papers([directory]), key=lambda x: os.path.basename(x[1]))
+
+        times = {}
+        model = CostModel()
+        for paper in papers:
+            start = time.perf_counter()
+            parse_file(paper)
+            times[paper] = time.perf_counter() - start
+            model.observe(paper[0], paper_size(paper), times[paper])
+        orders = [
+            ('input', papers, args.chunksize),
+            ('size', sorted(papers, key=paper_size, reverse=True), 1),
+            ('cost', sorted(papers, key=model.predict, reverse=True), 1),
+        ]
+        print('%d papers, %.1f s of parsing, the longest %.1f s; %d workers' % (
+            len(papers), sum(times.values()), max(times.values()), args.workers))
+        print('%-8s %14s %12s' % ('schedule', 'simulated s', 'measured s'))
+        for schedule, order, chunksize in orders:
+            simulated = simulate([times[x] for x in order], args.workers, chunksize)
+            start = time.perf_counter()
+            with CallbackSink(lambda records: None) as sink:
+                run_batch(papers, sink, executor='process', max_workers=args.workers,
+                          chunksize=chunksize, schedule=schedule,
+                          cost_model=model if schedule == 'cost' else None)
+            print('%-8s %14.2f %12.2f' % (schedule, simulated, time.perf_counter() - start))
+    finally:
+        shutil.rmtree(directory)
+
+
+if __name__ == '__main__':
+    main()
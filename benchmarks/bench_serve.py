@@ -0,0 +1,83 @@
+"""
+Load-test a LimeSoup parse server (python -m LimeSoup.serve) with clients
+on kept-alive connections: documents/s, latency percentiles and 503s.
+
+    python -m benchmarks.bench_serve <corpus> [--url http://127.0.0.1:8080] [--clients 8] [--batch 1]
+"""
+import argparse
+import http.client
+import json
+import threading
+import time
+import urllib.parse
+
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import load_corpus
+
+
+def percentile(values, q):
+    values = sorted(values)
+    if not values:
+        return float('nan')
+    return values[min(len(values) - 1, int(q * len(values)))]
+
+
+def client(url, requests, latencies, statuses, parsed, lock):
+    connection = http.client.HTTPConnection(url.hostname, url.port or 80)
+    try:
+        while True:
+            with lock:
+                if not requests:
+                    return
+                path, body, n = requests.pop()
+            start = time.perf_counter()
+            connection.request('POST', path, body, {'Content-Type': 'application/json'})
+            response = connection.getresponse()
+            response.read()
+            with lock:
+                latencies.append(time.perf_counter() - start)
+                statuses[response.status] = statuses.get(response.status, 0) + 1
+                if response.status == 200:
+                    parsed.append(n)
+    finally:
+        connection.close()
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--url', default='http://127.0.0.1:8080')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--clients', type=int, default=8)
+    arg_parser.add_argument('--batch', type=int, default=1, help='documents per request')
+    arg_parser.add_argument('--rounds', type=int, default=5, help='times each paper is sent')
+    args = arg_parser.parse_args(argv)
+
+    requests = []
+    for publisher, papers in load_corpus(args.corpus, args.publishers).items():
+        texts = [text for _, text in papers] * args.rounds
+        for i in range(0, len(texts), args.batch):
+            batch = texts[i:i + args.batch]
+            requests.append(('/parse/%s' % publisher, json.dumps(batch), len(batch)))
+
+    url = urllib.parse.urlparse(args.url)
+    latencies, statuses, parsed, lock = [], {}, [], threading.Lock()
+    threads = [threading.Thread(target=client, args=(url, requests, latencies, statuses, parsed, lock))
+               for _ in range(args.clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    print('%d documents parsed in %d requests, %.1f s: %.1f docs/s' % (
+        sum(parsed), len(latencies), elapsed, sum(parsed) / elapsed))
+    print('latency ms: p50 %.1f, p90 %.1f, p99 %.1f' % tuple(
+        percentile(latencies, q) * 1000 for q in (0.5, 0.9, 0.99)))
+    print('statuses: %s' % ', '.join('%d: %d' % x for x in sorted(statuses.items())))
+
+
+if __name__ == '__main__':
+    main()
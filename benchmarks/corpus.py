@@ -0,0 +1,43 @@
+"""
+Local benchmark corpora are directories laid out as <corpus>/<publisher>/<paper>,
+where <publisher> is a key of LimeSoup.registry.SOUPS.
+"""
+import os
+from collections import OrderedDict
+
+from LimeSoup.registry import SOUPS
+
+__all__ = ['list_corpus', 'load_corpus']
+
+
+def list_corpus(path, publishers=None):
+    """
+    :param path: corpus directory.
+    :param publishers: only list these publishers.
+    :return: OrderedDict of publisher -> sorted list of file paths.
+    """
+    corpus = OrderedDict()
+    for publisher in sorted(os.listdir(path)):
+        directory = os.path.join(path, publisher)
+        if publisher not in SOUPS or not os.path.isdir(directory):
+            continue
+        if publishers and publisher not in publishers:
+            continue
+        corpus[publisher] = sorted(
+            os.path.join(directory, name) for name in os.listdir(directory)
+            if os.path.isfile(os.path.join(directory, name)))
+    return corpus
+
+
+def load_corpus(path, publishers=None):
+    """
+    :return: OrderedDict of publisher -> list of (file path, paper text).
+    """
+    corpus = OrderedDict()
+    for publisher, filenames in list_corpus(path, publishers).items():
+        papers = []
+        for filename in filenames:
+            with open(filename, encoding='utf-8') as f:
+                papers.append((filename, f.read()))
+        corpus[publisher] = papers
+    return corpus
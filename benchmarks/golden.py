@@ -0,0 +1,227 @@
+"""
+Compare two versions of LimeSoup on a corpus: the parse results of every
+paper (golden outputs) and the time it takes.
+
+    python -m benchmarks.golden <corpus> [--base git:HEAD] [--new worktree] [--json report.json]
+
+A version is one of:
+
+    worktree            the LimeSoup of this checkout, with local changes
+    git:<revision>      a git revision of this repository (branch, tag, commit)
+    python:<executable> the LimeSoup installed for another Python interpreter
+
+For every paper the report has the differences between the two JSON results
+(path in the result, base value, new value), and the ratio of the parse
+times (new / base). A performance rewrite should have no differences and
+ratios below 1.
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tarfile
+import tempfile
+from collections import OrderedDict
+
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import list_corpus
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER = os.path.join(ROOT, 'benchmarks', 'golden_worker.py')
+
+
+def json_diff(base, new, path='', limit=20):
+    """
+    :return: list of (path, base value, new value), at most limit of them.
+    """
+    differences = []
+
+    def walk(a, b, path):
+        if len(differences) >= limit:
+            return
+        if isinstance(a, dict) and isinstance(b, dict):
+            for key in list(a) + [x for x in b if x not in a]:
+                walk(a.get(key), b.get(key), '%s/%s' % (path, key))
+        elif isinstance(a, list) and isinstance(b, list):
+            for i in range(max(len(a), len(b))):
+                walk(a[i] if i < len(a) else None, b[i] if i < len(b) else None, '%s/%d' % (path, i))
+        elif a != b:
+            differences.append((path or '/', a, b))
+
+    walk(base, new, path)
+    return differences
+
+
+class Version(object):
+    """
+    A LimeSoup version to run the worker with.
+    """
+
+    def __init__(self, spec):
+        self.spec = spec
+        self.python = sys.executable
+        self.pythonpath = None
+        self._tmp = None
+
+        if spec == 'worktree':
+            self.pythonpath = ROOT
+        elif spec.startswith('git:'):
+            self._tmp = tempfile.mkdtemp(prefix='limesoup-golden-')
+            self.pythonpath = self._export(spec[len('git:'):], self._tmp)
+        elif spec.startswith('python:'):
+            self.python = spec[len('python:'):]
+        else:
+            raise ValueError('Unknown version %r, use worktree, git:<revision> or python:<executable>' % spec)
+
+    @staticmethod
+    def _export(revision, directory):
+        archive = os.path.join(directory, 'source.tar')
+        with open(archive, 'wb') as f:
+            subprocess.run(['git', 'archive', '--format=tar', revision, 'LimeSoup'],
+                           cwd=ROOT, stdout=f, check=True)
+        with tarfile.open(archive) as tar:
+            if hasattr(tarfile, 'data_filter'):
+                tar.extractall(directory, filter='data')
+            else:
+                tar.extractall(directory)
+        os.remove(archive)
+        return directory
+
+    def run(self, papers_file, output_file, repeat):
+        env = dict(os.environ)
+        env.pop('PYTHONPATH', None)
+        if self.pythonpath:
+            env['PYTHONPATH'] = self.pythonpath
+        # Run out of the checkout, so that python:<executable> does not pick
+        # up the LimeSoup of the current directory.
+        subprocess.run([self.python, WORKER, papers_file, output_file, '--repeat', str(repeat)],
+                       env=env, cwd=tempfile.gettempdir(), check=True)
+
+    def cleanup(self):
+        if self._tmp:
+            shutil.rmtree(self._tmp, ignore_errors=True)
+
+
+def read_records(filename):
+    with open(filename, encoding='utf-8') as f:
+        header = json.loads(f.readline())
+        records = OrderedDict()
+        for line in f:
+            record = json.loads(line)
+            records[record['path']] = record
+    return header, records
+
+
+def compare(base_records, new_records, limit):
+    documents = []
+    for path, base in base_records.items():
+        new = new_records[path]
+        document = {'path': path, 'publisher': base['publisher']}
+        if 'error' in base or 'error' in new:
+            document['base_error'] = base.get('error')
+            document['new_error'] = new.get('error')
+            document['identical'] = base.get('error') == new.get('error')
+        else:
+            differences = json_diff(base['result'], new['result'], limit=limit)
+            document['identical'] = not differences
+            document['differences'] = differences
+            document['base_seconds'] = base['seconds']
+            document['new_seconds'] = new['seconds']
+            document['ratio'] = new['seconds'] / base['seconds'] if base['seconds'] else None
+        documents.append(document)
+    return documents
+
+
+def summarize(documents):
+    summary = OrderedDict()
+    for publisher in sorted({x['publisher'] for x in documents}):
+        docs = [x for x in documents if x['publisher'] == publisher]
+        timed = [x for x in docs if x.get('ratio') is not None]
+        base_total = sum(x['base_seconds'] for x in timed)
+        summary[publisher] = {
+            'documents': len(docs),
+            'different': sum(not x['identical'] for x in docs),
+            'base_errors': sum(bool(x.get('base_error')) for x in docs),
+            'new_errors': sum(bool(x.get('new_error')) for x in docs),
+            'median_ratio': statistics.median(x['ratio'] for x in timed) if timed else None,
+            'total_ratio': sum(x['new_seconds'] for x in timed) / base_total if base_total else None,
+        }
+    return summary
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--base', default='git:HEAD')
+    arg_parser.add_argument('--new', default='worktree')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--repeat', type=int, default=1, help='best of that many parses')
+    arg_parser.add_argument('--max-differences', type=int, default=20, help='per paper')
+    arg_parser.add_argument('--json', help='write the full report to this file')
+    arg_parser.add_argument('--fail', action='store_true', help='exit with status 1 if any output differs')
+    args = arg_parser.parse_args(argv)
+
+    papers = [[publisher, os.path.abspath(path)]
+              for publisher, paths in list_corpus(args.corpus, args.publishers).items()
+              for path in paths]
+
+    workdir = tempfile.mkdtemp(prefix='limesoup-golden-')
+    versions = []
+    try:
+        papers_file = os.path.join(workdir, 'papers.json')
+        with open(papers_file, 'w') as f:
+            json.dump(papers, f)
+
+        outputs = []
+        for name, spec in (('base', args.base), ('new', args.new)):
+            version = Version(spec)
+            versions.append(version)
+            output = os.path.join(workdir, '%s.jsonl' % name)
+            print('Parsing %d papers with %s...' % (len(papers), spec))
+            version.run(papers_file, output, args.repeat)
+            outputs.append(read_records(output))
+    finally:
+        for version in versions:
+            version.cleanup()
+
+    (base_header, base_records), (new_header, new_records) = outputs
+    shutil.rmtree(workdir, ignore_errors=True)
+
+    documents = compare(base_records, new_records, args.max_differences)
+    summary = summarize(documents)
+
+    print('%-10s %6s %9s %11s %10s %12s %11s' % (
+        'publisher', 'docs', 'different', 'base errors', 'new errors', 'median ratio', 'total ratio'))
+    for publisher, x in summary.items():
+        print('%-10s %6d %9d %11d %10d %12s %11s' % (
+            publisher, x['documents'], x['different'], x['base_errors'], x['new_errors'],
+            '%.3f' % x['median_ratio'] if x['median_ratio'] is not None else '-',
+            '%.3f' % x['total_ratio'] if x['total_ratio'] is not None else '-'))
+    for document in documents:
+        if not document['identical']:
+            print('\n%s differs:' % document['path'])
+            if 'differences' in document:
+                for path, base, new in document['differences']:
+                    print('  %s\n    - %s\n    + %s' % (path, json.dumps(base)[:200], json.dumps(new)[:200]))
+            else:
+                print('  - %s\n  + %s' % (document['base_error'], document['new_error']))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({
+                'base': {'spec': args.base, 'worker': base_header},
+                'new': {'spec': args.new, 'worker': new_header},
+                'summary': summary,
+                'documents': documents,
+            }, f, indent=2)
+
+    if args.fail and any(not x['identical'] for x in documents):
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
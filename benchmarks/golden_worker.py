@@ -0,0 +1,72 @@
+"""
+Parse a list of papers with whichever LimeSoup is importable, for
+benchmarks/golden.py.
+
+This script is run by path with the PYTHONPATH (or the interpreter) of the
+LimeSoup version under test, so it only uses the standard library and the
+soups exported by the LimeSoup package, which exist in all the versions.
+
+    python benchmarks/golden_worker.py <papers.json> <output.jsonl> [--repeat 1]
+
+papers.json is a list of [publisher, path]. Each line of output.jsonl is
+{"path", "publisher", "seconds", "result"} or {"path", "publisher", "error"}.
+"""
+import argparse
+import json
+import sys
+import time
+import traceback
+
+SOUP_NAMES = {
+    'acs': 'ACSSoup',
+    'aip': 'AIPSoup',
+    'aps': 'APSSoup',
+    'ecs': 'ECSSoup',
+    'elsevier': 'ElsevierSoup',
+    'iop': 'IOPSoup',
+    'nature': 'NatureSoup',
+    'rsc': 'RSCSoup',
+    'springer': 'SpringerSoup',
+    'wiley': 'WileySoup',
+}
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser()
+    arg_parser.add_argument('papers')
+    arg_parser.add_argument('output')
+    arg_parser.add_argument('--repeat', type=int, default=1)
+    args = arg_parser.parse_args(argv)
+
+    import LimeSoup
+
+    with open(args.papers) as f:
+        papers = json.load(f)
+
+    with open(args.output, 'w', encoding='utf-8') as output:
+        output.write(json.dumps({'limesoup': getattr(LimeSoup, '__file__', None),
+                                 'python': sys.version}) + '\n')
+        for publisher, path in papers:
+            record = {'path': path, 'publisher': publisher}
+            try:
+                soup = getattr(LimeSoup, SOUP_NAMES[publisher])
+                with open(path, encoding='utf-8') as f:
+                    paper = f.read()
+                best = None
+                for _ in range(args.repeat):
+                    start = time.perf_counter()
+                    result = soup.parse(paper)
+                    elapsed = time.perf_counter() - start
+                    best = elapsed if best is None else min(best, elapsed)
+                record['seconds'] = best
+                record['version'] = soup.version
+                # Round trip, so that both sides compare JSON values.
+                record['result'] = json.loads(json.dumps(result, default=str))
+            except Exception as e:
+                record['error'] = '%s: %s' % (type(e).__name__, e)
+                record['traceback'] = traceback.format_exc()
+            output.write(json.dumps(record, sort_keys=True) + '\n')
+
+
+if __name__ == '__main__':
+    main()
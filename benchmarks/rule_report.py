@@ -0,0 +1,75 @@
+"""
+Count how often each rule of the parsers matches over a corpus, and report
+the rules that never match.
+
+    python -m benchmarks.rule_report <corpus> [--dead-only] [--prune]
+
+With --prune, the corpus is parsed a second time with rule pruning enabled,
+and both timings are reported.
+"""
+import argparse
+import json
+import time
+
+from LimeSoup.parser import rule_stats
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import load_corpus
+
+
+def run(soup, papers):
+    errors = 0
+    start = time.perf_counter()
+    for paper in papers:
+        try:
+            soup.parse(paper)
+        except Exception:
+            errors += 1
+    return time.perf_counter() - start, errors
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('corpus', help='corpus directory, <corpus>/<publisher>/<paper>')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS))
+    arg_parser.add_argument('--dead-only', action='store_true', help='only list rules that never matched')
+    arg_parser.add_argument('--prune', action='store_true', help='also time a run with rule pruning')
+    arg_parser.add_argument('--warmup', type=int, default=50)
+    arg_parser.add_argument('--full-check-every', type=int, default=100)
+    arg_parser.add_argument('--json', help='also write the counters to this file')
+    args = arg_parser.parse_args(argv)
+
+    report = {}
+    for publisher, papers in load_corpus(args.corpus, args.publishers).items():
+        texts = [text for _, text in papers]
+        if not texts:
+            continue
+
+        stats = rule_stats.enable()
+        try:
+            seconds, errors = run(SOUPS[publisher], texts)
+        finally:
+            rule_stats.disable()
+        report[publisher] = {'seconds': seconds, 'errors': errors, 'rules': stats.report()}
+
+        print('== %s: %d papers, %.2f s, %d errors, %d dead rules' % (
+            publisher, len(texts), seconds, errors, len(stats.dead_rules())))
+        print(stats.format_report(dead_only=args.dead_only))
+
+        if args.prune:
+            rule_stats.enable(prune=True, warmup=args.warmup, full_check_every=args.full_check_every)
+            try:
+                pruned_seconds, _ = run(SOUPS[publisher], texts)
+            finally:
+                rule_stats.disable()
+            report[publisher]['pruned_seconds'] = pruned_seconds
+            print('with pruning: %.2f s (%.2fx)' % (pruned_seconds, seconds / pruned_seconds))
+        print()
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,202 @@
+"""
+Benchmark the soups on synthetic papers (or on a corpus) and report, per
+publisher, the throughput in docs/s, the time per KB of markup and the peak
+resident memory.
+
+    python -m benchmarks.run [--sizes 5 50 500 2000 10000] [--json results.json]
+    python -m benchmarks.run --corpus <corpus> --json results.json
+    python -m benchmarks.run --compare old.json [--json new.json]
+
+Each publisher runs in a fresh process, so that peak memory is measured per
+publisher. The JSON results record the commit, the parser versions and the
+benchmark settings; --compare prints the ratio of the timings with a previous
+results file, made with the same settings on another commit.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+from LimeSoup.registry import SOUPS
+
+from benchmarks.corpus import list_corpus
+from benchmarks.synthetic import SIZES_KB, generate
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def peak_rss_mb():
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def papers_per_size(size_kb):
+    """
+    Enough small papers to get stable timings, one for the large ones.
+    """
+    return max(1, min(20, 2000 // size_kb))
+
+
+def time_papers(soup, papers, repeat):
+    best = None
+    errors = 0
+    for _ in range(repeat):
+        errors = 0
+        start = time.perf_counter()
+        for paper in papers:
+            try:
+                soup.parse(paper)
+            except Exception:
+                errors += 1
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    kb = sum(len(x.encode('utf-8')) for x in papers) / 1024
+    return {
+        'papers': len(papers),
+        'kb': kb,
+        'seconds': best,
+        'docs_per_sec': len(papers) / best if best else float('inf'),
+        'us_per_kb': best * 1e6 / kb if kb else 0.,
+        'errors': errors,
+    }
+
+
+def run_publisher(publisher, sizes, seed, repeat, corpus=None):
+    """
+    Benchmark one publisher in this process.
+    """
+    if corpus is not None:
+        groups = []
+        for filename in list_corpus(corpus, [publisher]).get(publisher, []):
+            with open(filename, encoding='utf-8') as f:
+                groups.append(f.read())
+        groups = [('corpus', groups)] if groups else []
+    else:
+        groups = [('%dkb' % size_kb, [generate(publisher, size_kb, seed=seed + i)
+                                      for i in range(papers_per_size(size_kb))])
+                  for size_kb in sizes]
+
+    rss_before = peak_rss_mb()
+    soup = SOUPS[publisher]
+    # Warm up imports and caches
+    for _, papers in groups[:1]:
+        time_papers(soup, papers[:1], 1)
+
+    results = {'sizes': {}}
+    for name, papers in groups:
+        results['sizes'][name] = time_papers(soup, papers, repeat)
+
+    total_seconds = sum(x['seconds'] for x in results['sizes'].values())
+    total_kb = sum(x['kb'] for x in results['sizes'].values())
+    total_papers = sum(x['papers'] for x in results['sizes'].values())
+    results.update({
+        'version': soup.version,
+        'docs_per_sec': total_papers / total_seconds if total_seconds else 0.,
+        'us_per_kb': total_seconds * 1e6 / total_kb if total_kb else 0.,
+        'errors': sum(x['errors'] for x in results['sizes'].values()),
+        'input_rss_mb': rss_before,
+        'peak_rss_mb': peak_rss_mb(),
+    })
+    return results
+
+
+def run_in_subprocess(publisher, args):
+    command = [sys.executable, '-m', 'benchmarks.run', '--worker', publisher,
+               '--seed', str(args.seed), '--repeat', str(args.repeat),
+               '--sizes'] + [str(x) for x in args.sizes]
+    if args.corpus:
+        command += ['--corpus', args.corpus]
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [ROOT, env.get('PYTHONPATH')]))
+    output = subprocess.run(command, stdout=subprocess.PIPE, env=env, cwd=ROOT, check=True).stdout
+    return json.loads(output.decode('utf-8').strip().splitlines()[-1])
+
+
+def git_commit():
+    try:
+        return subprocess.run(
+            ['git', 'describe', '--always', '--dirty'], cwd=ROOT, check=True,
+            stdout=subprocess.PIPE, stderr=subprocess.DEVNULL).stdout.decode('utf-8').strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_report(report, baseline=None):
+    header = '%-10s %8s %10s %10s %10s %7s' % ('publisher', 'version', 'docs/s', 'us/KB', 'peak MB', 'errors')
+    if baseline:
+        header += ' %10s' % 'us/KB old'
+        header += ' %7s' % 'ratio'
+    print(header)
+    for publisher, results in report['publishers'].items():
+        line = '%-10s %8s %10.2f %10.1f %10s %7d' % (
+            publisher, results['version'], results['docs_per_sec'], results['us_per_kb'],
+            '%.1f' % results['peak_rss_mb'] if results['peak_rss_mb'] is not None else '-',
+            results['errors'])
+        old = (baseline or {}).get('publishers', {}).get(publisher)
+        if old:
+            line += ' %10.1f %6.2fx' % (old['us_per_kb'], results['us_per_kb'] / old['us_per_kb'])
+        print(line)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--corpus', help='benchmark a corpus, <corpus>/<publisher>/<paper>, '
+                                             'instead of synthetic papers')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS), default=list(SOUPS))
+    arg_parser.add_argument('--sizes', nargs='*', type=int, default=list(SIZES_KB),
+                            help='sizes of the synthetic papers in KB')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--json', help='write the results to this file')
+    arg_parser.add_argument('--compare', help='results file of a previous run to compare with')
+    arg_parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = arg_parser.parse_args(argv)
+
+    if args.worker:
+        results = run_publisher(args.worker, args.sizes, args.seed, args.repeat, args.corpus)
+        print(json.dumps(results))
+        return
+
+    report = {
+        'commit': git_commit(),
+        'python': sys.version,
+        'platform': platform.platform(),
+        'settings': {
+            'corpus': args.corpus,
+            'sizes_kb': None if args.corpus else args.sizes,
+            'seed': args.seed,
+            'repeat': args.repeat,
+        },
+        'publishers': {},
+    }
+    for publisher in args.publishers:
+        report['publishers'][publisher] = run_in_subprocess(publisher, args)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        if baseline.get('settings') != report['settings']:
+            print('Warning: %s was run with different settings %r' % (args.compare, baseline.get('settings')))
+
+    print('commit %s, Python %s' % (report['commit'], sys.version.split()[0]))
+    print_report(report, baseline)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(report, f, indent=2)
+
+
+if __name__ == '__main__':
+    main()
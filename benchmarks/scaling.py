@@ -0,0 +1,140 @@
+"""
+Parse the same synthetic paper at 1x, 2x, 4x ... 64x its number of
+paragraphs and sections, and fit time ~ size^k per publisher and per rule
+ingredient. An exponent above the threshold (1.2 by default) means that the
+parser, or one of its ingredients, is superlinear in the document size.
+
+    python -m benchmarks.scaling [--publishers rsc nature] [--max-scale 64] [--fail]
+
+With --fail, the exit status is 1 when anything is flagged, for CI.
+"""
+import argparse
+import json
+import math
+import sys
+import time
+
+from LimeSoup.ElsevierSoup_XML import ElsevierXMLSoup
+from LimeSoup.registry import SOUPS
+
+from benchmarks.synthetic import make_paper
+
+# Soups that dispatch to another soup in a single ingredient: time the
+# ingredients of the one used for synthetic papers instead.
+STAGE_SOUPS = {
+    'elsevier': ElsevierXMLSoup,
+}
+
+# Ingredients faster than this at the largest size are not fitted, their
+# timings are mostly noise.
+MIN_SECONDS = 0.005
+
+
+def fit_exponent(sizes, seconds):
+    """
+    Least squares fit of log(seconds) = k * log(size) + c.
+
+    :return: k
+    """
+    xs = [math.log(x) for x in sizes]
+    ys = [math.log(max(x, 1e-9)) for x in seconds]
+    mean_x = sum(xs) / len(xs)
+    mean_y = sum(ys) / len(ys)
+    var_x = sum((x - mean_x) ** 2 for x in xs)
+    if not var_x:
+        return float('nan')
+    return sum((x - mean_x) * (y - mean_y) for x, y in zip(xs, ys)) / var_x
+
+
+def time_stages(soup, paper):
+    """
+    Run the ingredients of a soup one after the other.
+
+    :return: list of (ingredient name, seconds)
+    """
+    timings = []
+    data = paper
+    for ingredient in soup.ingredients:
+        start = time.perf_counter()
+        data = ingredient._parse(data)
+        timings.append((type(ingredient).__name__, time.perf_counter() - start))
+    return timings
+
+
+def measure(publisher, scales, base_paragraphs, repeat):
+    soup = STAGE_SOUPS.get(publisher, SOUPS[publisher])
+    points = []
+    for scale in scales:
+        paper = make_paper(publisher, base_paragraphs * scale)
+        best = None
+        for _ in range(repeat):
+            timings = time_stages(soup, paper)
+            if best is None or sum(x for _, x in timings) < sum(x for _, x in best):
+                best = timings
+        points.append({'scale': scale, 'bytes': len(paper.encode('utf-8')), 'stages': best})
+    return points
+
+
+def analyze(points, threshold):
+    # Fixed costs dominate small papers, fit the larger half of the curve.
+    first = len(points) // 2 if len(points) >= 4 else 0
+    sizes = [x['bytes'] for x in points]
+    total = [sum(t for _, t in x['stages']) for x in points]
+    result = {
+        'points': [{'scale': x['scale'], 'bytes': x['bytes'], 'seconds': t} for x, t in zip(points, total)],
+        'exponent': fit_exponent(sizes[first:], total[first:]),
+        'stages': {},
+    }
+    for i, (name, _) in enumerate(points[0]['stages']):
+        seconds = [x['stages'][i][1] for x in points]
+        if seconds[-1] < MIN_SECONDS:
+            continue
+        result['stages']['%d:%s' % (i, name)] = {
+            'exponent': fit_exponent(sizes[first:], seconds[first:]),
+            'seconds': seconds,
+        }
+    result['flagged'] = sorted(
+        ([] if result['exponent'] <= threshold else ['total']) +
+        [name for name, x in result['stages'].items() if x['exponent'] > threshold])
+    return result
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(SOUPS), default=list(SOUPS))
+    arg_parser.add_argument('--base-paragraphs', type=int, default=8)
+    arg_parser.add_argument('--max-scale', type=int, default=64)
+    arg_parser.add_argument('--repeat', type=int, default=3)
+    arg_parser.add_argument('--threshold', type=float, default=1.2)
+    arg_parser.add_argument('--json', help='write the curves and exponents to this file')
+    arg_parser.add_argument('--fail', action='store_true', help='exit with status 1 if anything is flagged')
+    args = arg_parser.parse_args(argv)
+
+    scales = [2 ** i for i in range(int(math.log2(args.max_scale)) + 1)]
+    report = {}
+    for publisher in args.publishers:
+        result = analyze(measure(publisher, scales, args.base_paragraphs, args.repeat), args.threshold)
+        report[publisher] = result
+
+        print('%-10s k=%.2f  %s' % (
+            publisher, result['exponent'],
+            '  '.join('%.3fs' % x['seconds'] for x in result['points'])))
+        for name, stage in result['stages'].items():
+            print('    %-40s k=%.2f%s' % (name, stage['exponent'], '  <-- superlinear'
+                                          if stage['exponent'] > args.threshold else ''))
+
+    flagged = {publisher: x['flagged'] for publisher, x in report.items() if x['flagged']}
+    if flagged:
+        print('\nSuperlinear (k > %.2f): %s' % (args.threshold, json.dumps(flagged)))
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'threshold': args.threshold, 'scales': scales,
+                       'base_paragraphs': args.base_paragraphs, 'publishers': report}, f, indent=2)
+
+    if args.fail and flagged:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,440 @@
+"""
+Synthetic papers in the page templates that each soup expects, so that the
+parsers can be benchmarked without a corpus.
+
+The papers are generated from a seeded random generator: the same publisher,
+size and seed always give the same paper, and benchmark results of different
+commits are comparable. Besides sections and paragraphs with inline markup
+(formulas, italics, citations), the papers carry what the parsers have to
+remove: navigation, scripts, figures, tables and references.
+
+    python -m benchmarks.synthetic <output dir> [--sizes 5 50 500] [--seed 0]
+
+writes <output dir>/<publisher>/<size>kb-<i>.<html|xml>, a corpus for the
+other benchmarks.
+"""
+import argparse
+import os
+import random
+from collections import OrderedDict
+
+__all__ = ['SIZES_KB', 'TEMPLATES', 'Paper', 'make_paper', 'generate', 'file_extension']
+
+SIZES_KB = (5, 50, 500, 2000, 10000)
+
+WORDS = (
+    'the of and in to a with for was were by as on is that from at are this sample samples '
+    'synthesis synthesized solution temperature heated annealed calcined powder precursor mixture '
+    'phase structure crystal diffraction pattern peaks observed obtained measured prepared using '
+    'stirred dried washed ethanol water nitrate oxide cathode anode electrolyte battery capacity '
+    'voltage current density morphology particles surface area porosity catalyst activity reaction '
+    'rate yield spectra absorption band gap film thin substrate deposited layer thickness grain '
+    'boundary doping concentration composition ratio stoichiometric molar hours minutes furnace'
+).split()
+
+FORMULAS = (
+    ('Li', '2', 'O'), ('LiFePO', '4', ''), ('TiO', '2', ''), ('BaTiO', '3', ''),
+    ('Fe', '2', 'O3'), ('LiCoO', '2', ''), ('ZrO', '2', ''), ('Al', '2', 'O3'),
+)
+
+HEADINGS = (
+    'Introduction', 'Experimental', 'Materials', 'Synthesis', 'Characterization',
+    'Results and discussion', 'Structure', 'Electrochemical performance', 'Conclusions',
+)
+
+
+class Paper(object):
+    """
+    The content of a synthetic paper, rendered by the publisher templates.
+    """
+
+    def __init__(self, n_paragraphs, seed=0):
+        self.random = random.Random(seed)
+        self.n_citations = 0
+        self.doi = '10.0000/synthetic.%d.%d' % (seed, n_paragraphs)
+        self.title = self.sentence(12).rstrip('.')
+        self.journal = 'Journal of Synthetic Materials'
+        self.keywords = [self.random.choice(WORDS) for _ in range(4)]
+        self.abstract = [self.paragraph()]
+
+        # Sections of about 8 paragraphs, each of them with one subsection.
+        self.sections = []
+        n_sections = max(2, n_paragraphs // 8)
+        per_section = max(1, n_paragraphs // n_sections)
+        for i in range(n_sections):
+            n_sub = per_section // 2
+            self.sections.append({
+                'title': '%d. %s' % (i + 1, HEADINGS[i % len(HEADINGS)]),
+                'paragraphs': [self.paragraph() for _ in range(per_section - n_sub)],
+                'subsections': [{
+                    'title': '%d.1. %s' % (i + 1, self.sentence(4).rstrip('.')),
+                    'paragraphs': [self.paragraph() for _ in range(n_sub)],
+                }] if n_sub else [],
+            })
+
+    def sentence(self, n_words=None):
+        words = [self.random.choice(WORDS) for _ in range(n_words or self.random.randint(8, 24))]
+        return ' '.join(words).capitalize() + '.'
+
+    def paragraph(self):
+        """
+        :return: list of text chunks and inline elements, ('formula', parts),
+            ('italic', text) or ('cite', number).
+        """
+        chunks = []
+        for _ in range(self.random.randint(3, 6)):
+            chunks.append(self.sentence())
+            roll = self.random.random()
+            if roll < 0.3:
+                chunks.append(('formula', self.random.choice(FORMULAS)))
+            elif roll < 0.5:
+                chunks.append(('italic', self.random.choice(WORDS)))
+            elif roll < 0.8:
+                self.n_citations += 1
+                chunks.append(('cite', self.n_citations))
+        return chunks
+
+
+def _render(paragraph, formula, italic, cite):
+    out = []
+    for chunk in paragraph:
+        if isinstance(chunk, str):
+            out.append(chunk)
+        elif chunk[0] == 'formula':
+            out.append(formula(*chunk[1]))
+        elif chunk[0] == 'italic':
+            out.append(italic(chunk[1]))
+        else:
+            out.append(cite(chunk[1]))
+    return ' '.join(out)
+
+
+def _html_chrome(paper):
+    links = ''.join('<li><a href="/journal/%d">Link %d</a></li>' % (i, i) for i in range(30))
+    return ('<header role="banner"><nav class="menu"><ul>%s</ul></nav></header>'
+            '<script>var config = {"doi": "%s", "links": [%s]};</script>') % (
+               links, paper.doi, ','.join(str(i) for i in range(50)))
+
+
+def _html_head(paper, extra=''):
+    metas = [
+        ('citation_doi', paper.doi), ('citation_title', paper.title),
+        ('citation_journal_title', paper.journal),
+    ] + [('citation_keywords', x) for x in paper.keywords]
+    return '<head><title>%s</title>%s%s<style>body { margin: 0; }</style></head>' % (
+        paper.title,
+        ''.join('<meta name="%s" content="%s">' % x for x in metas),
+        extra)
+
+
+def _html_formula(base, sub, rest):
+    return '%s<sub>%s</sub>%s' % (base, sub, rest)
+
+
+def rsc(paper):
+    def paragraphs(items):
+        return ''.join('<p>%s</p>' % _render(
+            p, _html_formula, lambda x: '<em>%s</em>' % x,
+            lambda n: '<a href="#cit%d" title="Select to navigate to reference">%d</a>' % (n, n))
+            for p in items)
+
+    body = []
+    for s in paper.sections:
+        body.append('<h2><span class="a_heading">%s</span></h2>%s' % (s['title'], paragraphs(s['paragraphs'])))
+        for sub in s['subsections']:
+            body.append('<h3><span class="b_heading">%s</span></h3>%s' % (sub['title'], paragraphs(sub['paragraphs'])))
+        body.append('<div class="image_table"><figure><img src="f.gif"><figcaption>%s</figcaption></figure></div>'
+                    % paper.sentence())
+    references = ''.join('<li><span id="cit%d">Reference %d. %s</span></li>' % (i, i, paper.sentence())
+                         for i in range(1, paper.n_citations + 1))
+    return ('<html>%s<body>%s<div class="left_head">Journal home</div>'
+            '<h1 class="article__title">%s</h1><p class="header_text">A. Author, B. Author</p>'
+            '<div id="wrapper"><h3 class="h--heading3 article-abstract__heading">Abstract</h3>'
+            '<p class="abstract">%s</p><div id="pnlArticleContent">%s'
+            '<h2><span class="a_heading">References</span></h2><ol>%s</ol></div></div>'
+            '<div class="article-copyright">This journal is (c) The Royal Society of Chemistry</div>'
+            '</body></html>') % (
+               _html_head(paper), _html_chrome(paper), paper.title,
+               _render(paper.abstract[0], _html_formula, str, str), ''.join(body), references)
+
+
+def springer(paper):
+    def paragraphs(items):
+        return ''.join('<div class="Para">%s</div>' % _render(
+            p, _html_formula, lambda x: '<em class="EmphasisTypeItalic ">%s</em>' % x,
+            lambda n: '<span class="CitationRef"><a href="#CR%d">%d</a></span>' % (n, n))
+            for p in items)
+
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join(
+            '<section id="Sec%d.%d"><h3 class="Heading">%s</h3>%s</section>' % (
+                i, j, sub['title'], paragraphs(sub['paragraphs']))
+            for j, sub in enumerate(s['subsections']))
+        body.append('<section id="Sec%d"><h2 class="Heading">%s</h2>%s%s'
+                    '<figure class="Figure"><figcaption>%s</figcaption></figure></section>' % (
+                        i, s['title'], paragraphs(s['paragraphs']), subsections, paper.sentence()))
+    references = ''.join('<li class="Citation">%s</li>' % paper.sentence() for _ in range(paper.n_citations))
+    return ('<html>%s<body>%s<span class="JournalTitle">%s</span><h1 class="ArticleTitle">%s</h1>'
+            '<div class="KeywordGroup">%s</div>'
+            '<div class="AbstractSection"><h2>Abstract</h2><p>%s</p></div>%s'
+            '<section class="Section1 RenderAsSection1"><h2 class="Heading">References</h2><ol>%s</ol></section>'
+            '</body></html>') % (
+               _html_head(paper), _html_chrome(paper), paper.journal, paper.title,
+               ''.join('<span class="Keyword">%s</span>' % x for x in paper.keywords),
+               _render(paper.abstract[0], _html_formula, str, str), ''.join(body), references)
+
+
+def wiley(paper):
+    def paragraphs(items):
+        return ''.join('<p>%s</p>' % _render(
+            p, _html_formula, lambda x: '<i>%s</i>' % x,
+            lambda n: '<a href="#bib%d" class="bibLink tab-link">%d</a>' % (n, n))
+            for p in items)
+
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join(
+            '<section class="article-section__sub-content"><h3 class="article-section__sub-title">%s</h3>%s</section>'
+            % (sub['title'], paragraphs(sub['paragraphs'])) for sub in s['subsections'])
+        body.append('<section class="article-section__content"><h2 class="article-section__title">%s</h2>%s%s'
+                    '<section class="article-section article-section--inline-figure"><figure>%s</figure></section>'
+                    '</section>' % (s['title'], paragraphs(s['paragraphs']), subsections, paper.sentence()))
+    references = ''.join('<li>%s</li>' % paper.sentence() for _ in range(paper.n_citations))
+    return ('<html>%s<body>%s<article><h1 class="citation__title">%s</h1>'
+            '<div class="article-header__authors-container">A. Author</div>'
+            '<section class="article-section article-section__abstract"><h2 class="article-section__header">'
+            'Abstract</h2><div class="article-section__content"><p>%s</p></div></section>'
+            '<section class="article-section article-section__full">%s</section>'
+            '<section class="article-section article-section__references"><h2>References</h2><ul>%s</ul></section>'
+            '</article><footer role="contentinfo">Wiley</footer></body></html>') % (
+               _html_head(paper), _html_chrome(paper), paper.title,
+               _render(paper.abstract[0], _html_formula, str, str), ''.join(body), references)
+
+
+def ecs(paper):
+    def paragraphs(items):
+        return ''.join('<p>%s</p>' % _render(
+            p, _html_formula, lambda x: '<em>%s</em>' % x,
+            lambda n: '<a class="xref-bibr" href="#ref-%d">%d</a>' % (n, n))
+            for p in items)
+
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join('<div class="section"><h3>%s</h3>%s</div>' % (
+            sub['title'], paragraphs(sub['paragraphs'])) for sub in s['subsections'])
+        body.append('<div class="section" id="sec-%d"><h2>%s</h2>%s%s'
+                    '<div class="fig"><div class="fig-caption">%s</div></div></div>' % (
+                        i, s['title'], paragraphs(s['paragraphs']), subsections, paper.sentence()))
+    references = ''.join('<li>%s</li>' % paper.sentence() for _ in range(paper.n_citations))
+    return ('<html>%s<body>%s<div class="highwire-markup"><div class="fulltext-view">'
+            '<h1>%s</h1><ul class="kwd-group">%s</ul>'
+            '<div class="section abstract"><h2>Abstract</h2><p>%s</p></div>%s'
+            '<div class="section ref-list"><h2>References</h2><ol>%s</ol></div>'
+            '</div></div><div class="sidebar">%s</div></body></html>') % (
+               _html_head(paper), _html_chrome(paper), paper.title,
+               ''.join('<li class="kwd">%s</li>' % x for x in paper.keywords),
+               _render(paper.abstract[0], _html_formula, str, str), ''.join(body), references,
+               _html_chrome(paper))
+
+
+def nature(paper):
+    def paragraphs(items):
+        return ''.join('<p>%s</p>' % _render(
+            p, _html_formula, lambda x: '<i>%s</i>' % x,
+            lambda n: '<sup><a data-track-action="reference anchor" href="#ref-CR%d">%d</a></sup>' % (n, n))
+            for p in items)
+
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join('<h3 class="c-article__sub-heading">%s</h3>%s' % (
+            sub['title'], paragraphs(sub['paragraphs'])) for sub in s['subsections'])
+        body.append('<section data-title="%s"><div class="c-article-section" id="Sec%d-section">'
+                    '<h2 class="c-article-section__title">%s</h2><div class="c-article-section__content">%s%s'
+                    '<figure><figcaption><b>Fig. %d</b> %s</figcaption></figure></div></div></section>' % (
+                        s['title'], i, s['title'], paragraphs(s['paragraphs']), subsections,
+                        i + 1, paper.sentence()))
+    references = ''.join('<li class="c-article-references__item" itemprop="citation">%s</li>' % paper.sentence()
+                         for _ in range(paper.n_citations))
+    extra = '<meta name="prism.doi" content="doi:%s"><meta name="keywords" content="%s">' % (
+        paper.doi, ','.join(paper.keywords))
+    return ('<html>%s<body>%s<article><header><h1 class="c-article-title">%s</h1></header>'
+            '<div class="c-article-body" data-article-body="true">'
+            '<section data-title="Abstract"><div class="c-article-section"><h2>Abstract</h2>'
+            '<div class="c-article-section__content"><p>%s</p></div></div></section>%s'
+            '<section data-title="References"><h2>References</h2><ol>%s</ol></section>'
+            '</div></article><footer>%s</footer></body></html>') % (
+               _html_head(paper, extra), _html_chrome(paper), paper.title,
+               _render(paper.abstract[0], _html_formula, str, str), ''.join(body), references,
+               _html_chrome(paper))
+
+
+def _jats_paragraphs(items):
+    return ''.join('<p>%s</p>' % _render(
+        p, lambda base, sub, rest: '%s<sub>%s</sub>%s' % (base, sub, rest),
+        lambda x: '<italic>%s</italic>' % x,
+        lambda n: '<xref ref-type="bibr" rid="ref%d">%d</xref>' % (n, n))
+        for p in items)
+
+
+def _jats(paper, sec_id, sub_id):
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join('<sec id="%s"><title>%s</title>%s</sec>' % (
+            sub_id(i + 1, j + 1), sub['title'], _jats_paragraphs(sub['paragraphs']))
+            for j, sub in enumerate(s['subsections']))
+        body.append('<sec id="%s"><title>%s</title>%s%s'
+                    '<fig id="fig%d"><label>Figure %d</label><caption><p>%s</p></caption></fig>'
+                    '<table-wrap id="tbl%d"><table><tr><td>1</td><td>2</td></tr></table></table-wrap></sec>' % (
+                        sec_id(i + 1), s['title'], _jats_paragraphs(s['paragraphs']), subsections,
+                        i, i, paper.sentence(), i))
+    references = ''.join('<ref id="ref%d"><mixed-citation><source>%s</source><year>2020</year>'
+                         '</mixed-citation></ref>' % (i, paper.sentence())
+                         for i in range(1, paper.n_citations + 1))
+    return ('<article><front><journal-meta><journal-title-group><journal-title>%s</journal-title>'
+            '</journal-title-group></journal-meta><article-meta>'
+            '<article-id pub-id-type="doi">%s</article-id><title-group><article-title>%s</article-title>'
+            '</title-group><kwd-group>%s</kwd-group><abstract><p>%s</p></abstract></article-meta></front>'
+            '<body>%s</body><back><ref-list>%s</ref-list></back></article>') % (
+               paper.journal, paper.doi, paper.title,
+               ''.join('<kwd>%s</kwd>' % x for x in paper.keywords),
+               _render(paper.abstract[0], lambda b, s, r: b + s + r, str, str), ''.join(body), references)
+
+
+def acs(paper):
+    return '<?xml version="1.0" encoding="UTF-8"?>' + _jats(
+        paper, lambda i: 'sec%d' % i, lambda i, j: 'sec%d.%d' % (i, j))
+
+
+aps = acs
+
+
+def iop(paper):
+    return '<?xml version="1.0" encoding="UTF-8"?>' + _jats(
+        paper, lambda i: 's%d' % i, lambda i, j: 's%d.%d' % (i, j))
+
+
+def aip(paper):
+    # AIP full texts come wrapped in the response of their API.
+    jats = _jats(paper, lambda i: 's%d' % i, lambda i, j: 's%d%s' % (i, chr(ord('A') + j - 1)))
+    return '<response><meta-info>%s</meta-info><fulltext>%s</fulltext></response>' % (
+        '<doi>%s</doi>' % paper.doi, jats)
+
+
+def elsevier(paper):
+    def paragraphs(items):
+        return ''.join('<ce:para>%s</ce:para>' % _render(
+            p, lambda base, sub, rest: '%s<ce:inf>%s</ce:inf>%s' % (base, sub, rest),
+            lambda x: '<ce:italic>%s</ce:italic>' % x,
+            lambda n: '<ce:cross-ref refid="bib%d">[%d]</ce:cross-ref>' % (n, n))
+            for p in items)
+
+    body = []
+    for i, s in enumerate(paper.sections):
+        subsections = ''.join(
+            '<ce:section id="s%d.%d"><ce:label>%d.%d</ce:label><ce:section-title>%s</ce:section-title>%s'
+            '</ce:section>' % (i + 1, j + 1, i + 1, j + 1, sub['title'].split(' ', 1)[1],
+                               paragraphs(sub['paragraphs']))
+            for j, sub in enumerate(s['subsections']))
+        body.append('<ce:section id="s%d"><ce:label>%d</ce:label><ce:section-title>%s</ce:section-title>%s'
+                    '<ce:para>See <ce:float-anchor refid="f%d"/>.</ce:para>%s</ce:section>' % (
+                        i + 1, i + 1, s['title'].split(' ', 1)[1], paragraphs(s['paragraphs']),
+                        i, subsections))
+    figures = ''.join('<ce:figure id="f%d"><ce:label>Fig. %d</ce:label><ce:caption><ce:simple-para>%s'
+                      '</ce:simple-para></ce:caption></ce:figure>' % (i, i + 1, paper.sentence())
+                      for i in range(len(paper.sections)))
+    references = ''.join('<ce:bib-reference id="bib%d"><ce:label>[%d]</ce:label><ce:other-ref>'
+                         '<ce:textref>%s</ce:textref></ce:other-ref></ce:bib-reference>' % (i, i, paper.sentence())
+                         for i in range(1, paper.n_citations + 1))
+    return (
+        '<full-text-retrieval-response xmlns="http://www.elsevier.com/xml/svapi/article/dtd" '
+        'xmlns:prism="http://prismstandard.org/namespaces/basic/2.0/" xmlns:dc="http://purl.org/dc/elements/1.1/" '
+        'xmlns:dcterms="http://purl.org/dc/terms/" xmlns:xocs="http://www.elsevier.com/xml/xocs/dtd" '
+        'xmlns:ce="http://www.elsevier.com/xml/common/dtd" xmlns:ja="http://www.elsevier.com/xml/ja/dtd">'
+        '<coredata><prism:doi>%(doi)s</prism:doi><prism:publicationName>%(journal)s</prism:publicationName>'
+        '<dc:title>%(title)s</dc:title>%(subjects)s</coredata>'
+        '<originalText><xocs:doc><xocs:meta><xocs:doi>%(doi)s</xocs:doi><xocs:srctitle>%(journal)s</xocs:srctitle>'
+        '</xocs:meta><xocs:serial-item><ja:article><ce:floats>%(figures)s</ce:floats>'
+        '<ja:head><ce:title>%(title)s</ce:title>'
+        '<ce:abstract class="author"><ce:section-title>Abstract</ce:section-title><ce:abstract-sec>'
+        '<ce:simple-para>%(abstract)s</ce:simple-para></ce:abstract-sec></ce:abstract>'
+        '<ce:keywords>%(keywords)s</ce:keywords></ja:head>'
+        '<ja:body><ce:sections>%(body)s</ce:sections></ja:body>'
+        '<ja:tail><ce:bibliography><ce:bibliography-sec>%(references)s</ce:bibliography-sec></ce:bibliography>'
+        '</ja:tail></ja:article></xocs:serial-item></xocs:doc></originalText></full-text-retrieval-response>'
+    ) % {
+        'doi': paper.doi, 'journal': paper.journal, 'title': paper.title,
+        'subjects': ''.join('<dcterms:subject>%s</dcterms:subject>' % x for x in paper.keywords),
+        'abstract': _render(paper.abstract[0], lambda b, s, r: b + s + r, str, str),
+        'keywords': ''.join('<ce:keyword><ce:text>%s</ce:text></ce:keyword>' % x for x in paper.keywords),
+        'body': ''.join(body), 'figures': figures, 'references': references,
+    }
+
+
+TEMPLATES = OrderedDict([
+    ('acs', acs),
+    ('aip', aip),
+    ('aps', aps),
+    ('ecs', ecs),
+    ('elsevier', elsevier),
+    ('iop', iop),
+    ('nature', nature),
+    ('rsc', rsc),
+    ('springer', springer),
+    ('wiley', wiley),
+])
+
+XML_PUBLISHERS = ('acs', 'aip', 'aps', 'elsevier', 'iop')
+
+
+def file_extension(publisher):
+    return 'xml' if publisher in XML_PUBLISHERS else 'html'
+
+
+def make_paper(publisher, n_paragraphs, seed=0):
+    """
+    :param publisher: key of TEMPLATES.
+    :param n_paragraphs: number of paragraphs in the body.
+    :return: the markup of a synthetic paper.
+    """
+    return TEMPLATES[publisher](Paper(n_paragraphs, seed=seed))
+
+
+def generate(publisher, size_kb, seed=0):
+    """
+    :param publisher: key of TEMPLATES.
+    :param size_kb: approximate size of the paper, in KB.
+    :return: the markup of a synthetic paper.
+    """
+    target = size_kb * 1024
+    # Size grows linearly with the number of paragraphs, estimate it on a
+    # small paper, then correct once.
+    n_paragraphs = 16
+    small = len(make_paper(publisher, n_paragraphs, seed))
+    empty = len(make_paper(publisher, 0, seed))
+    per_paragraph = max((small - empty) / n_paragraphs, 1)
+    n_paragraphs = max(1, int(round((target - empty) / per_paragraph)))
+    return make_paper(publisher, n_paragraphs, seed)
+
+
+def main(argv=None):
+    arg_parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    arg_parser.add_argument('output', help='output directory')
+    arg_parser.add_argument('--publishers', nargs='*', choices=list(TEMPLATES), default=list(TEMPLATES))
+    arg_parser.add_argument('--sizes', nargs='*', type=int, default=list(SIZES_KB), help='sizes in KB')
+    arg_parser.add_argument('--copies', type=int, default=1, help='papers per size, with different seeds')
+    arg_parser.add_argument('--seed', type=int, default=0)
+    args = arg_parser.parse_args(argv)
+
+    for publisher in args.publishers:
+        directory = os.path.join(args.output, publisher)
+        os.makedirs(directory, exist_ok=True)
+        for size_kb in args.sizes:
+            for i in range(args.copies):
+                filename = os.path.join(directory, '%dkb-%d.%s' % (size_kb, i, file_extension(publisher)))
+                with open(filename, 'w', encoding='utf-8') as f:
+                    f.write(generate(publisher, size_kb, seed=args.seed + i))
+
+
+if __name__ == '__main__':
+    main()
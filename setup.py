@@ -5,10 +5,10 @@ if __name__ == "__main__":
     setup(
         name='LimeSoup',
         version="0.3.2",
-        python_requires='>=3.4',
+        python_requires='>=3.7',
         author="Ceder Group",
         license="MIT License",
-        packages=find_packages(),
+        packages=find_packages(exclude=['benchmarks', 'benchmarks.*']),
         zip_safe=False,
         install_requires=[
             'beautifulsoup4>=4.6.1',